@@ -0,0 +1,5 @@
+"""Performance benchmarks for the OSINT Intelligence Platform.
+
+Run individual benchmarks as modules from the repository root, e.g.
+``python -m benchmarks.link_extraction``.
+"""
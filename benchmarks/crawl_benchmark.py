@@ -0,0 +1,380 @@
+"""End-to-end crawl benchmark against a local synthetic site.
+
+A deterministic site is served from a subprocess (so its CPU time is not
+charged to the crawler) and crawled with CrawlingEngine. The report covers
+throughput, CPU per page, peak RSS and how well duplicates and traps were
+avoided, as JSON that can be compared between runs.
+
+The site has:
+- canonical pages ``/p/<i>`` with ``--fanout`` links each
+- URL aliases ``/p/<i>/`` (same page, trailing slash) for ``--alias-ratio``
+  of the links
+- mirrors ``/mirror/<i>`` serving a near-copy of ``/p/<i>`` for
+  ``--duplicate-ratio`` of the links
+- relative-link loops ``/loop/<i>/x/x/...`` (an infinite URL space) linked
+  from ``--trap-ratio`` of the pages
+
+Usage:
+    python -m benchmarks.crawl_benchmark [--pages 2000] [--fanout 8]
+        [--latency-ms 5] [--concurrency 16] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import random
+import re
+import resource
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from crawling.engine import CrawlingEngine
+
+_PAGE_RE = re.compile(r"^/p/(\d+)(/?)$")
+_MIRROR_RE = re.compile(r"^/mirror/(\d+)$")
+_LOOP_RE = re.compile(r"^/loop/(\d+)/((?:x/)*)$")
+
+
+class SyntheticSite:
+    """Deterministic page graph with aliases, near-duplicates and traps."""
+
+    def __init__(
+        self,
+        pages: int,
+        fanout: int,
+        alias_ratio: float,
+        duplicate_ratio: float,
+        trap_ratio: float,
+        seed: int,
+    ):
+        self.pages = pages
+        self.fanout = fanout
+        self.alias_ratio = alias_ratio
+        self.duplicate_ratio = duplicate_ratio
+        self.trap_ratio = trap_ratio
+        self.seed = seed
+
+        vocabulary_rng = random.Random(seed)
+        self.vocabulary = [
+            "".join(vocabulary_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(7))
+            for _ in range(2000)
+        ]
+
+    def _text(self, page: int) -> str:
+        """Page body text, unique per canonical page."""
+        rng = random.Random(self.seed * 1_000_003 + page)
+        return " ".join(rng.choice(self.vocabulary) for _ in range(300))
+
+    def _links(self, page: int) -> list:
+        """Outgoing links of a canonical page."""
+        rng = random.Random(self.seed * 7_919 + page)
+        # The ring link keeps every page reachable
+        links = [f"/p/{(page + 1) % self.pages}"]
+
+        for _ in range(self.fanout - 1):
+            target = rng.randrange(self.pages)
+            roll = rng.random()
+            if roll < self.duplicate_ratio:
+                links.append(f"/mirror/{target}")
+            elif roll < self.duplicate_ratio + self.alias_ratio:
+                links.append(f"/p/{target}/")
+            else:
+                links.append(f"/p/{target}")
+
+        if rng.random() < self.trap_ratio:
+            links.append(f"/loop/{page}/")
+
+        return links
+
+    def render(self, path: str) -> Tuple[int, str, Optional[str]]:
+        """
+        Render a path.
+
+        Returns:
+            Status code, HTML body and request kind (page, alias, mirror,
+            trap or None)
+        """
+        match = _PAGE_RE.match(path)
+        if match and int(match.group(1)) < self.pages:
+            page = int(match.group(1))
+            kind = "alias" if match.group(2) else "page"
+            return 200, self._html(page, self._text(page), self._links(page)), kind
+
+        match = _MIRROR_RE.match(path)
+        if match and int(match.group(1)) < self.pages:
+            page = int(match.group(1))
+            # Same article with a different header: a near-duplicate
+            text = "mirror copy " + self._text(page)
+            return 200, self._html(page, text, self._links(page)), "mirror"
+
+        match = _LOOP_RE.match(path)
+        if match:
+            # A relative link that resolves one level deeper on every page
+            depth = match.group(2).count("x")
+            return 200, self._html(depth, f"loop level {depth}", ["x/"]), "trap"
+
+        return 404, "<html><body>not found</body></html>", None
+
+    @staticmethod
+    def _html(page: int, text: str, links: list) -> str:
+        anchors = "".join(f'<li><a href="{link}">{link}</a></li>' for link in links)
+        return (
+            f"<!DOCTYPE html><html><head><title>Page {page}</title></head>"
+            f"<body><nav><a href=\"/p/0\">Home</a></nav><article><p>{text}</p></article>"
+            f"<ul>{anchors}</ul></body></html>"
+        )
+
+
+def _serve(site_args: Dict[str, Any], latency: float, connection):
+    """Subprocess entry point: serve the site and report the port."""
+    site = SyntheticSite(**site_args)
+    lock = threading.Lock()
+    stats = {"requests": 0, "by_kind": {}, "resources": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/__stats":
+                with lock:
+                    body = json.dumps({
+                        "requests": stats["requests"],
+                        "by_kind": stats["by_kind"],
+                        "unique_pages": len(stats["resources"]),
+                    })
+                return self._send(200, body, "application/json")
+
+            if latency:
+                time.sleep(latency)
+
+            if self.path == "/robots.txt":
+                return self._send(200, "User-agent: *\nDisallow:\n", "text/plain")
+
+            status, body, kind = site.render(self.path)
+            with lock:
+                stats["requests"] += 1
+                stats["by_kind"][kind or "other"] = stats["by_kind"].get(kind or "other", 0) + 1
+                if kind in ("page", "alias"):
+                    stats["resources"].add(self.path.rstrip("/"))
+            self._send(status, body, "text/html; charset=utf-8")
+
+        def _send(self, status: int, body: str, content_type: str):
+            data = body.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    connection.send(server.server_port)
+    server.serve_forever()
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    if sys.platform == "darwin":
+        return round(peak / 2**20, 1)
+    return round(peak / 2**10, 1)
+
+
+def _cpu_seconds() -> float:
+    """User + system CPU time of this process."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def _crawl(base_url: str, start_url: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Crawl the site and collect near-duplicate verdicts."""
+    engine = CrawlingEngine(config)
+    flagged = {}
+    crawled = []
+
+    wall_start = time.perf_counter()
+    cpu_start = _cpu_seconds()
+
+    async for result in engine.iter_crawl(start_url):
+        page = result["page"] or {}
+        if result["status"] == "crawled":
+            crawled.append(result["url"])
+        if page.get("near_duplicate_of"):
+            flagged[result["url"]] = page["near_duplicate_of"]
+
+    wall = time.perf_counter() - wall_start
+    cpu = _cpu_seconds() - cpu_start
+
+    async with httpx.AsyncClient() as client:
+        server_stats = (await client.get(f"{base_url}/__stats")).json()
+
+    return {
+        "engine": engine.get_stats(),
+        "wall": wall,
+        "cpu": cpu,
+        "flagged": flagged,
+        "crawled": crawled,
+        "server": server_stats,
+    }
+
+
+def _path(url: str) -> str:
+    """Path of an absolute URL."""
+    return "/" + url.split("/", 3)[-1]
+
+
+def _page_id(url: str) -> Optional[int]:
+    """Canonical page number behind a page, alias or mirror URL."""
+    path = _path(url)
+    match = _PAGE_RE.match(path) or _MIRROR_RE.match(path)
+    return int(match.group(1)) if match else None
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one benchmark and build the JSON report."""
+    site_args = {
+        "pages": args.pages,
+        "fanout": args.fanout,
+        "alias_ratio": args.alias_ratio,
+        "duplicate_ratio": args.duplicate_ratio,
+        "trap_ratio": args.trap_ratio,
+        "seed": args.seed,
+    }
+
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=_serve, args=(site_args, args.latency_ms / 1000, child), daemon=True
+    )
+    server.start()
+
+    try:
+        port = parent.recv()
+        base_url = f"http://127.0.0.1:{port}"
+
+        config = {
+            "max_pages": args.max_pages or args.pages * 2,
+            "max_depth": 1000,
+            "concurrency": args.concurrency,
+            "frontier": args.frontier,
+            "dedup_backend": args.dedup_backend,
+            "near_duplicate_distance": 3,
+            "trap_detection": not args.no_trap_detection,
+            "politeness_delay": 0,
+            "keep_url_lists": False,
+        }
+        crawl = asyncio.run(_crawl(base_url, f"{base_url}/p/0", config))
+
+    finally:
+        server.terminate()
+        server.join()
+
+    engine_stats = crawl["engine"]
+    server_stats = crawl["server"]
+    by_kind = server_stats["by_kind"]
+    pages_crawled = engine_stats["pages_crawled"]
+
+    # URL dedup: every page/alias request beyond the first per page is waste
+    page_requests = by_kind.get("page", 0) + by_kind.get("alias", 0)
+    unique_pages = server_stats["unique_pages"]
+
+    # Near-duplicates: a page and its mirror should be paired. Loop pages
+    # are near-copies of each other too and are reported separately.
+    flagged = {
+        url: original for url, original in crawl["flagged"].items()
+        if _page_id(url) is not None
+    }
+    true_positives = sum(
+        1 for url, original in flagged.items() if _page_id(url) == _page_id(original)
+    )
+    pages_seen = {_page_id(url) for url in crawl["crawled"] if _PAGE_RE.match(_path(url))}
+    mirrors_seen = {_page_id(url) for url in crawl["crawled"] if _MIRROR_RE.match(_path(url))}
+    pairs = len(pages_seen & mirrors_seen)
+
+    return {
+        "benchmark": "crawl",
+        "python": platform.python_version(),
+        "site": {**site_args, "latency_ms": args.latency_ms},
+        "crawler": {
+            key: config[key]
+            for key in (
+                "max_pages", "concurrency", "frontier", "dedup_backend", "trap_detection"
+            )
+        },
+        "results": {
+            "pages_crawled": pages_crawled,
+            "wall_seconds": round(crawl["wall"], 3),
+            "pages_per_second": round(pages_crawled / crawl["wall"], 2) if crawl["wall"] else 0.0,
+            "cpu_seconds": round(crawl["cpu"], 3),
+            "cpu_ms_per_page": (
+                round(crawl["cpu"] * 1000 / pages_crawled, 3) if pages_crawled else 0.0
+            ),
+            "peak_rss_mb": _peak_rss_mb(),
+            "server_requests": server_stats["requests"],
+            "requests_by_kind": by_kind,
+            "url_dedup": {
+                "page_requests": page_requests,
+                "unique_pages": unique_pages,
+                "redundant_fetches": page_requests - unique_pages,
+                "accuracy": round(unique_pages / page_requests, 4) if page_requests else 1.0,
+            },
+            "near_duplicates": {
+                "mirrors_fetched": by_kind.get("mirror", 0),
+                "pairs_fetched": pairs,
+                "flagged": len(flagged),
+                "true_positives": true_positives,
+                "precision": round(true_positives / len(flagged), 4) if flagged else 1.0,
+                "recall": round(true_positives / pairs, 4) if pairs else 1.0,
+            },
+            "traps": {
+                "trap_requests": by_kind.get("trap", 0),
+                "trap_pages_flagged": len(crawl["flagged"]) - len(flagged),
+                "urls_blocked": engine_stats["traps_blocked"],
+            },
+            "connections": engine_stats["connections"],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--alias-ratio", type=float, default=0.1)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    parser.add_argument("--trap-ratio", type=float, default=0.05)
+    parser.add_argument("--no-trap-detection", action="store_true",
+                        help="Crawl without the trap detector (for comparison)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-pages", type=int, default=0,
+                        help="Page budget (default: twice the site size)")
+    parser.add_argument("--frontier", default="queue", choices=["queue", "host"])
+    parser.add_argument("--dedup-backend", default="exact",
+                        choices=["exact", "fingerprint", "bloom"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    logger.remove()
+    report = json.dumps(run(args), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
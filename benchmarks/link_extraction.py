@@ -0,0 +1,90 @@
+"""Microbenchmark: streaming vs BeautifulSoup link extraction.
+
+Usage:
+    python -m benchmarks.link_extraction [--links 2000] [--repeat 20]
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from loguru import logger
+
+from crawling.link_extractor import LinkExtractor
+
+BASE_URL = "https://example.com/section/page.html"
+
+
+def build_page(num_links: int, seed: int = 42) -> str:
+    """Build a synthetic HTML page with a realistic mix of hrefs."""
+    rng = random.Random(seed)
+    hrefs = [
+        lambda i: f"/articles/{i}",
+        lambda i: f"../category/{i % 50}/",
+        lambda i: f"https://example.com/tags/{i % 200}?page={i % 7}#top",
+        lambda i: f"https://other.example.org/{i}",
+        lambda i: f"/downloads/report-{i}.pdf",
+        lambda i: "#comments",
+        lambda i: "javascript:void(0)",
+        lambda i: "/",  # navigation links repeat on every page
+    ]
+
+    body = []
+    for i in range(num_links):
+        href = rng.choice(hrefs)(i)
+        body.append(
+            f'<div class="item"><p>Item {i} with <b>some</b> text.</p>'
+            f'<a href="{href}" class="link">Link {i}</a></div>'
+        )
+
+    return (
+        "<!DOCTYPE html><html><head><title>Benchmark</title>"
+        '<link rel="stylesheet" href="/static/site.css">'
+        '<link rel="canonical" href="https://example.com/section/page.html">'
+        "<script>var x = '<a href=\"/not-a-link\">';</script></head><body>"
+        + "".join(body)
+        + "</body></html>"
+    )
+
+
+def run(num_links: int, repeat: int) -> dict:
+    """Time both backends on the same page and compare their output."""
+    html = build_page(num_links)
+    results = {"links_in_page": num_links, "html_bytes": len(html), "backends": {}}
+
+    outputs = {}
+    for backend in ("bs4", "lxml"):
+        extractor = LinkExtractor(backend=backend)
+        outputs[backend] = set(extractor.extract_links(html, BASE_URL))
+        seconds = min(
+            timeit.repeat(
+                lambda: extractor.extract_links(html, BASE_URL),
+                number=1,
+                repeat=repeat,
+            )
+        )
+        results["backends"][backend] = {
+            "best_ms": round(seconds * 1000, 3),
+            "links_extracted": len(outputs[backend]),
+        }
+
+    results["speedup"] = round(
+        results["backends"]["bs4"]["best_ms"] / results["backends"]["lxml"]["best_ms"], 2
+    )
+    results["same_links"] = outputs["bs4"] == outputs["lxml"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.remove()
+    print(json.dumps(run(args.links, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
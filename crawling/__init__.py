@@ -2,10 +2,19 @@
 
 from .engine import CrawlingEngine
 from .queue_manager import QueueManager
+from .host_frontier import HostFrontier
+from .persistent_frontier import PersistentFrontier
+from .redis_frontier import RedisFrontier
 from .link_extractor import LinkExtractor
+from .url import CrawlURL, parse_url
 
 __all__ = [
     "CrawlingEngine",
     "QueueManager",
+    "HostFrontier",
+    "PersistentFrontier",
+    "RedisFrontier",
     "LinkExtractor",
+    "CrawlURL",
+    "parse_url",
 ]
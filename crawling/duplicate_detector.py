@@ -1,10 +1,11 @@
 """Duplicate URL detection for crawling."""
 
-from typing import Set
-import hashlib
-from urllib.parse import urlparse, parse_qs, urlencode
+import os
 from loguru import logger
 
+from .url import parse_url
+from .url_filter import FingerprintSet, create_filter, load_filter
+
 
 class DuplicateDetector:
     """
@@ -13,16 +14,33 @@ class DuplicateDetector:
     Features:
     - URL normalization
     - Query parameter sorting
-    - Hash-based detection
-    - Fuzzy matching
+    - Pluggable backends (exact set, 64-bit fingerprints, scalable Bloom filter)
+    - Configurable false-positive rate
+    - Serialization to disk
     """
 
-    def __init__(self):
-        """Initialize duplicate detector."""
-        self.seen_urls: Set[str] = set()
-        self.url_hashes: Set[str] = set()
+    def __init__(
+        self,
+        backend: str = "exact",
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        url_filter=None,
+    ):
+        """
+        Initialize duplicate detector.
+
+        Args:
+            backend: Dedup backend (exact, fingerprint, bloom)
+            capacity: Initial filter capacity (bloom only)
+            error_rate: False-positive rate (bloom only)
+            url_filter: Existing filter to use instead of creating one
+        """
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.url_filter = url_filter or create_filter(backend, capacity, error_rate)
 
-        logger.info("Duplicate detector initialized")
+        logger.info(f"Duplicate detector initialized (backend: {backend})")
 
     def is_duplicate(self, url: str) -> bool:
         """
@@ -34,71 +52,70 @@ class DuplicateDetector:
         Returns:
             True if duplicate, False otherwise
         """
-        normalized = self.normalize_url(url)
-        url_hash = self._hash_url(normalized)
-
-        if url_hash in self.url_hashes:
-            return True
-
-        self.seen_urls.add(normalized)
-        self.url_hashes.add(url_hash)
-        return False
+        crawl_url = parse_url(url)
+        if isinstance(self.url_filter, FingerprintSet):
+            # Reuse the fingerprint cached on the interned URL
+            return not self.url_filter.add_fingerprint(crawl_url.fingerprint)
+        return not self.url_filter.add(crawl_url.normalized)
+
+    def is_seen(self, url: str) -> bool:
+        """Check if URL was seen without recording it."""
+        crawl_url = parse_url(url)
+        if isinstance(self.url_filter, FingerprintSet):
+            return crawl_url.fingerprint in self.url_filter.fingerprints
+        return crawl_url.normalized in self.url_filter
 
     def normalize_url(self, url: str) -> str:
         """
         Normalize URL for comparison.
 
+        Lowercases scheme and host, removes default ports and the trailing
+        slash, and sorts query parameters. The result is cached on the
+        interned ``CrawlURL``.
+
         Args:
             url: URL to normalize
 
         Returns:
             Normalized URL
         """
-        try:
-            parsed = urlparse(url)
-
-            # Lowercase scheme and netloc
-            scheme = parsed.scheme.lower()
-            netloc = parsed.netloc.lower()
+        return parse_url(url).normalized
 
-            # Remove default ports
-            if ':80' in netloc and scheme == 'http':
-                netloc = netloc.replace(':80', '')
-            elif ':443' in netloc and scheme == 'https':
-                netloc = netloc.replace(':443', '')
-
-            # Remove trailing slash from path
-            path = parsed.path.rstrip('/')
-            if not path:
-                path = '/'
-
-            # Sort query parameters
-            query_params = parse_qs(parsed.query)
-            sorted_query = urlencode(sorted(query_params.items()), doseq=True)
+    def save(self, path: str):
+        """
+        Save seen URLs to disk.
 
-            # Reconstruct URL
-            normalized = f"{scheme}://{netloc}{path}"
-            if sorted_query:
-                normalized += f"?{sorted_query}"
+        Args:
+            path: Output file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
 
-            return normalized
+        self.url_filter.save(path)
+        logger.info(f"Duplicate detector saved: {path}")
 
-        except Exception as e:
-            logger.debug(f"Error normalizing URL {url}: {e}")
-            return url
+    def load(self, path: str):
+        """
+        Replace seen URLs with a filter saved by ``save``.
 
-    def _hash_url(self, url: str) -> str:
-        """Generate hash for URL."""
-        return hashlib.md5(url.encode()).hexdigest()
+        Args:
+            path: File written by ``save``
+        """
+        self.url_filter = load_filter(path)
+        logger.info(f"Duplicate detector loaded: {path} ({len(self.url_filter)} URLs)")
 
     def clear(self):
         """Clear seen URLs."""
-        self.seen_urls.clear()
-        self.url_hashes.clear()
+        self.url_filter.clear()
         logger.info("Duplicate detector cleared")
 
     def get_stats(self) -> dict:
         """Get duplicate detector statistics."""
-        return {
-            "unique_urls": len(self.seen_urls),
+        stats = {
+            "unique_urls": len(self.url_filter),
+            "backend": self.backend,
         }
+        if hasattr(self.url_filter, "memory_bytes"):
+            stats["filter_bytes"] = self.url_filter.memory_bytes()
+        return stats
@@ -1,17 +1,30 @@
 """Core crawling engine for web crawling."""
 
-from typing import Dict, Any, Optional, Set, List
+from typing import Dict, Any, Optional, Set, List, Tuple, AsyncIterator
 from datetime import datetime
 import asyncio
-from urllib.parse import urljoin, urlparse
+import os
+import time
+from urllib.parse import urljoin
 from loguru import logger
 
 from .queue_manager import QueueManager
+from .host_frontier import HostFrontier
+from .persistent_frontier import PersistentFrontier
+from .redis_frontier import RedisFrontier
 from .robots_parser import RobotsParser
 from .link_extractor import LinkExtractor
 from .duplicate_detector import DuplicateDetector
+from .near_duplicate import NearDuplicateDetector
+from .trap_detector import TrapDetector
 from .politeness_manager import PolitenessManager
+from .scoring import get_scorer, sitemap_score
+from .sitemap_parser import SitemapParser
+from .validator_store import ValidatorStore, content_hash
+from .url import parse_url
 from scraping.static_scraper import StaticScraper
+from scraping.session_pool import ConnectionStats
+import httpx
 
 
 class CrawlingEngine:
@@ -21,11 +34,18 @@ class CrawlingEngine:
     Features:
     - BFS/DFS crawling
     - Robots.txt compliance
-    - Duplicate detection
-    - Politeness delays
+    - Duplicate detection (URL and near-duplicate content)
+    - Politeness delays (adaptive per host)
     - Link extraction
     - Resume capability
+    - Distributed crawling (Redis frontier)
     - Depth limiting
+    - Crawler trap detection
+    - Sitemap seeding
+    - Incremental re-crawls (conditional requests)
+    - Concurrent worker pool
+    - Streaming results (async generator with backpressure)
+    - Pooled keep-alive HTTP client (optional HTTP/2)
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -38,23 +58,95 @@ class CrawlingEngine:
         self.config = config or {}
         self.max_depth = self.config.get("max_depth", 3)
         self.max_pages = self.config.get("max_pages", 1000)
-        self.allowed_domains = self.config.get("allowed_domains", [])
+        self.allowed_domains = [
+            domain.lower() for domain in self.config.get("allowed_domains", [])
+        ]
         self.exclude_patterns = self.config.get("exclude_patterns", [])
+        self.concurrency = max(1, self.config.get("concurrency", 1))
+        self.keep_url_lists = self.config.get("keep_url_lists", True)
 
         # Initialize components
-        self.queue_manager = QueueManager()
-        self.robots_parser = RobotsParser()
-        self.link_extractor = LinkExtractor()
-        self.duplicate_detector = DuplicateDetector()
+        self.robots_parser = RobotsParser(
+            ttl=self.config.get("robots_ttl", 86400.0),
+        )
+        self.link_extractor = LinkExtractor(
+            backend=self.config.get("link_extractor", "lxml")
+        )
+        self.duplicate_detector = DuplicateDetector(
+            backend=self.config.get("dedup_backend", "exact"),
+            capacity=self.config.get("dedup_capacity", 100000),
+            error_rate=self.config.get("dedup_error_rate", 0.001),
+        )
+        near_duplicate_distance = self.config.get("near_duplicate_distance")
+        self.near_duplicate_detector = (
+            NearDuplicateDetector(
+                max_distance=near_duplicate_distance,
+                min_features=self.config.get("near_duplicate_min_features", 10),
+            )
+            if near_duplicate_distance is not None else None
+        )
+        trap_config = self.config.get("trap_detection")
+        self.trap_detector = (
+            TrapDetector(**(trap_config if isinstance(trap_config, dict) else {}))
+            if trap_config else None
+        )
         self.politeness_manager = PolitenessManager(
-            delay=self.config.get("politeness_delay", 1.0)
+            delay=self.config.get("politeness_delay", 1.0),
+            adaptive=self.config.get("adaptive_politeness", False),
+            min_delay=self.config.get("politeness_min_delay", 0.0),
+            max_delay=self.config.get("politeness_max_delay", 60.0),
         )
+        self.queue_manager = self._create_frontier()
+        self._host_scheduled = getattr(self.queue_manager, "schedules_hosts", False)
+        self._persistent = isinstance(self.queue_manager, PersistentFrontier)
+        self._distributed = isinstance(self.queue_manager, RedisFrontier)
+        # Scorers may rank links by their anchor text
+        self._anchor_text = getattr(self.queue_manager, "scorer", None) is not None
+
+        # Seen-URL filter shared by the detector, the frontier and the engine
+        self.dedup_state_path = self.config.get("dedup_state_path")
+        if not self.dedup_state_path and self._persistent:
+            self.dedup_state_path = os.path.splitext(self.queue_manager.path)[0] + ".dedup"
+
+        # Saved seen URLs only apply when resuming; a fresh crawl overwrites them
+        resume = self.config.get("resume")
+        if resume is None:
+            resume = self._persistent and self.queue_manager.resumed
+        if resume and self.dedup_state_path and os.path.exists(self.dedup_state_path):
+            self.duplicate_detector.load(self.dedup_state_path)
+
+        # HTTP validators and links from earlier crawls
+        self.validator_store: Optional[ValidatorStore] = None
+        if self.config.get("incremental"):
+            self.validator_store = ValidatorStore(
+                self.config.get("validator_store_path")
+                or os.path.join(
+                    self.config.get("state_dir", "./storage/crawl_state"),
+                    "validators.sqlite3",
+                )
+            )
 
         # State tracking
         self.crawled_urls: Set[str] = set()
         self.failed_urls: Set[str] = set()
         self.pages_crawled = 0
+        self.pages_failed = 0
+        self.pages_unchanged = 0
+        self.pages_skipped = 0
+        self.pages_truncated = 0
         self.is_running = False
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+        # Shared HTTP client, created per crawl
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.connection_stats = ConnectionStats()
+        self.page_scraper: Optional[StaticScraper] = None
+
+        # Worker pool coordination
+        self._in_flight = 0
+        self._state_changed: Optional[asyncio.Condition] = None
+        self._results: Optional[asyncio.Queue] = None
 
         logger.info("Crawling engine initialized")
 
@@ -68,142 +160,569 @@ class CrawlingEngine:
 
         Args:
             start_url: Starting URL for crawl
-            callback: Optional callback function for each page
+            callback: Optional callback function for each page (runs while
+                the workers keep fetching)
 
         Returns:
             Crawl statistics and results
         """
-        start_time = datetime.utcnow()
+        try:
+            async for result in self.iter_crawl(start_url):
+                if callback and result["status"] == "crawled":
+                    await callback(result["url"], result["page"])
+
+            # Crawl complete
+            duration = (self.finished_at - self.started_at).total_seconds()
+
+            results = {
+                "success": True,
+                "start_url": start_url,
+                "pages_crawled": self.pages_crawled,
+                "pages_failed": self.pages_failed,
+                "pages_unchanged": self.pages_unchanged,
+                "pages_skipped": self.pages_skipped,
+                "pages_truncated": self.pages_truncated,
+                "duration_seconds": duration,
+                "pages_per_second": self._pages_per_second(),
+                "crawled_urls": list(self.crawled_urls),
+                "failed_urls": list(self.failed_urls),
+            }
+
+            logger.info(
+                f"Crawl completed: {self.pages_crawled} pages in {duration:.2f}s"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Crawl failed: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "pages_crawled": self.pages_crawled,
+            }
+
+    async def iter_crawl(self, start_url: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Crawl from a seed URL, yielding each page as soon as it is fetched.
+
+        Results pass through a bounded buffer (``result_buffer_size``): when
+        the consumer falls behind, workers stop pulling URLs from the
+        frontier until it catches up. Close the generator (or let it finish)
+        to release the HTTP client and persist crawl state.
+
+        Args:
+            start_url: Starting URL for crawl
+
+        Yields:
+            Dictionaries with url, depth, status (crawled, failed, or skipped
+            for responses rejected by content type or size) and page
+            (scraper result)
+        """
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
         self.is_running = True
 
+        supervisor: Optional[asyncio.Task] = None
+        workers: List[asyncio.Task] = []
+
         try:
             logger.info(f"Starting crawl from: {start_url}")
 
+            # One pooled client serves every fetch of this crawl
+            self.http_client = self._create_http_client()
+            self.page_scraper = StaticScraper(
+                client=self.http_client,
+                connection_stats=self.connection_stats,
+            )
+            self.robots_parser.client = self.http_client
+
             # Parse start URL
-            parsed = urlparse(start_url)
-            base_domain = parsed.netloc
+            base_domain = parse_url(start_url).host
 
             # Add allowed domain if not specified
             if not self.allowed_domains:
                 self.allowed_domains = [base_domain]
 
-            # Load robots.txt
-            await self.robots_parser.load_robots(f"{parsed.scheme}://{parsed.netloc}")
+            # Load robots.txt (other hosts are loaded when first reached)
+            await self._ensure_robots(start_url)
+
+            # Restore progress from a previous run of this session
+            if self._persistent and self.queue_manager.resumed:
+                self._restore_progress()
 
             # Add start URL to queue
             self.queue_manager.add_url(start_url, depth=0)
 
-            # Crawl loop
-            while self.is_running and not self.queue_manager.is_empty():
-                if self.pages_crawled >= self.max_pages:
+            # Seed the frontier from sitemaps
+            if self.config.get("use_sitemaps"):
+                await self._seed_from_sitemaps(start_url)
+
+            # Run worker pool
+            self._in_flight = 0
+            self._state_changed = asyncio.Condition()
+            self._results = asyncio.Queue(
+                maxsize=self.config.get("result_buffer_size", self.concurrency * 2)
+            )
+            workers = [
+                asyncio.create_task(self._worker())
+                for _ in range(self.concurrency)
+            ]
+            supervisor = asyncio.create_task(self._supervise(workers))
+
+            while True:
+                result = await self._results.get()
+                if result is None:
+                    break
+                yield result
+
+            # Surface worker errors
+            await supervisor
+
+        finally:
+            self.is_running = False
+            for task in [*workers, supervisor]:
+                if task:
+                    task.cancel()
+            if workers:
+                await asyncio.gather(*workers, supervisor, return_exceptions=True)
+
+            self.finished_at = datetime.utcnow()
+            if self._persistent:
+                self.queue_manager.checkpoint(
+                    {"start_url": start_url, "pages_crawled": self.pages_crawled}
+                )
+            if self._distributed:
+                self.queue_manager.close()
+            if self.dedup_state_path:
+                self.duplicate_detector.save(self.dedup_state_path)
+            if self.validator_store:
+                self.validator_store.commit()
+            if self.http_client:
+                await self.http_client.aclose()
+                self.http_client = None
+                self.robots_parser.client = None
+
+    async def _supervise(self, workers: List[asyncio.Task]):
+        """Wait for the worker pool, then signal the end of the results."""
+        error = None
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            # The consumer is gone, nobody waits for the end marker
+            raise
+        except Exception as e:
+            error = e
+
+        await self._results.put(None)
+        if error:
+            raise error
+
+    async def _worker(self):
+        """Pull URLs from the frontier until it drains or limits are hit."""
+        while self.is_running:
+            if self.pages_crawled + self._in_flight >= self.max_pages:
+                if self._in_flight == 0:
                     logger.info(f"Max pages reached: {self.max_pages}")
                     break
+                await self._wait_for_state_change()
+                continue
+
+            url_info = self.queue_manager.get_next_url()
+            if not url_info:
+                if not self.queue_manager.is_empty():
+                    # Every queued host is still inside its politeness window
+                    await self._wait_for_state_change(self.queue_manager.next_ready_in())
+                    continue
 
-                # Get next URL
-                url_info = self.queue_manager.get_next_url()
-                if not url_info:
+                # Other workers may still discover links
+                if self._in_flight == 0:
                     break
+                await self._wait_for_state_change()
+                continue
+
+            self._in_flight += 1
+            status, page_data = "failed", None
+            try:
+                status, page_data = await self._process_url(url_info)
+            except asyncio.CancelledError:
+                # Left unfinished: the frontier requeues it on close or resume
+                status = None
+                raise
+            finally:
+                if status:
+                    self.queue_manager.task_done(url_info["url"], status)
+                self._in_flight -= 1
+                async with self._state_changed:
+                    self._state_changed.notify_all()
+
+            # Blocks while the result buffer is full (backpressure)
+            if page_data is not None:
+                await self._results.put({
+                    "url": url_info["url"],
+                    "depth": url_info["depth"],
+                    "status": status,
+                    "page": page_data,
+                })
+
+        # Wake idle workers so they can observe the exit condition
+        async with self._state_changed:
+            self._state_changed.notify_all()
+
+    async def _wait_for_state_change(self, timeout: float = 1.0):
+        """Block until another worker finishes a page (or ``stop()`` is seen)."""
+        async with self._state_changed:
+            try:
+                await asyncio.wait_for(self._state_changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process_url(
+        self,
+        url_info: Dict[str, Any],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch one frontier entry and queue its outgoing links.
+
+        Returns:
+            Outcome of the URL (crawled, failed or skipped) and the page data
+        """
+        url = url_info["url"]
+        depth = url_info["depth"]
 
-                url = url_info["url"]
-                depth = url_info["depth"]
+        # Check depth limit
+        if depth > self.max_depth:
+            return "skipped", None
 
-                # Skip if already crawled or is duplicate
-                if url in self.crawled_urls or self.duplicate_detector.is_duplicate(url):
-                    continue
+        # Check domain restrictions
+        if not self._is_allowed_domain(url):
+            return "skipped", None
 
-                # Check depth limit
-                if depth > self.max_depth:
-                    continue
+        # Check robots.txt
+        await self._ensure_robots(url)
+        if not self.robots_parser.can_fetch(url):
+            logger.debug(f"Blocked by robots.txt: {url}")
+            return "skipped", None
 
-                # Check robots.txt
-                if not self.robots_parser.can_fetch(url):
-                    logger.debug(f"Blocked by robots.txt: {url}")
-                    continue
+        # Apply politeness delay (host frontiers already schedule per host)
+        if not self._host_scheduled:
+            await self.politeness_manager.wait_if_needed(url)
 
-                # Check domain restrictions
-                if not self._is_allowed_domain(url):
-                    continue
+        # Crawl page
+        page_data = None
+        try:
+            validators = self.validator_store.get(url) if self.validator_store else None
+            page_data = await self._fetch(url, validators)
+
+            if page_data.get("skipped"):
+                self.pages_skipped += 1
+                logger.info(f"Skipped {url}: {page_data.get('error')}")
+                return "skipped", page_data
+
+            if page_data.get("success"):
+                if self.keep_url_lists:
+                    self.crawled_urls.add(url)
+                self.pages_crawled += 1
+                if page_data.get("truncated"):
+                    self.pages_truncated += 1
+
+                # Unchanged since the last crawl: reuse its links, skip parsing
+                stored_links = self._unchanged_links(url, page_data, validators)
+                if stored_links is not None:
+                    self.pages_unchanged += 1
+                    page_data["unchanged"] = True
+
+                    if depth < self.max_depth:
+                        for link in stored_links:
+                            self._enqueue_link(link, depth + 1)
+
+                    logger.info(
+                        f"Unchanged [{self.pages_crawled}/{self.max_pages}]: {url} "
+                        f"(depth: {depth})"
+                    )
+                    return "crawled", page_data
+
+                # Near-copies of seen pages lead to the same links
+                if self.near_duplicate_detector:
+                    original = self.near_duplicate_detector.check(
+                        url, page_data.get("html") or ""
+                    )
+                    if original:
+                        page_data["near_duplicate_of"] = original
+
+                # Extract and queue new links
+                anchors: Dict[str, str] = {}
+                if (
+                    (depth < self.max_depth or self.validator_store)
+                    and not page_data.get("near_duplicate_of")
+                ):
+                    anchors = self.link_extractor.extract_links_with_text(
+                        page_data.get("html", ""),
+                        base_url=url
+                    )
+                links = list(anchors)
+
+                if depth < self.max_depth:
+                    # The frontier drops links the shared detector has seen
+                    for link, anchor_text in anchors.items():
+                        if self._anchor_text and anchor_text:
+                            self._enqueue_link(link, depth + 1, anchor_text=anchor_text)
+                        else:
+                            self._enqueue_link(link, depth + 1)
+
+                if self.validator_store:
+                    headers = page_data.get("headers") or {}
+                    self.validator_store.put(
+                        url,
+                        etag=headers.get("etag"),
+                        last_modified=headers.get("last-modified"),
+                        content_hash=page_data["content_hash"],
+                        links=links,
+                    )
+
+                logger.info(
+                    f"Crawled [{self.pages_crawled}/{self.max_pages}]: {url} "
+                    f"(depth: {depth})"
+                )
+                return "crawled", page_data
+
+            logger.warning(f"Failed to crawl: {url}")
 
-                # Apply politeness delay
-                await self.politeness_manager.wait_if_needed(url)
+        except Exception as e:
+            logger.error(f"Error crawling {url}: {e}")
+            # Streamed like other failures, so consumers see every failed page
+            page_data = {"success": False, "error": str(e)}
+
+        self.pages_failed += 1
+        if self.keep_url_lists:
+            self.failed_urls.add(url)
+        return "failed", page_data
+
+    async def _ensure_robots(self, url: str):
+        """Load the URL host's robots.txt if needed and apply its Crawl-delay."""
+        if await self.robots_parser.ensure_loaded(url):
+            self.politeness_manager.set_crawl_delay(
+                parse_url(url).host, self.robots_parser.get_crawl_delay(url)
+            )
 
-                # Crawl page
-                try:
-                    page_data = await self._crawl_page(url)
+    async def _fetch(
+        self,
+        url: str,
+        validators: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch a page and feed the outcome to the adaptive throttle."""
+        started = time.monotonic()
+        page_data: Dict[str, Any] = {}
+        try:
+            page_data = await self._crawl_page(url, validators)
+            return page_data
+        finally:
+            self.politeness_manager.record_response(
+                url,
+                page_data.get("status_code"),
+                time.monotonic() - started,
+                page_data.get("headers"),
+            )
 
-                    if page_data.get("success"):
-                        self.crawled_urls.add(url)
-                        self.pages_crawled += 1
+            # Keep a host frontier from dispatching into a Retry-After pause
+            host = parse_url(url).host
+            retry_after = self.politeness_manager.retry_after_remaining(host)
+            if retry_after and hasattr(self.queue_manager, "defer_host"):
+                self.queue_manager.defer_host(host, retry_after)
 
-                        # Execute callback if provided
-                        if callback:
-                            await callback(url, page_data)
+    def _unchanged_links(
+        self,
+        url: str,
+        page_data: Dict[str, Any],
+        validators: Optional[Dict[str, Any]],
+    ) -> Optional[List[str]]:
+        """
+        Detect a page that is unchanged since the last crawl.
 
-                        # Extract and queue new links
-                        if depth < self.max_depth:
-                            links = self.link_extractor.extract_links(
-                                page_data.get("html", ""),
-                                base_url=url
-                            )
+        Returns:
+            The page's stored links if it is unchanged, None otherwise
+        """
+        if not self.validator_store:
+            return None
+
+        if page_data.get("not_modified"):
+            if validators is None:
+                return []
+            self.validator_store.touch(url)
+            return validators["links"]
+
+        page_data["content_hash"] = content_hash(page_data.get("html") or "")
+        if validators and validators["content_hash"] == page_data["content_hash"]:
+            # Keep the server's current validators for the next conditional request
+            headers = page_data.get("headers") or {}
+            self.validator_store.put(
+                url,
+                etag=headers.get("etag"),
+                last_modified=headers.get("last-modified"),
+                content_hash=page_data["content_hash"],
+                links=validators["links"],
+            )
+            return validators["links"]
 
-                            for link in links:
-                                if link not in self.crawled_urls:
-                                    self.queue_manager.add_url(link, depth=depth + 1)
+        return None
 
-                        logger.info(
-                            f"Crawled [{self.pages_crawled}/{self.max_pages}]: {url} "
-                            f"(depth: {depth})"
-                        )
-                    else:
-                        self.failed_urls.add(url)
-                        logger.warning(f"Failed to crawl: {url}")
+    async def _seed_from_sitemaps(self, start_url: str):
+        """Queue URLs listed in the site's sitemaps, scored by lastmod/priority."""
+        sitemap_urls = self.robots_parser.get_sitemaps(start_url) or [
+            f"{parse_url(start_url).origin}/sitemap.xml"
+        ]
 
-                except Exception as e:
-                    logger.error(f"Error crawling {url}: {e}")
-                    self.failed_urls.add(url)
+        sitemap_parser = SitemapParser(
+            client=self.http_client,
+            max_urls=self.config.get("sitemap_max_urls", 50000),
+        )
 
-            # Crawl complete
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+        seeded = 0
+        async for entry in sitemap_parser.iter_urls(*sitemap_urls):
+            if not self._is_allowed_domain(entry["url"]):
+                continue
 
-            results = {
-                "success": True,
-                "start_url": start_url,
-                "pages_crawled": self.pages_crawled,
-                "pages_failed": len(self.failed_urls),
-                "duration_seconds": duration,
-                "crawled_urls": list(self.crawled_urls),
-                "failed_urls": list(self.failed_urls),
-            }
+            self._enqueue_link(
+                entry["url"],
+                depth=0,
+                priority=sitemap_score(entry["priority"], entry["lastmod"]),
+                lastmod=entry["lastmod"],
+            )
+            seeded += 1
+
+        logger.info(f"Seeded {seeded} URLs from sitemaps")
+
+    def _enqueue_link(self, link: str, depth: int, priority: float = 0.0, **context):
+        """Queue a discovered link, deprioritizing or dropping trap URLs."""
+        if self.trap_detector:
+            # Only count each distinct URL once in the trap statistics
+            if self.duplicate_detector.is_seen(link) or (
+                self._persistent and self.queue_manager.is_seen(link)
+            ):
+                return
+
+            verdict = self.trap_detector.assess(link)
+            if verdict["blocked"]:
+                # Remember the URL so repeated links are not assessed again
+                self.duplicate_detector.is_duplicate(link)
+                return
+            priority -= verdict["penalty"]
+
+        self.queue_manager.add_url(link, depth=depth, priority=priority, **context)
+
+    def _create_frontier(self):
+        """Create the URL frontier selected by the ``frontier`` config key."""
+        frontier = self.config.get("frontier", "queue")
+
+        if frontier == "host":
+            return HostFrontier(
+                politeness_manager=self.politeness_manager,
+                duplicate_detector=self.duplicate_detector,
+            )
+        if frontier == "queue":
+            return QueueManager(
+                queue_type=self.config.get("queue_type", "fifo"),
+                scorer=get_scorer(
+                    self.config.get("scorer"),
+                    keywords=self.config.get("priority_keywords"),
+                ),
+                duplicate_detector=self.duplicate_detector,
+            )
 
-            logger.info(
-                f"Crawl completed: {self.pages_crawled} pages in {duration:.2f}s"
+        if frontier == "persistent":
+            session_id = self.config.get("session_id", "default")
+            state_dir = self.config.get("state_dir", "./storage/crawl_state")
+            return PersistentFrontier(
+                os.path.join(state_dir, f"session_{session_id}.sqlite3"),
+                queue_type=self.config.get("queue_type", "fifo"),
+                scorer=get_scorer(
+                    self.config.get("scorer"),
+                    keywords=self.config.get("priority_keywords"),
+                ),
+                buffer_size=self.config.get("frontier_buffer_size", 1000),
+                checkpoint_interval=self.config.get("checkpoint_interval", 100),
+                duplicate_detector=self.duplicate_detector,
             )
-            return results
 
-        except Exception as e:
-            logger.error(f"Crawl failed: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "pages_crawled": self.pages_crawled,
-            }
-        finally:
-            self.is_running = False
+        if frontier == "redis":
+            import redis
+
+            return RedisFrontier(
+                redis.Redis.from_url(
+                    self.config.get("redis_url", "redis://localhost:6379/0")
+                ),
+                crawl_id=self.config.get("crawl_id", "default"),
+                politeness_manager=self.politeness_manager,
+                batch_size=self.config.get("frontier_batch_size", self.concurrency),
+                lease_seconds=self.config.get("lease_seconds", 300.0),
+                max_leases_per_host=self.config.get("max_leases_per_host", 1),
+                max_pages=self.max_pages,
+                duplicate_detector=self.duplicate_detector,
+            )
+
+        raise ValueError(f"Unknown frontier type: {frontier}")
 
-    async def _crawl_page(self, url: str) -> Dict[str, Any]:
-        """Crawl a single page."""
-        scraper = StaticScraper()
-        return await scraper.scrape(url, {"include_html": True})
+    def _restore_progress(self):
+        """Reload crawl results recorded by an earlier run of this session."""
+        if self.keep_url_lists:
+            self.crawled_urls.update(self.queue_manager.iter_urls("crawled"))
+            self.failed_urls.update(self.queue_manager.iter_urls("failed"))
+        self.pages_crawled = self.queue_manager.count("crawled")
+        self.pages_failed = self.queue_manager.count("failed")
+
+        logger.info(
+            f"Resuming crawl: {self.pages_crawled} pages crawled, "
+            f"{self.queue_manager.size()} pending"
+        )
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the keep-alive client shared by all workers."""
+        limits = httpx.Limits(
+            max_connections=self.config.get("max_connections", max(10, self.concurrency * 2)),
+            max_keepalive_connections=self.config.get(
+                "max_keepalive_connections", max(10, self.concurrency * 2)
+            ),
+            keepalive_expiry=self.config.get("keepalive_expiry", 30.0),
+        )
+        client_args = {
+            "limits": limits,
+            "timeout": self.config.get("request_timeout", 30),
+            "follow_redirects": True,
+            "headers": {"User-Agent": self.robots_parser.user_agent},
+        }
+
+        if self.config.get("http2"):
+            try:
+                return httpx.AsyncClient(http2=True, **client_args)
+            except ImportError:
+                logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+
+        return httpx.AsyncClient(**client_args)
+
+    async def _crawl_page(
+        self,
+        url: str,
+        validators: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Crawl a single page, conditionally if validators are known."""
+        return await self.page_scraper.scrape(
+            url,
+            {
+                "include_html": True,
+                "timeout": self.config.get("request_timeout", 30),
+                "headers": ValidatorStore.conditional_headers(validators),
+                "max_bytes": self.config.get("max_page_bytes", 5 * 1024 * 1024),
+                "allowed_content_types": self.config.get(
+                    "allowed_content_types", ["text/html", "application/xhtml+xml"]
+                ),
+            },
+        )
 
     def _is_allowed_domain(self, url: str) -> bool:
         """Check if URL domain is allowed."""
-        parsed = urlparse(url)
-        domain = parsed.netloc
-
         if not self.allowed_domains:
             return True
 
+        domain = parse_url(url).host
         return any(
             domain == allowed or domain.endswith(f".{allowed}")
             for allowed in self.allowed_domains
@@ -214,11 +733,39 @@ class CrawlingEngine:
         logger.info("Stopping crawl...")
         self.is_running = False
 
+    def _pages_per_second(self) -> float:
+        """Compute crawl throughput for the current or last crawl."""
+        if not self.started_at:
+            return 0.0
+
+        end_time = self.finished_at or datetime.utcnow()
+        elapsed = (end_time - self.started_at).total_seconds()
+        if elapsed <= 0:
+            return 0.0
+
+        return round(self.pages_crawled / elapsed, 3)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get current crawling statistics."""
         return {
             "pages_crawled": self.pages_crawled,
             "pages_queued": self.queue_manager.size(),
-            "pages_failed": len(self.failed_urls),
+            "pages_failed": self.pages_failed,
+            "pages_in_flight": self._in_flight,
+            "pages_per_second": self._pages_per_second(),
+            "concurrency": self.concurrency,
+            "pages_unchanged": self.pages_unchanged,
+            "pages_skipped": self.pages_skipped,
+            "pages_truncated": self.pages_truncated,
+            "near_duplicates": (
+                self.near_duplicate_detector.duplicates_found
+                if self.near_duplicate_detector else 0
+            ),
+            "traps_blocked": (
+                sum(self.trap_detector.blocked.values()) if self.trap_detector else 0
+            ),
+            "connections": self.connection_stats.get_stats(),
+            "politeness": self.politeness_manager.get_stats(),
+            "robots": self.robots_parser.get_stats(),
             "is_running": self.is_running,
         }
@@ -0,0 +1,213 @@
+"""Per-host sharded crawl frontier."""
+
+import heapq
+import time
+from typing import Dict, Any, Optional, List, Tuple
+from itertools import count
+from loguru import logger
+
+from .url import parse_url
+
+
+class HostFrontier:
+    """
+    Crawl frontier with one priority queue per host.
+
+    Hosts are scheduled through a min-heap keyed on the time each host may
+    next be fetched, so ``get_next_url`` only ever hands out a URL that can
+    be requested right away. A slow or rate-limited host delays only its own
+    queue instead of the whole crawl.
+
+    Features:
+    - Per-host priority queues (FIFO among equal priorities)
+    - Ready-time heap scheduling (O(log hosts) per URL)
+    - Politeness enforced at dispatch time
+    - URL deduplication
+    """
+
+    # The engine skips its own politeness sleep for host-scheduled frontiers
+    schedules_hosts = True
+
+    def __init__(
+        self,
+        politeness_manager=None,
+        delay: float = 1.0,
+        duplicate_detector=None,
+    ):
+        """
+        Initialize host frontier.
+
+        Args:
+            politeness_manager: PolitenessManager used for per-host delays
+            delay: Delay between requests to one host when no manager is set
+            duplicate_detector: Shared DuplicateDetector used instead of the
+                frontier's own seen set
+        """
+        self.politeness_manager = politeness_manager
+        self.default_delay = delay
+        self.duplicate_detector = duplicate_detector
+
+        # Only hosts with pending URLs keep a queue and a single heap entry;
+        # host queues hold (-priority, sequence, url_info) heap entries
+        self.host_queues: Dict[str, List[Tuple[float, int, Dict[str, Any]]]] = {}
+        self.ready_heap: List[Tuple[float, str]] = []
+        self.next_allowed: Dict[str, float] = {}
+        self.seen_urls = set()
+        self._sequence = count()
+        self._size = 0
+
+        logger.info("Host frontier initialized")
+
+    def add_url(self, url: str, depth: int = 0, priority: float = 0, **context):
+        """
+        Add URL to its host queue.
+
+        Args:
+            url: URL to add
+            depth: Crawl depth
+            priority: Priority level within the host (higher = sooner)
+            **context: Extra fields stored with the URL
+        """
+        if not self._is_new(url):
+            return
+
+        url_info = {
+            "url": url,
+            "depth": depth,
+            "priority": priority,
+            **context,
+        }
+
+        host = parse_url(url).host
+        queue = self.host_queues.get(host)
+        if queue is None:
+            queue = []
+            self.host_queues[host] = queue
+            ready_at = max(time.monotonic(), self.next_allowed.get(host, 0.0))
+            self.next_allowed[host] = ready_at
+            heapq.heappush(self.ready_heap, (ready_at, host))
+
+        # Sequence number keeps FIFO order among equal priorities
+        heapq.heappush(queue, (-priority, next(self._sequence), url_info))
+        self._size += 1
+
+    def _is_new(self, url: str) -> bool:
+        """Check and record whether a URL was ever queued."""
+        if self.duplicate_detector:
+            return not self.duplicate_detector.is_duplicate(url)
+
+        if url in self.seen_urls:
+            return False
+
+        self.seen_urls.add(url)
+        return True
+
+    def get_next_url(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the next URL whose host may be fetched now.
+
+        Returns:
+            URL info dictionary, or None if the frontier is empty or every
+            queued host is still inside its politeness window
+        """
+        self._discard_stale()
+        if not self.ready_heap:
+            return None
+
+        now = time.monotonic()
+        ready_at, host = self.ready_heap[0]
+        if ready_at > now:
+            return None
+
+        heapq.heappop(self.ready_heap)
+        queue = self.host_queues[host]
+        url_info = heapq.heappop(queue)[2]
+        self._size -= 1
+
+        next_ready = now + self._get_delay(host)
+        self.next_allowed[host] = next_ready
+
+        if queue:
+            heapq.heappush(self.ready_heap, (next_ready, host))
+        else:
+            del self.host_queues[host]
+
+        return url_info
+
+    def next_ready_in(self) -> Optional[float]:
+        """
+        Seconds until the next host becomes fetchable.
+
+        Returns:
+            Wait time in seconds (0 if a URL is ready), or None if empty
+        """
+        self._discard_stale()
+        if not self.ready_heap:
+            return None
+
+        return max(0.0, self.ready_heap[0][0] - time.monotonic())
+
+    def defer_host(self, host: str, seconds: float):
+        """
+        Push back the next fetch of a host (e.g. after a Retry-After).
+
+        Args:
+            host: Host (netloc) to defer
+            seconds: Minimum time from now until the host is fetched again
+        """
+        ready_at = time.monotonic() + seconds
+        if ready_at <= self.next_allowed.get(host, 0.0):
+            return
+
+        self.next_allowed[host] = ready_at
+        if host in self.host_queues:
+            # The previous heap entry is now stale and dropped when reached
+            heapq.heappush(self.ready_heap, (ready_at, host))
+
+    def _discard_stale(self):
+        """Drop heap entries superseded by ``defer_host``."""
+        heap = self.ready_heap
+        while heap:
+            ready_at, host = heap[0]
+            if host in self.host_queues and ready_at >= self.next_allowed[host]:
+                return
+            heapq.heappop(heap)
+
+    def _get_delay(self, host: str) -> float:
+        """Get politeness delay for a host."""
+        if self.politeness_manager:
+            return self.politeness_manager.get_delay(host)
+        return self.default_delay
+
+    def task_done(self, url: str, status: str):
+        """Record the outcome of a dequeued URL (nothing to persist in memory)."""
+        pass
+
+    def is_empty(self) -> bool:
+        """Check if frontier is empty."""
+        return self._size == 0
+
+    def size(self) -> int:
+        """Get number of queued URLs."""
+        return self._size
+
+    def clear(self):
+        """Clear the frontier."""
+        self.host_queues.clear()
+        self.ready_heap.clear()
+        self.next_allowed.clear()
+        self.seen_urls.clear()
+        self._size = 0
+        logger.info("Host frontier cleared")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get frontier statistics."""
+        return {
+            "queue_size": self._size,
+            "seen_urls": (
+                len(self.duplicate_detector.url_filter)
+                if self.duplicate_detector else len(self.seen_urls)
+            ),
+            "active_hosts": len(self.host_queues),
+            "queue_type": "host",
+        }
@@ -1,10 +1,51 @@
 """Link extraction from HTML pages."""
 
-from typing import List, Set
+from typing import Dict, List
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
+from lxml import etree
 from loguru import logger
 
+from .url import parse_url
+
+_SKIPPED_PREFIXES = ('#', 'javascript:', 'mailto:', 'tel:')
+
+# Longest anchor text kept per link
+MAX_ANCHOR_TEXT = 200
+
+
+def _clean_text(text: str) -> str:
+    """Collapse whitespace and cap the length of anchor text."""
+    return ' '.join(text.split())[:MAX_ANCHOR_TEXT]
+
+
+class _HrefCollector:
+    """lxml parser target that records hrefs of <a> and <link> tags with their text."""
+
+    def __init__(self):
+        self.hrefs: List[List[str]] = []
+        self._anchor_text = None
+
+    def start(self, tag, attrib):
+        if tag == 'a' or tag == 'link':
+            href = attrib.get('href')
+            if href is not None:
+                entry = [href, '']
+                self.hrefs.append(entry)
+                if tag == 'a':
+                    self._anchor_text = entry
+
+    def data(self, data):
+        if self._anchor_text is not None:
+            self._anchor_text[1] += data
+
+    def end(self, tag):
+        if tag == 'a':
+            self._anchor_text = None
+
+    def close(self) -> List[List[str]]:
+        return self.hrefs
+
 
 class LinkExtractor:
     """
@@ -15,10 +56,22 @@ class LinkExtractor:
     - Link filtering
     - Duplicate removal
     - Multiple link types support
+    - Streaming lxml backend with BeautifulSoup fallback
+    - Anchor text capture for link scoring
     """
 
-    def __init__(self):
-        """Initialize link extractor."""
+    def __init__(self, backend: str = "lxml"):
+        """
+        Initialize link extractor.
+
+        Args:
+            backend: Extraction backend. "lxml" streams parser events and
+                never builds a tree; "bs4" builds a BeautifulSoup tree.
+        """
+        if backend not in ("lxml", "bs4"):
+            raise ValueError(f"Unknown link extractor backend: {backend}")
+
+        self.backend = backend
         self.excluded_extensions = {
             '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg',
             '.zip', '.tar', '.gz', '.rar', '.7z',
@@ -43,23 +96,106 @@ class LinkExtractor:
         Returns:
             List of extracted URLs
         """
+        return list(self.extract_links_with_text(html, base_url, include_external))
+
+    def extract_links_with_text(
+        self,
+        html: str,
+        base_url: str,
+        include_external: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Extract links from HTML content together with their anchor text.
+
+        Args:
+            html: HTML content
+            base_url: Base URL for resolving relative links
+            include_external: Whether to include external links
+
+        Returns:
+            Dictionary mapping each extracted URL to its anchor text (the
+            first non-empty text among the anchors pointing to it)
+        """
+        if self.backend == "lxml":
+            try:
+                return self._extract_links_streaming(html, base_url, include_external)
+            except Exception as e:
+                logger.debug(f"Streaming link extraction failed, using bs4: {e}")
+
+        return self._extract_links_soup(html, base_url, include_external)
+
+    def _extract_links_streaming(
+        self,
+        html: str,
+        base_url: str,
+        include_external: bool,
+    ) -> Dict[str, str]:
+        """
+        Extract links from parser events in one pass.
+
+        Resolution, fragment stripping, scheme/domain checks and extension
+        filtering share a single interned ``CrawlURL`` per distinct href,
+        which later crawl stages look up instead of parsing again.
+        """
+        parser = etree.HTMLParser(target=_HrefCollector(), encoding='utf-8')
+        parser.feed(html.encode('utf-8', 'surrogatepass'))
+        hrefs = parser.close()
+
+        base_domain = parse_url(base_url).host
+        excluded_suffixes = tuple(self.excluded_extensions)
+        links: Dict[str, str] = {}
+        anchors: Dict[str, str] = {}
+        for href, text in hrefs:
+            if not anchors.get(href):
+                anchors[href] = text
+
+        # Navigation links repeat on most pages, resolve each href once
+        for href, text in anchors.items():
+            text = _clean_text(text)
+            href = href.strip()
+            if not href or href.startswith(_SKIPPED_PREFIXES):
+                continue
+
+            absolute = urljoin(base_url, href).split('#', 1)[0]
+            parts = parse_url(absolute)
+
+            if parts.scheme not in ('http', 'https') or not parts.host:
+                continue
+            if not include_external and parts.host != base_domain:
+                continue
+            if parts.path.lower().endswith(excluded_suffixes):
+                continue
+
+            if not links.get(absolute):
+                links[absolute] = text
+
+        logger.debug(f"Extracted {len(links)} links from {base_url}")
+        return links
+
+    def _extract_links_soup(
+        self,
+        html: str,
+        base_url: str,
+        include_external: bool,
+    ) -> Dict[str, str]:
+        """Extract links from a BeautifulSoup tree."""
         try:
             soup = BeautifulSoup(html, 'lxml')
-            links: Set[str] = set()
+            links: Dict[str, str] = {}
 
             # Extract from <a> tags
             for tag in soup.find_all('a', href=True):
                 href = tag['href']
                 absolute_url = self._make_absolute(href, base_url)
-                if absolute_url:
-                    links.add(absolute_url)
+                if absolute_url and not links.get(absolute_url):
+                    links[absolute_url] = _clean_text(tag.get_text(' '))
 
             # Extract from <link> tags
             for tag in soup.find_all('link', href=True):
                 href = tag['href']
                 absolute_url = self._make_absolute(href, base_url)
                 if absolute_url:
-                    links.add(absolute_url)
+                    links.setdefault(absolute_url, '')
 
             # Extract from <img> tags (optional)
             # for tag in soup.find_all('img', src=True):
@@ -69,10 +205,10 @@ class LinkExtractor:
             #         links.add(absolute_url)
 
             # Filter links
-            filtered_links = []
+            filtered_links: Dict[str, str] = {}
             base_domain = urlparse(base_url).netloc
 
-            for link in links:
+            for link, text in links.items():
                 if not self._is_valid_url(link):
                     continue
 
@@ -84,14 +220,14 @@ class LinkExtractor:
                 if self._has_excluded_extension(link):
                     continue
 
-                filtered_links.append(link)
+                filtered_links[link] = text
 
             logger.debug(f"Extracted {len(filtered_links)} links from {base_url}")
             return filtered_links
 
         except Exception as e:
             logger.error(f"Error extracting links: {e}")
-            return []
+            return {}
 
     def _make_absolute(self, url: str, base_url: str) -> str:
         """Convert relative URL to absolute."""
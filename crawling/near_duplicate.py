@@ -0,0 +1,238 @@
+"""Content-level near-duplicate detection using SimHash."""
+
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+from loguru import logger
+
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>", re.S | re.I)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+", re.U)
+
+# SimHash bits are accumulated in 32-bit lanes of one big integer, so a
+# feature's contribution is eight table lookups instead of 64 bit tests.
+_LANE_BITS = 32
+_LANE_MASK = (1 << _LANE_BITS) - 1
+_BYTE_SPREAD = [
+    sum(1 << (bit * _LANE_BITS) for bit in range(8) if value >> bit & 1)
+    for value in range(256)
+]
+
+
+def extract_text(html: str) -> str:
+    """
+    Cheaply extract visible text from HTML for fingerprinting.
+
+    Args:
+        html: HTML content
+
+    Returns:
+        Text with scripts, styles, comments and tags removed
+    """
+    html = _SCRIPT_STYLE_RE.sub(" ", html)
+    html = _COMMENT_RE.sub(" ", html)
+    return _TAG_RE.sub(" ", html)
+
+
+def shingles(text: str, shingle_size: int = 2) -> Counter:
+    """
+    Split text into weighted SimHash features.
+
+    Args:
+        text: Text to split
+        shingle_size: Number of consecutive words per feature
+
+    Returns:
+        Counter of word shingles (single words for very short texts)
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) >= shingle_size:
+        return Counter(
+            " ".join(tokens[i:i + shingle_size])
+            for i in range(len(tokens) - shingle_size + 1)
+        )
+    return Counter(tokens)
+
+
+def simhash(text: str, shingle_size: int = 2) -> int:
+    """
+    Compute a 64-bit SimHash of text.
+
+    Args:
+        text: Text to fingerprint
+        shingle_size: Number of consecutive words per feature
+
+    Returns:
+        64-bit fingerprint (similar texts differ in few bits)
+    """
+    return simhash_features(shingles(text, shingle_size))
+
+
+def simhash_features(features: Counter) -> int:
+    """
+    Compute a 64-bit SimHash from weighted features.
+
+    Args:
+        features: Counter mapping each feature to its weight
+
+    Returns:
+        64-bit fingerprint (0 when there are no features)
+    """
+    if not features:
+        return 0
+
+    lanes = 0
+    total_weight = 0
+    for feature, weight in features.items():
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        spread = 0
+        for index, value in enumerate(digest):
+            spread |= _BYTE_SPREAD[value] << (index * 8 * _LANE_BITS)
+        lanes += spread * weight
+        total_weight += weight
+
+    # Bit i is set when the weight of features with bit i set is a majority
+    fingerprint = 0
+    for bit in range(64):
+        if ((lanes >> (bit * _LANE_BITS)) & _LANE_MASK) * 2 > total_weight:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class NearDuplicateDetector:
+    """
+    Detect pages whose content nearly matches an already seen page.
+
+    Fingerprints are split into ``max_distance + 1`` bands. Two fingerprints
+    within ``max_distance`` bits of each other must agree exactly on at least
+    one band (pigeonhole principle), so a lookup only compares against pages
+    sharing a band value instead of scanning every fingerprint.
+
+    Features:
+    - SimHash fingerprints of extracted page text
+    - Banded index for Hamming-distance lookups
+    - Configurable distance threshold
+    - Pages with too little text are never indexed or matched
+    """
+
+    def __init__(
+        self,
+        max_distance: int = 3,
+        shingle_size: int = 2,
+        min_features: int = 10,
+    ):
+        """
+        Initialize near-duplicate detector.
+
+        Args:
+            max_distance: Maximum differing bits for pages to count as copies
+            shingle_size: Number of consecutive words per SimHash feature
+            min_features: Minimum distinct features for a page to be checked.
+                Fingerprints of empty or near-empty pages (script shells,
+                image pages, redirect stubs) collide regardless of content.
+        """
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.min_features = min_features
+
+        num_bands = max_distance + 1
+        band_bits = 64 // num_bands
+        self.band_slices = [
+            (i * band_bits, band_bits if i < num_bands - 1 else 64 - i * band_bits)
+            for i in range(num_bands)
+        ]
+        self.bands: List[Dict[int, List[int]]] = [{} for _ in range(num_bands)]
+        self.fingerprints: Dict[int, str] = {}
+        self.duplicates_found = 0
+        self.pages_too_short = 0
+
+        logger.info(f"Near-duplicate detector initialized (max distance: {max_distance})")
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        """Split a fingerprint into its band values."""
+        return [
+            (fingerprint >> offset) & ((1 << width) - 1)
+            for offset, width in self.band_slices
+        ]
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """
+        Find an indexed page near a fingerprint.
+
+        Args:
+            fingerprint: SimHash fingerprint
+
+        Returns:
+            URL of the matching page or None
+        """
+        exact = self.fingerprints.get(fingerprint)
+        if exact is not None:
+            return exact
+
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            for candidate in band.get(key, ()):
+                if (candidate ^ fingerprint).bit_count() <= self.max_distance:
+                    return self.fingerprints[candidate]
+        return None
+
+    def add(self, fingerprint: int, url: str):
+        """
+        Index a page fingerprint.
+
+        Args:
+            fingerprint: SimHash fingerprint
+            url: URL of the page
+        """
+        if fingerprint in self.fingerprints:
+            return
+
+        self.fingerprints[fingerprint] = url
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            band.setdefault(key, []).append(fingerprint)
+
+    def check(self, url: str, html: str) -> Optional[str]:
+        """
+        Check a page and index it if it is new.
+
+        Args:
+            url: URL of the page
+            html: Page HTML
+
+        Returns:
+            URL of the page it nearly duplicates, or None if it is new or
+            has too little text to compare
+        """
+        features = shingles(extract_text(html), self.shingle_size)
+        if len(features) < self.min_features:
+            self.pages_too_short += 1
+            return None
+
+        fingerprint = simhash_features(features)
+        original = self.find(fingerprint)
+
+        if original is not None:
+            self.duplicates_found += 1
+            logger.debug(f"Near-duplicate page: {url} ~ {original}")
+            return original
+
+        self.add(fingerprint, url)
+        return None
+
+    def clear(self):
+        """Clear indexed fingerprints."""
+        for band in self.bands:
+            band.clear()
+        self.fingerprints.clear()
+        self.duplicates_found = 0
+        self.pages_too_short = 0
+
+    def get_stats(self) -> dict:
+        """Get near-duplicate detector statistics."""
+        return {
+            "indexed_pages": len(self.fingerprints),
+            "near_duplicates": self.duplicates_found,
+            "pages_too_short": self.pages_too_short,
+            "max_distance": self.max_distance,
+        }
@@ -0,0 +1,359 @@
+"""Disk-backed crawl frontier with checkpoint and resume support."""
+
+import json
+import os
+import sqlite3
+from typing import Dict, Any, Optional, Callable, Iterator
+from collections import deque
+from loguru import logger
+
+from .url import parse_url
+
+
+class PersistentFrontier:
+    """
+    SQLite-backed crawl frontier and visited set.
+
+    Every URL ever queued is a row in one table together with its crawl
+    state, so the frontier and the visited set survive a crash or a Celery
+    time limit. Only bounded buffers live in memory: new URLs are written in
+    batches and pending URLs are read back in batches.
+
+    URLs handed out but not finished when a crawl stops are put back into
+    the pending state on the next open, so a resumed crawl continues exactly
+    where the last checkpoint left it.
+
+    Features:
+    - FIFO/LIFO/priority ordering
+    - On-disk URL deduplication (on the normalized URL)
+    - Bounded in-memory buffers
+    - Periodic checkpoints
+    - Resume after crash
+    """
+
+    STATE_PENDING = 0
+    STATE_IN_FLIGHT = 1
+    STATE_CRAWLED = 2
+    STATE_FAILED = 3
+    STATE_SKIPPED = 4
+
+    STATES = {
+        "pending": STATE_PENDING,
+        "in_flight": STATE_IN_FLIGHT,
+        "crawled": STATE_CRAWLED,
+        "failed": STATE_FAILED,
+        "skipped": STATE_SKIPPED,
+    }
+
+    ORDERINGS = {
+        "fifo": "id ASC",
+        "lifo": "id DESC",
+        "priority": "priority DESC, id ASC",
+    }
+
+    def __init__(
+        self,
+        path: str,
+        queue_type: str = "fifo",
+        scorer: Optional[Callable[[Dict[str, Any]], float]] = None,
+        buffer_size: int = 1000,
+        checkpoint_interval: int = 100,
+        duplicate_detector=None,
+    ):
+        """
+        Initialize persistent frontier.
+
+        Args:
+            path: SQLite database file (created if missing)
+            queue_type: Type of queue (fifo, lifo, priority)
+            scorer: Optional function mapping a URL info dict to its priority
+            buffer_size: Maximum URLs held in each in-memory buffer
+            checkpoint_interval: Finished URLs between automatic checkpoints
+            duplicate_detector: Shared DuplicateDetector checked before the
+                on-disk visited set, so repeated links skip the database
+        """
+        if queue_type not in self.ORDERINGS:
+            raise ValueError(f"Unknown queue type: {queue_type}")
+
+        self.path = path
+        self.queue_type = queue_type
+        self.scorer = scorer
+        self.buffer_size = buffer_size
+        self.checkpoint_interval = checkpoint_interval
+        self.duplicate_detector = duplicate_detector
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS urls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                key TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                priority REAL NOT NULL DEFAULT 0,
+                state INTEGER NOT NULL DEFAULT 0,
+                context TEXT
+            )
+            """
+        )
+        self._migrate_keys()
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_urls_key ON urls (key)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_urls_state ON urls (state, priority, id)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+
+        # Requeue URLs that were in flight when the previous run stopped
+        recovered = self.conn.execute(
+            "UPDATE urls SET state = ? WHERE state = ?",
+            (self.STATE_PENDING, self.STATE_IN_FLIGHT),
+        ).rowcount
+        self.conn.commit()
+
+        # Bounded buffers
+        self._insert_buffer: Dict[str, tuple] = {}
+        self._ready: deque = deque()
+        self._state_updates: list = []
+        self._finished_since_checkpoint = 0
+
+        self._pending = self._count_state(self.STATE_PENDING)
+        self.resumed = self._count_all() > 0
+
+        logger.info(
+            f"Persistent frontier opened: {path} "
+            f"({self._pending} pending, {recovered} recovered)"
+        )
+
+    def add_url(self, url: str, depth: int = 0, priority: float = 0, **context):
+        """
+        Add URL to the frontier if it was never queued before.
+
+        Args:
+            url: URL to add
+            depth: Crawl depth
+            priority: Priority level (higher = more important)
+            **context: Extra fields stored with the URL
+        """
+        if self.duplicate_detector and self.duplicate_detector.is_duplicate(url):
+            return
+
+        # A fresh in-memory detector knows nothing about earlier runs
+        if (not self.duplicate_detector or self.resumed) and self.is_seen(url):
+            return
+
+        url_info = {"url": url, "depth": depth, "priority": priority, **context}
+        if self.queue_type == "priority" and self.scorer:
+            priority = self.scorer(url_info)
+
+        key = parse_url(url).normalized
+        self._insert_buffer[key] = (
+            url,
+            key,
+            depth,
+            priority,
+            self.STATE_PENDING,
+            json.dumps(context) if context else None,
+        )
+        self._pending += 1
+
+        if len(self._insert_buffer) >= self.buffer_size:
+            self._flush_inserts()
+
+    def is_seen(self, url: str) -> bool:
+        """Check whether a URL (or an alias of it) was ever queued."""
+        key = parse_url(url).normalized
+        if key in self._insert_buffer:
+            return True
+
+        row = self.conn.execute("SELECT 1 FROM urls WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def get_next_url(self) -> Optional[Dict[str, Any]]:
+        """
+        Get next URL from the frontier.
+
+        Returns:
+            URL info dictionary or None
+        """
+        if not self._ready:
+            self._fill_ready_buffer()
+
+        if not self._ready:
+            return None
+
+        self._pending -= 1
+        return self._ready.popleft()
+
+    def task_done(self, url: str, status: str):
+        """
+        Record the outcome of a URL handed out by ``get_next_url``.
+
+        Args:
+            url: URL that was processed
+            status: One of crawled, failed or skipped
+        """
+        self._state_updates.append((self.STATES[status], parse_url(url).normalized))
+        self._finished_since_checkpoint += 1
+
+        if self._finished_since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def checkpoint(self, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Flush buffers and commit the frontier state to disk.
+
+        Args:
+            metadata: Optional key/value pairs to store with the checkpoint
+        """
+        self._flush_inserts()
+
+        if self._state_updates:
+            self.conn.executemany(
+                "UPDATE urls SET state = ? WHERE key = ?", self._state_updates
+            )
+            self._state_updates.clear()
+
+        for key, value in (metadata or {}).items():
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, json.dumps(value)),
+            )
+
+        self.conn.commit()
+        self._finished_since_checkpoint = 0
+        logger.debug(f"Frontier checkpoint written: {self.path}")
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a value stored with a checkpoint."""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def iter_urls(self, status: str) -> Iterator[str]:
+        """
+        Iterate over URLs in a given state.
+
+        Args:
+            status: One of pending, crawled, failed or skipped
+
+        Yields:
+            URLs in that state
+        """
+        self.checkpoint()
+        cursor = self.conn.execute(
+            "SELECT url FROM urls WHERE state = ? ORDER BY id", (self.STATES[status],)
+        )
+        for (url,) in cursor:
+            yield url
+
+    def count(self, status: str) -> int:
+        """Count URLs in a given state (including uncommitted updates)."""
+        self.checkpoint()
+        return self._count_state(self.STATES[status])
+
+    def _flush_inserts(self):
+        """Write buffered URLs to the database."""
+        if not self._insert_buffer:
+            return
+
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO urls (url, key, depth, priority, state, context) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            list(self._insert_buffer.values()),
+        )
+        self._insert_buffer.clear()
+
+    def _fill_ready_buffer(self):
+        """Load the next batch of pending URLs and mark them in flight."""
+        self._flush_inserts()
+
+        rows = self.conn.execute(
+            f"SELECT id, url, depth, priority, context FROM urls WHERE state = ? "
+            f"ORDER BY {self.ORDERINGS[self.queue_type]} LIMIT ?",
+            (self.STATE_PENDING, self.buffer_size),
+        ).fetchall()
+
+        if not rows:
+            return
+
+        self.conn.executemany(
+            "UPDATE urls SET state = ? WHERE id = ?",
+            [(self.STATE_IN_FLIGHT, row[0]) for row in rows],
+        )
+
+        for _, url, depth, priority, context in rows:
+            url_info = {"url": url, "depth": depth, "priority": priority}
+            if context:
+                url_info.update(json.loads(context))
+            self._ready.append(url_info)
+
+    def _migrate_keys(self):
+        """Add normalized keys to a frontier written before they existed."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(urls)")}
+        if "key" in columns:
+            return
+
+        self.conn.execute("ALTER TABLE urls ADD COLUMN key TEXT")
+        rows = self.conn.execute("SELECT id, url FROM urls").fetchall()
+        self.conn.executemany(
+            "UPDATE urls SET key = ? WHERE id = ?",
+            [(parse_url(url).normalized, row_id) for row_id, url in rows],
+        )
+        # Aliases queued by the old schema: keep the first of each
+        removed = self.conn.execute(
+            "DELETE FROM urls WHERE id NOT IN (SELECT MIN(id) FROM urls GROUP BY key)"
+        ).rowcount
+        logger.info(f"Frontier migrated to normalized keys ({removed} aliases removed)")
+
+    def _count_state(self, state: int) -> int:
+        """Count committed rows in a state."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM urls WHERE state = ?", (state,)
+        ).fetchone()[0]
+
+    def _count_all(self) -> int:
+        """Count all known URLs."""
+        return self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def is_empty(self) -> bool:
+        """Check if no URLs are pending."""
+        return self._pending == 0
+
+    def size(self) -> int:
+        """Get number of pending URLs."""
+        return self._pending
+
+    def clear(self):
+        """Delete all frontier state."""
+        self._insert_buffer.clear()
+        self._ready.clear()
+        self._state_updates.clear()
+        self.conn.execute("DELETE FROM urls")
+        self.conn.execute("DELETE FROM meta")
+        self.conn.commit()
+        self._pending = 0
+        logger.info("Persistent frontier cleared")
+
+    def close(self):
+        """Checkpoint and close the database."""
+        self.checkpoint()
+        self.conn.close()
+        logger.info(f"Persistent frontier closed: {self.path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get frontier statistics."""
+        return {
+            "queue_size": self._pending,
+            "buffered_urls": len(self._ready) + len(self._insert_buffer),
+            "queue_type": self.queue_type,
+            "path": self.path,
+        }
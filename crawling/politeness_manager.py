@@ -1,34 +1,95 @@
 """Politeness manager for respecting crawl delays."""
 
 import asyncio
-from typing import Dict
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
 from loguru import logger
 
+from .url import parse_url
+
+# Responses that ask the client to slow down
+BACKOFF_STATUSES = {429, 503}
+
+
+class _HostState:
+    """Adaptive throttle state for one host."""
+
+    __slots__ = (
+        "base_delay", "delay", "min_delay", "latency_ewma", "retry_until", "backoffs"
+    )
+
+    def __init__(self, delay: float, min_delay: float):
+        self.base_delay = delay
+        self.delay = delay
+        self.min_delay = min_delay
+        self.latency_ewma: Optional[float] = None
+        self.retry_until: Optional[datetime] = None
+        self.backoffs = 0
+
 
 class PolitenessManager:
     """
     Manage politeness delays between requests to same domain.
 
+    Each host starts at the default delay, raised to its robots.txt
+    ``Crawl-delay`` if that is higher. In adaptive mode the delay then
+    follows an EWMA of the host's response times, so fast hosts are fetched
+    more often and slow hosts less often. 429/503 responses and failed
+    requests multiply the delay, and ``Retry-After`` pauses the host
+    completely. The robots.txt ``Crawl-delay`` is always a lower bound.
+
     Features:
     - Per-domain delays
     - Configurable delay times
     - Robots.txt crawl-delay support
     - Request throttling
+    - Latency-based adaptive delays
+    - Backoff on 429/503 and Retry-After support
     """
 
-    def __init__(self, delay: float = 1.0):
+    def __init__(
+        self,
+        delay: float = 1.0,
+        adaptive: bool = False,
+        min_delay: float = 0.0,
+        max_delay: float = 60.0,
+        latency_factor: float = 2.0,
+        ewma_alpha: float = 0.3,
+        backoff_factor: float = 2.0,
+        recovery_factor: float = 0.9,
+        max_retry_after: float = 3600.0,
+    ):
         """
         Initialize politeness manager.
 
         Args:
             delay: Default delay in seconds between requests
+            adaptive: Adjust per-host delays from observed response times
+            min_delay: Lowest delay adaptive mode may reach
+            max_delay: Highest delay backoff may reach
+            latency_factor: Adaptive delay as a multiple of the latency EWMA
+            ewma_alpha: Weight of the newest response time in the EWMA
+            backoff_factor: Delay multiplier on 429/503 and request errors
+            recovery_factor: Per-response delay decay after a backoff
+            max_retry_after: Upper bound for honored Retry-After values
         """
         self.default_delay = delay
+        self.adaptive = adaptive
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.latency_factor = latency_factor
+        self.ewma_alpha = ewma_alpha
+        self.backoff_factor = backoff_factor
+        self.recovery_factor = recovery_factor
+        self.max_retry_after = max_retry_after
+
         self.last_request_times: Dict[str, datetime] = {}
+        self.hosts: Dict[str, _HostState] = {}
 
-        logger.info(f"Politeness manager initialized (delay: {delay}s)")
+        logger.info(
+            f"Politeness manager initialized (delay: {delay}s, adaptive: {adaptive})"
+        )
 
     async def wait_if_needed(self, url: str, custom_delay: float = None):
         """
@@ -39,31 +100,167 @@ class PolitenessManager:
             custom_delay: Custom delay override
         """
         domain = self._get_domain(url)
-        delay = custom_delay or self.default_delay
+        delay = custom_delay or self.get_delay(domain)
 
+        now = datetime.now()
         last_request = self.last_request_times.get(domain)
+        wait_time = 0.0
 
         if last_request:
-            elapsed = (datetime.now() - last_request).total_seconds()
-            wait_time = delay - elapsed
+            elapsed = (now - last_request).total_seconds()
+            wait_time = max(0.0, delay - elapsed)
 
-            if wait_time > 0:
-                logger.debug(f"Waiting {wait_time:.2f}s for {domain}")
-                await asyncio.sleep(wait_time)
+        wait_time = max(wait_time, self.retry_after_remaining(domain))
 
-        self.last_request_times[domain] = datetime.now()
+        # Reserve the slot before sleeping so concurrent workers hitting the
+        # same domain queue up behind each other instead of firing together
+        self.last_request_times[domain] = now + timedelta(seconds=wait_time)
+
+        if wait_time > 0:
+            logger.debug(f"Waiting {wait_time:.2f}s for {domain}")
+            await asyncio.sleep(wait_time)
 
     def _get_domain(self, url: str) -> str:
         """Extract domain from URL."""
-        parsed = urlparse(url)
-        return parsed.netloc
+        return parse_url(url).host
+
+    def _get_state(self, domain: str) -> _HostState:
+        """Get or create the throttle state of a domain."""
+        state = self.hosts.get(domain)
+        if state is None:
+            state = self.hosts[domain] = _HostState(self.default_delay, self.min_delay)
+        return state
+
+    def get_delay(self, domain: str) -> float:
+        """Get delay in seconds to apply between requests to a domain."""
+        state = self.hosts.get(domain)
+        if state is None:
+            return self.default_delay
+        return max(state.delay, self.retry_after_remaining(domain))
 
     def set_delay(self, domain: str, delay: float):
         """Set custom delay for a domain."""
-        # This would be implemented with domain-specific delays
-        pass
+        state = self._get_state(domain)
+        state.base_delay = delay
+        state.delay = max(delay, state.min_delay)
+
+    def set_crawl_delay(self, domain: str, crawl_delay: Optional[float]):
+        """
+        Apply a robots.txt Crawl-delay as the domain's minimum delay.
+
+        Args:
+            domain: Domain (host[:port])
+            crawl_delay: Crawl-delay in seconds, or None if not declared
+        """
+        if not crawl_delay:
+            return
+
+        state = self._get_state(domain)
+        state.min_delay = max(self.min_delay, crawl_delay)
+        state.delay = max(state.delay, state.min_delay)
+        logger.debug(f"Crawl-delay for {domain}: {crawl_delay}s")
+
+    def record_response(
+        self,
+        url: str,
+        status_code: Optional[int],
+        elapsed: float,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Update a host's delay from the outcome of a request.
+
+        Args:
+            url: Requested URL
+            status_code: HTTP status code, or None if the request failed
+            elapsed: Response time in seconds
+            headers: Response headers (for Retry-After)
+        """
+        domain = self._get_domain(url)
+        state = self._get_state(domain)
+
+        if status_code is None or status_code in BACKOFF_STATUSES:
+            state.backoffs += 1
+            state.delay = min(
+                self.max_delay,
+                max(state.delay, state.min_delay, 0.1) * self.backoff_factor,
+            )
+
+            retry_after = self._parse_retry_after((headers or {}).get("retry-after"))
+            if retry_after:
+                state.retry_until = datetime.now() + timedelta(
+                    seconds=min(retry_after, self.max_retry_after)
+                )
+
+            logger.debug(
+                f"Backing off {domain} (status: {status_code}): delay {state.delay:.2f}s"
+            )
+            return
+
+        if not self.adaptive:
+            # Return to the configured delay after a backoff
+            base = max(state.base_delay, state.min_delay)
+            state.delay = max(base, state.delay * self.recovery_factor)
+            return
+
+        first_sample = state.latency_ewma is None
+        if first_sample:
+            state.latency_ewma = elapsed
+        else:
+            state.latency_ewma += self.ewma_alpha * (elapsed - state.latency_ewma)
+
+        target = min(
+            self.max_delay,
+            max(state.min_delay, self.latency_factor * state.latency_ewma),
+        )
+
+        # Slow down immediately, speed up gradually after a backoff
+        if target >= state.delay or (first_sample and not state.backoffs):
+            state.delay = target
+        else:
+            state.delay = max(target, state.delay * self.recovery_factor)
+
+    def retry_after_remaining(self, domain: str) -> float:
+        """Seconds left until a Retry-After pause of a domain ends."""
+        state = self.hosts.get(domain)
+        if state is None or state.retry_until is None:
+            return 0.0
+
+        remaining = (state.retry_until - datetime.now()).total_seconds()
+        if remaining <= 0:
+            state.retry_until = None
+            return 0.0
+        return remaining
+
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date."""
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        now = datetime.now(retry_at.tzinfo) if retry_at.tzinfo else datetime.utcnow()
+        return max(0.0, (retry_at - now).total_seconds())
 
     def clear(self):
         """Clear all recorded request times."""
         self.last_request_times.clear()
+        self.hosts.clear()
         logger.info("Politeness manager cleared")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get politeness statistics."""
+        delays = [state.delay for state in self.hosts.values()]
+        return {
+            "hosts_tracked": len(self.hosts),
+            "backoffs": sum(state.backoffs for state in self.hosts.values()),
+            "average_delay": round(sum(delays) / len(delays), 3) if delays else self.default_delay,
+        }
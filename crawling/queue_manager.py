@@ -1,7 +1,9 @@
 """URL queue management for crawling."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from collections import deque
+from itertools import count
+import heapq
 from loguru import logger
 
 
@@ -10,26 +12,40 @@ class QueueManager:
     URL queue manager for crawling.
 
     Features:
-    - Priority queue support
+    - Priority queue support (heap-backed, FIFO among equal priorities)
+    - Pluggable scoring functions for best-first crawls
     - FIFO/LIFO ordering
     - URL deduplication
     - Queue persistence
     """
 
-    def __init__(self, queue_type: str = "fifo"):
+    def __init__(
+        self,
+        queue_type: str = "fifo",
+        scorer: Optional[Callable[[Dict[str, Any]], float]] = None,
+        duplicate_detector=None,
+    ):
         """
         Initialize queue manager.
 
         Args:
             queue_type: Type of queue (fifo, lifo, priority)
+            scorer: Optional function mapping a URL info dict to its priority
+                (higher = more important), used in priority mode
+            duplicate_detector: Shared DuplicateDetector used instead of the
+                queue's own seen set
         """
         self.queue_type = queue_type
-        self.queue = deque()
+        self.scorer = scorer
+        self.duplicate_detector = duplicate_detector
+        # Priority mode stores (-priority, sequence, url_info) heap entries
+        self.queue = [] if queue_type == "priority" else deque()
         self.seen_urls = set()
+        self._sequence = count()
 
         logger.info(f"Queue manager initialized (type: {queue_type})")
 
-    def add_url(self, url: str, depth: int = 0, priority: int = 0):
+    def add_url(self, url: str, depth: int = 0, priority: float = 0, **context):
         """
         Add URL to the queue.
 
@@ -37,30 +53,42 @@ class QueueManager:
             url: URL to add
             depth: Crawl depth
             priority: Priority level (higher = more important)
+            **context: Extra fields stored with the URL and passed to the
+                scorer (e.g. anchor_text)
         """
-        if url in self.seen_urls:
+        if not self._is_new(url):
             return
 
-        self.seen_urls.add(url)
         url_info = {
             "url": url,
             "depth": depth,
             "priority": priority,
+            **context,
         }
 
         if self.queue_type == "priority":
-            # Insert based on priority
-            inserted = False
-            for i, item in enumerate(self.queue):
-                if priority > item.get("priority", 0):
-                    self.queue.insert(i, url_info)
-                    inserted = True
-                    break
-            if not inserted:
-                self.queue.append(url_info)
+            if self.scorer:
+                url_info["priority"] = self.scorer(url_info)
+
+            # Sequence number keeps FIFO order among equal priorities
+            heapq.heappush(
+                self.queue,
+                (-url_info["priority"], next(self._sequence), url_info),
+            )
         else:
             self.queue.append(url_info)
 
+    def _is_new(self, url: str) -> bool:
+        """Check and record whether a URL was ever queued."""
+        if self.duplicate_detector:
+            return not self.duplicate_detector.is_duplicate(url)
+
+        if url in self.seen_urls:
+            return False
+
+        self.seen_urls.add(url)
+        return True
+
     def get_next_url(self) -> Optional[Dict[str, Any]]:
         """
         Get next URL from the queue.
@@ -71,11 +99,17 @@ class QueueManager:
         if not self.queue:
             return None
 
-        if self.queue_type == "lifo":
+        if self.queue_type == "priority":
+            return heapq.heappop(self.queue)[2]
+        elif self.queue_type == "lifo":
             return self.queue.pop()
-        else:  # fifo or priority
+        else:  # fifo
             return self.queue.popleft()
 
+    def task_done(self, url: str, status: str):
+        """Record the outcome of a dequeued URL (nothing to persist in memory)."""
+        pass
+
     def is_empty(self) -> bool:
         """Check if queue is empty."""
         return len(self.queue) == 0
@@ -94,6 +128,9 @@ class QueueManager:
         """Get queue statistics."""
         return {
             "queue_size": len(self.queue),
-            "seen_urls": len(self.seen_urls),
+            "seen_urls": (
+                len(self.duplicate_detector.url_filter)
+                if self.duplicate_detector else len(self.seen_urls)
+            ),
             "queue_type": self.queue_type,
         }
@@ -0,0 +1,449 @@
+"""Redis-backed crawl frontier shared by distributed crawl workers."""
+
+import json
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
+from loguru import logger
+
+from .url import parse_url
+from .url_filter import url_fingerprint
+
+# Queue new URLs (KEYS: seen, ready, active, pending; ARGV: queue prefix,
+# now, leases per host, then fingerprint/host/entry triples)
+_ADD_SCRIPT = """
+local max_leases = tonumber(ARGV[3])
+local added = 0
+for i = 4, #ARGV, 3 do
+    if redis.call('SADD', KEYS[1], ARGV[i]) == 1 then
+        local host = ARGV[i + 1]
+        redis.call('RPUSH', ARGV[1] .. host, ARGV[i + 2])
+        if tonumber(redis.call('HGET', KEYS[3], host) or '0') < max_leases then
+            redis.call('ZADD', KEYS[2], 'NX', ARGV[2], host)
+        end
+        added = added + 1
+    end
+end
+if added > 0 then
+    redis.call('INCRBY', KEYS[4], added)
+end
+return added
+"""
+
+# Lease URLs from ready hosts (KEYS: ready, leases, leased, pending,
+# in_flight, dispatched, active, lease_seq; ARGV: queue prefix, now, count,
+# lease seconds, budget, leases per host). Lease ids are "<seq>:<host>".
+_DISPATCH_SCRIPT = """
+local now = tonumber(ARGV[2])
+local max_leases = tonumber(ARGV[6])
+
+-- Leases of crashed workers expire and their URL goes back to the queue
+for _, lease in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+    local entry = redis.call('HGET', KEYS[3], lease)
+    if entry then
+        local host = string.sub(lease, string.find(lease, ':', 1, true) + 1)
+        redis.call('LPUSH', ARGV[1] .. host, entry)
+        redis.call('HDEL', KEYS[3], lease)
+        redis.call('INCR', KEYS[4])
+        redis.call('DECR', KEYS[5])
+        redis.call('DECR', KEYS[6])
+        if redis.call('HINCRBY', KEYS[7], host, -1) <= 0 then
+            redis.call('HDEL', KEYS[7], host)
+        end
+        redis.call('ZADD', KEYS[1], 'NX', now, host)
+    end
+    redis.call('ZREM', KEYS[2], lease)
+end
+
+local count = tonumber(ARGV[3])
+local budget = tonumber(ARGV[5])
+if budget > 0 then
+    count = math.min(count, budget - tonumber(redis.call('GET', KEYS[6]) or '0'))
+end
+
+local leases = {}
+while count > 0 do
+    local hosts = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, count)
+    if #hosts == 0 then
+        break
+    end
+
+    for _, host in ipairs(hosts) do
+        local queue = ARGV[1] .. host
+        local active = tonumber(redis.call('HGET', KEYS[7], host) or '0')
+        while count > 0 and active < max_leases do
+            local entry = redis.call('LPOP', queue)
+            if not entry then
+                break
+            end
+            local lease = redis.call('INCR', KEYS[8]) .. ':' .. host
+            redis.call('ZADD', KEYS[2], now + tonumber(ARGV[4]), lease)
+            redis.call('HSET', KEYS[3], lease, entry)
+            active = redis.call('HINCRBY', KEYS[7], host, 1)
+            redis.call('DECR', KEYS[4])
+            redis.call('INCR', KEYS[5])
+            redis.call('INCR', KEYS[6])
+            leases[#leases + 1] = lease
+            leases[#leases + 1] = entry
+            count = count - 1
+        end
+
+        -- Saturated hosts come back when a lease ends, drained ones when
+        -- new URLs arrive
+        if active >= max_leases or redis.call('LLEN', queue) == 0 then
+            redis.call('ZREM', KEYS[1], host)
+        end
+    end
+end
+
+local next_host = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local reply = {
+    next_host[2] or '',
+    redis.call('GET', KEYS[4]) or '0',
+    redis.call('GET', KEYS[5]) or '0',
+    redis.call('GET', KEYS[6]) or '0',
+}
+for _, value in ipairs(leases) do
+    reply[#reply + 1] = value
+end
+return reply
+"""
+
+# Finish or give back a leased URL (KEYS: ready, leases, leased, pending,
+# in_flight, dispatched, stats, active; ARGV: queue prefix, lease id,
+# ready_at, status, "1" to requeue the URL). Only crawled pages keep their
+# share of the page budget.
+_RELEASE_SCRIPT = """
+local lease = ARGV[2]
+local entry = redis.call('HGET', KEYS[3], lease)
+if not entry then
+    return 0
+end
+
+local host = string.sub(lease, string.find(lease, ':', 1, true) + 1)
+redis.call('HDEL', KEYS[3], lease)
+redis.call('ZREM', KEYS[2], lease)
+redis.call('DECR', KEYS[5])
+if redis.call('HINCRBY', KEYS[8], host, -1) <= 0 then
+    redis.call('HDEL', KEYS[8], host)
+end
+redis.call('ZADD', KEYS[1], 'NX', ARGV[3], host)
+
+if ARGV[5] == '1' then
+    redis.call('LPUSH', ARGV[1] .. host, entry)
+    redis.call('INCR', KEYS[4])
+    redis.call('DECR', KEYS[6])
+else
+    redis.call('HINCRBY', KEYS[7], ARGV[4], 1)
+    if ARGV[4] ~= 'crawled' then
+        redis.call('DECR', KEYS[6])
+    end
+end
+return 1
+"""
+
+
+class RedisFrontier:
+    """
+    Crawl frontier and visited set stored in Redis.
+
+    Any number of crawler processes can share one frontier. URLs are queued
+    per host. A sorted set orders hosts by the time they may next be fetched.
+    Handing out a URL takes one of the host's ``max_leases_per_host`` leases,
+    so a host never has more requests in flight across the whole cluster. A
+    host that used all its leases is only rescheduled, after its politeness
+    delay, once a worker reports one of its URLs as done. If a worker dies,
+    its leases expire and the URLs are queued again.
+
+    The page budget counts pages crawled or in flight: URLs released as
+    skipped or failed give their share back.
+
+    All state changes run as Lua scripts, so they are atomic. URLs are added
+    and leased in batches to save round trips.
+
+    Features:
+    - Shared visited set (64-bit URL fingerprints)
+    - Per-host queues with a cluster-wide cap on concurrent leases
+    - Lease expiry for crashed workers, requeue on clean shutdown
+    - Global page budget
+    - Batched adds and dispatches
+    """
+
+    # The engine skips its own politeness sleep for host-scheduled frontiers
+    schedules_hosts = True
+
+    def __init__(
+        self,
+        client,
+        crawl_id: str,
+        politeness_manager=None,
+        delay: float = 1.0,
+        batch_size: int = 10,
+        flush_size: int = 100,
+        lease_seconds: float = 300.0,
+        max_leases_per_host: int = 1,
+        max_pages: int = 0,
+        poll_interval: float = 0.5,
+        duplicate_detector=None,
+    ):
+        """
+        Initialize Redis frontier.
+
+        Args:
+            client: Synchronous redis-py client (or a compatible stand-in)
+            crawl_id: Identifier shared by all workers of one crawl
+            politeness_manager: PolitenessManager used for per-host delays
+            delay: Delay between requests to one host when no manager is set
+            batch_size: Hosts leased per dispatch round trip
+            flush_size: Discovered URLs buffered before they are sent
+            lease_seconds: Time after which an unfinished lease is reclaimed
+            max_leases_per_host: Requests to one host in flight at once
+                across all workers
+            max_pages: Pages crawled across all workers (0 for no limit)
+            poll_interval: Longest wait before asking Redis for work again
+            duplicate_detector: DuplicateDetector used to normalize URLs
+        """
+        self.client = client
+        self.crawl_id = crawl_id
+        self.politeness_manager = politeness_manager
+        self.default_delay = delay
+        self.batch_size = batch_size
+        self.flush_size = flush_size
+        self.lease_seconds = lease_seconds
+        self.max_leases_per_host = max(1, max_leases_per_host)
+        self.max_pages = max_pages
+        self.poll_interval = poll_interval
+        self.duplicate_detector = duplicate_detector
+
+        prefix = f"crawl:{crawl_id}:"
+        self.prefix = prefix
+        self.queue_prefix = prefix + "queue:"
+        self.keys = {
+            name: prefix + name
+            for name in (
+                "seen", "ready", "leases", "leased",
+                "pending", "in_flight", "dispatched", "stats",
+                "active", "lease_seq",
+            )
+        }
+
+        self._add = client.register_script(_ADD_SCRIPT)
+        self._dispatch = client.register_script(_DISPATCH_SCRIPT)
+        self._release = client.register_script(_RELEASE_SCRIPT)
+
+        self._add_buffer: List[Tuple[bytes, str, str]] = []
+        self._ready: deque = deque()
+        # URL -> (lease id, entry) for every URL this worker holds
+        self._leased: Dict[str, Tuple[str, str]] = {}
+
+        # Cluster counters from the last dispatch
+        self._next_ready: Optional[float] = None
+        self._pending = 0
+        self._in_flight = 0
+        self._dispatched = 0
+
+        logger.info(f"Redis frontier initialized (crawl: {crawl_id})")
+
+    def add_url(self, url: str, depth: int = 0, priority: float = 0, **context):
+        """
+        Queue URL if no worker has seen it yet.
+
+        Args:
+            url: URL to add
+            depth: Crawl depth
+            priority: Priority level (kept for API parity, hosts are FIFO)
+            **context: Extra fields stored with the URL
+        """
+        crawl_url = parse_url(url)
+        fingerprint = crawl_url.fingerprint if self.duplicate_detector else url_fingerprint(url)
+        entry = json.dumps({"url": url, "depth": depth, "priority": priority, **context})
+
+        self._add_buffer.append((fingerprint.to_bytes(8, "little"), crawl_url.host, entry))
+        if len(self._add_buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        """Send buffered URLs to Redis."""
+        if not self._add_buffer:
+            return
+
+        args = [self.queue_prefix, time.time(), self.max_leases_per_host]
+        for item in self._add_buffer:
+            args.extend(item)
+        self._add_buffer.clear()
+
+        self._add(
+            keys=[self.keys["seen"], self.keys["ready"], self.keys["active"], self.keys["pending"]],
+            args=args,
+        )
+
+    def get_next_url(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the next URL whose host this worker may fetch now.
+
+        Returns:
+            URL info dictionary, or None if no host is ready
+        """
+        if not self._ready:
+            self.flush()
+            self._dispatch_batch()
+
+        if not self._ready:
+            return None
+
+        return json.loads(self._ready.popleft())
+
+    def _dispatch_batch(self):
+        """Lease a batch of URLs from ready hosts."""
+        reply = self._dispatch(
+            keys=[
+                self.keys["ready"], self.keys["leases"], self.keys["leased"],
+                self.keys["pending"], self.keys["in_flight"], self.keys["dispatched"],
+                self.keys["active"], self.keys["lease_seq"],
+            ],
+            args=[
+                self.queue_prefix, time.time(), self.batch_size,
+                self.lease_seconds, self.max_pages, self.max_leases_per_host,
+            ],
+        )
+
+        next_ready, pending, in_flight, dispatched = (
+            value.decode() if isinstance(value, bytes) else value for value in reply[:4]
+        )
+        self._next_ready = float(next_ready) if next_ready else None
+        self._pending = int(pending)
+        self._in_flight = int(in_flight)
+        self._dispatched = int(dispatched)
+
+        leases = [value.decode() if isinstance(value, bytes) else value for value in reply[4:]]
+        for lease, entry in zip(leases[::2], leases[1::2]):
+            self._leased[json.loads(entry)["url"]] = (lease, entry)
+            self._ready.append(entry)
+
+    def task_done(self, url: str, status: str):
+        """
+        Release the URL's host lease and schedule the host's next fetch.
+
+        Args:
+            url: URL returned by ``get_next_url``
+            status: Outcome (crawled, failed or skipped)
+        """
+        leased = self._leased.pop(url, None)
+        if leased is None:
+            return
+
+        # Links found on the page must be visible before the lease ends
+        self.flush()
+
+        host = parse_url(url).host
+        self._release_lease(leased[0], time.time() + self._get_delay(host), status)
+
+    def _release_lease(
+        self,
+        lease: str,
+        ready_at: float,
+        status: str,
+        requeue: bool = False,
+    ):
+        """Run the release script for one lease."""
+        self._release(
+            keys=[
+                self.keys["ready"], self.keys["leases"], self.keys["leased"],
+                self.keys["pending"], self.keys["in_flight"], self.keys["dispatched"],
+                self.keys["stats"], self.keys["active"],
+            ],
+            args=[self.queue_prefix, lease, ready_at, status, "1" if requeue else "0"],
+        )
+
+    def next_ready_in(self) -> Optional[float]:
+        """
+        Seconds until this worker should ask for work again.
+
+        Other workers can add hosts at any time, so the wait is capped at
+        ``poll_interval``.
+
+        Returns:
+            Wait time in seconds (0 if a URL is ready), or None if empty
+        """
+        if self._ready:
+            return 0.0
+        if self.is_empty():
+            return None
+        if self._next_ready is None:
+            return self.poll_interval
+
+        return min(self.poll_interval, max(0.0, self._next_ready - time.time()))
+
+    def _get_delay(self, host: str) -> float:
+        """Get politeness delay for a host."""
+        if self.politeness_manager:
+            return self.politeness_manager.get_delay(host)
+        return self.default_delay
+
+    def _budget_exhausted(self) -> bool:
+        """Check whether pages crawled or in flight use up the global budget."""
+        return bool(self.max_pages) and self._dispatched >= self.max_pages
+
+    def is_empty(self) -> bool:
+        """
+        Check if the crawl is out of work across all workers.
+
+        Uses the counters of the last dispatch: the frontier is empty when
+        nothing is pending or in flight anywhere, or the budget is used up by
+        crawled pages (pages in flight may still be skipped and return it).
+        """
+        if self._ready or self._add_buffer:
+            return False
+        if self._budget_exhausted() and self._in_flight == 0:
+            return True
+        return self._pending == 0 and self._in_flight == 0
+
+    def size(self) -> int:
+        """Get number of queued URLs across all workers."""
+        return int(self.client.get(self.keys["pending"]) or 0) + len(self._add_buffer)
+
+    def close(self):
+        """Flush discovered URLs and requeue every URL this worker still holds."""
+        self.flush()
+
+        # Leased but not started, or interrupted before ``task_done``
+        now = time.time()
+        for lease, _ in reversed(list(self._leased.values())):
+            self._release_lease(lease, now, "released", requeue=True)
+        self._leased.clear()
+        self._ready.clear()
+
+    def clear(self):
+        """Delete all Redis keys of this crawl."""
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+        self._add_buffer.clear()
+        self._ready.clear()
+        self._leased.clear()
+        logger.info(f"Redis frontier cleared (crawl: {self.crawl_id})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get frontier statistics."""
+        pipe = self.client.pipeline()
+        pipe.get(self.keys["pending"])
+        pipe.get(self.keys["in_flight"])
+        pipe.get(self.keys["dispatched"])
+        pipe.scard(self.keys["seen"])
+        pipe.zcard(self.keys["ready"])
+        pipe.hgetall(self.keys["stats"])
+        pending, in_flight, dispatched, seen, hosts, statuses = pipe.execute()
+
+        return {
+            "queue_size": int(pending or 0),
+            "in_flight": int(in_flight or 0),
+            "dispatched": int(dispatched or 0),
+            "seen_urls": seen,
+            "active_hosts": hosts,
+            "by_status": {
+                (key.decode() if isinstance(key, bytes) else key): int(value)
+                for key, value in statuses.items()
+            },
+            "queue_type": "redis",
+        }
@@ -1,33 +1,172 @@
 """Robots.txt parser for crawl compliance."""
 
-from typing import Optional
-from urllib.robotparser import RobotFileParser
-from urllib.parse import urljoin, urlparse
+import asyncio
+import re
+import time
+from typing import Optional, List, Dict, Any, Tuple
+from urllib.parse import unquote
 import httpx
 from loguru import logger
 
+from .url import parse_url
+
+# Robots files beyond this size are truncated (RFC 9309 minimum is 500 KiB)
+MAX_ROBOTS_BYTES = 512 * 1024
+
+
+class RobotsRules:
+    """
+    Compiled Allow/Disallow rules of one robots.txt group.
+
+    Plain path prefixes are stored in a character trie and patterns with
+    ``*`` or ``$`` are compiled to regular expressions. ``can_fetch`` uses
+    longest-match semantics: the most specific matching rule wins, and
+    Allow wins a tie (RFC 9309).
+    """
+
+    __slots__ = ("_trie", "_patterns", "rule_count")
+
+    # Trie node key marking the end of a rule: value is the Allow flag
+    _END = ""
+
+    def __init__(self, rules: List[Tuple[bool, str]]):
+        """
+        Compile rules.
+
+        Args:
+            rules: (allow, path pattern) pairs
+        """
+        self._trie: Dict[str, Any] = {}
+        self._patterns: List[Tuple[int, bool, re.Pattern]] = []
+        self.rule_count = 0
+
+        for allow, pattern in rules:
+            if not pattern:
+                continue
+            pattern = unquote(pattern)
+            self.rule_count += 1
+
+            if "*" in pattern or pattern.endswith("$"):
+                self._patterns.append((len(pattern), allow, self._compile(pattern)))
+                continue
+
+            node = self._trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            # Allow wins over an identical Disallow
+            node[self._END] = node.get(self._END, False) or allow
+
+    @staticmethod
+    def _compile(pattern: str) -> re.Pattern:
+        """Compile a wildcard rule to an anchored regex."""
+        anchored = pattern.endswith("$")
+        if anchored:
+            pattern = pattern[:-1]
+        regex = ".*".join(re.escape(part) for part in pattern.split("*"))
+        return re.compile(regex + ("$" if anchored else ""), re.DOTALL)
+
+    def can_fetch(self, path: str) -> bool:
+        """
+        Check a path (with query string) against the rules.
+
+        Args:
+            path: Decoded URL path and query
+
+        Returns:
+            True if allowed
+        """
+        best_length = -1
+        allowed = True
+
+        # Longest plain prefix along the trie walk
+        node = self._trie
+        for index, char in enumerate(path):
+            node = node.get(char)
+            if node is None:
+                break
+            if self._END in node:
+                best_length = index + 1
+                allowed = node[self._END]
+
+        for length, allow, regex in self._patterns:
+            if length < best_length or (length == best_length and not allow):
+                continue
+            if regex.match(path):
+                best_length = length
+                allowed = allow
+
+        return allowed
+
+
+class _RobotsEntry:
+    """Cached robots.txt of one origin."""
+
+    __slots__ = ("rules", "crawl_delay", "sitemaps", "expires_at", "status")
+
+    def __init__(
+        self,
+        rules: Optional[RobotsRules],
+        crawl_delay: Optional[float],
+        sitemaps: List[str],
+        expires_at: float,
+        status: str,
+    ):
+        self.rules = rules
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps
+        self.expires_at = expires_at
+        self.status = status
+
 
 class RobotsParser:
     """
     Robots.txt parser for respecting crawl directives.
 
+    Robots files are fetched once per origin and cached with a TTL. Workers
+    asking for the same uncached origin at the same time share one request.
+    Missing files (4xx) are cached as "allow all", and fetch errors are
+    retried after a shorter TTL.
+
     Features:
     - Robots.txt parsing
     - User-agent specific rules
     - Crawl delay support
     - Sitemap discovery
+    - TTL cache with single-flight loading
+    - Compiled prefix-trie / wildcard matchers
     """
 
-    def __init__(self, user_agent: str = "OSINT-Platform-Bot/1.0"):
+    def __init__(
+        self,
+        user_agent: str = "OSINT-Platform-Bot/1.0",
+        client: Optional[httpx.AsyncClient] = None,
+        ttl: float = 86400.0,
+        missing_ttl: float = 86400.0,
+        error_ttl: float = 600.0,
+    ):
         """
         Initialize robots parser.
 
         Args:
             user_agent: User agent string for robot rules
+            client: HTTP client to fetch robots.txt with (one is created per
+                load if None)
+            ttl: Seconds a fetched robots.txt stays cached
+            missing_ttl: Seconds a missing robots.txt (4xx) stays cached
+            error_ttl: Seconds before an origin that failed to load is retried
         """
         self.user_agent = user_agent
-        self.parsers = {}
-        self.crawl_delays = {}
+        self.client = client
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.error_ttl = error_ttl
+
+        # Product token used to select user-agent groups
+        self._agent_token = user_agent.split("/", 1)[0].strip().lower()
+
+        self.entries: Dict[str, _RobotsEntry] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.fetches = 0
 
         logger.info(f"Robots parser initialized (user-agent: {user_agent})")
 
@@ -38,37 +177,78 @@ class RobotsParser:
         Args:
             base_url: Base URL of the domain
         """
-        parsed = urlparse(base_url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
+        await self.ensure_loaded(base_url)
+
+    async def ensure_loaded(self, url: str) -> bool:
+        """
+        Make sure a fresh robots.txt is cached for the URL's origin.
 
-        if domain in self.parsers:
-            return
+        Concurrent calls for the same origin wait for a single fetch.
 
-        robots_url = urljoin(domain, "/robots.txt")
+        Args:
+            url: Any URL on the origin
+
+        Returns:
+            True if this call fetched robots.txt, False if it was cached
+            or loaded by another caller
+        """
+        domain = self._get_origin(url)
+
+        entry = self.entries.get(domain)
+        if entry and entry.expires_at > time.monotonic():
+            return False
 
+        pending = self._loading.get(domain)
+        if pending:
+            await asyncio.shield(pending)
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[domain] = future
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(robots_url, timeout=10)
+            self.entries[domain] = await self._fetch(domain)
+        finally:
+            del self._loading[domain]
+            future.set_result(None)
 
-                if response.status_code == 200:
-                    parser = RobotFileParser()
-                    parser.parse(response.text.splitlines())
-                    self.parsers[domain] = parser
+        return True
 
-                    # Extract crawl delay
-                    crawl_delay = self._extract_crawl_delay(response.text)
-                    if crawl_delay:
-                        self.crawl_delays[domain] = crawl_delay
+    async def _fetch(self, domain: str) -> _RobotsEntry:
+        """Fetch and compile the robots.txt of an origin."""
+        robots_url = f"{domain}/robots.txt"
+        self.fetches += 1
+        now = time.monotonic()
 
-                    logger.info(f"Loaded robots.txt for {domain}")
-                else:
-                    # Allow all if robots.txt not found
-                    self.parsers[domain] = None
-                    logger.debug(f"No robots.txt found for {domain}, allowing all")
+        try:
+            if self.client:
+                response = await self.client.get(robots_url, timeout=10)
+            else:
+                async with httpx.AsyncClient(follow_redirects=True) as client:
+                    response = await client.get(robots_url, timeout=10)
 
         except Exception as e:
             logger.warning(f"Error loading robots.txt for {domain}: {e}")
-            self.parsers[domain] = None
+            return _RobotsEntry(None, None, [], now + self.error_ttl, "error")
+
+        if response.status_code == 200:
+            text = response.text[:MAX_ROBOTS_BYTES]
+            rules, crawl_delay = self._parse_group(text)
+            logger.info(f"Loaded robots.txt for {domain}")
+            return _RobotsEntry(
+                RobotsRules(rules),
+                crawl_delay,
+                self._extract_sitemaps(text),
+                now + self.ttl,
+                "loaded",
+            )
+
+        if 400 <= response.status_code < 500:
+            # Allow all if robots.txt not found
+            logger.debug(f"No robots.txt found for {domain}, allowing all")
+            return _RobotsEntry(None, None, [], now + self.missing_ttl, "missing")
+
+        logger.warning(f"robots.txt for {domain} returned {response.status_code}")
+        return _RobotsEntry(None, None, [], now + self.error_ttl, "error")
 
     def can_fetch(self, url: str) -> bool:
         """
@@ -80,15 +260,19 @@ class RobotsParser:
         Returns:
             True if allowed, False otherwise
         """
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
+        parts = parse_url(url)
+        entry = self.entries.get(parts.origin)
 
-        parser = self.parsers.get(domain)
-
-        if parser is None:
+        if entry is None or entry.rules is None:
             return True  # Allow if no robots.txt or error loading
 
-        return parser.can_fetch(self.user_agent, url)
+        path = unquote(parts.path) or "/"
+        if path == "/robots.txt":
+            return True
+        if parts.query:
+            path = f"{path}?{unquote(parts.query)}"
+
+        return entry.rules.can_fetch(path)
 
     def get_crawl_delay(self, url: str) -> Optional[float]:
         """
@@ -100,20 +284,116 @@ class RobotsParser:
         Returns:
             Crawl delay in seconds or None
         """
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
+        entry = self.entries.get(self._get_origin(url))
+        return entry.crawl_delay if entry else None
 
-        return self.crawl_delays.get(domain)
+    def get_sitemaps(self, url: str) -> List[str]:
+        """
+        Get sitemap URLs declared in robots.txt for a domain.
 
-    def _extract_crawl_delay(self, robots_txt: str) -> Optional[float]:
-        """Extract crawl-delay directive from robots.txt."""
-        try:
-            for line in robots_txt.splitlines():
-                line = line.strip().lower()
-                if line.startswith("crawl-delay:"):
-                    delay_str = line.split(":", 1)[1].strip()
-                    return float(delay_str)
-        except Exception as e:
-            logger.debug(f"Error extracting crawl delay: {e}")
+        Args:
+            url: URL on the domain
+
+        Returns:
+            List of sitemap URLs (empty if none were declared)
+        """
+        entry = self.entries.get(self._get_origin(url))
+        return entry.sitemaps if entry else []
+
+    def _get_origin(self, url: str) -> str:
+        """Extract scheme://host[:port] from a URL."""
+        return parse_url(url).origin
+
+    def _parse_group(self, robots_txt: str) -> Tuple[List[Tuple[bool, str]], Optional[float]]:
+        """
+        Select the rules and crawl delay that apply to our user agent.
+
+        The group whose user-agent token is the longest match for our product
+        token is used, falling back to the ``*`` group.
+
+        Returns:
+            (allow, pattern) rules and the group's crawl delay
+        """
+        groups: List[Tuple[List[str], List[Tuple[bool, str]], List[float]]] = []
+        agents: List[str] = []
+        rules: List[Tuple[bool, str]] = []
+        delays: List[float] = []
+        in_agents = False
+
+        for line in robots_txt.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+
+            field, value = line.split(":", 1)
+            field = field.strip().lower()
+            value = value.strip()
+
+            if field == "user-agent":
+                if not in_agents:
+                    agents, rules, delays = [], [], []
+                    groups.append((agents, rules, delays))
+                    in_agents = True
+                agents.append(value.lower())
+                continue
+
+            if field in ("allow", "disallow"):
+                rules.append((field == "allow", value))
+            elif field == "crawl-delay":
+                try:
+                    delays.append(float(value))
+                except ValueError:
+                    logger.debug(f"Invalid crawl-delay: {value}")
+            in_agents = False
+
+        # Score each group by its most specific agent matching ours
+        scored = []
+        for group in groups:
+            length = -1
+            for agent in group[0]:
+                if agent == "*":
+                    length = max(length, 0)
+                elif agent and agent in self._agent_token:
+                    length = max(length, len(agent))
+            if length >= 0:
+                scored.append((length, group))
+
+        if not scored:
+            return [], None
+
+        # Groups naming the same agent are merged
+        best_length = max(length for length, _ in scored)
+        merged_rules, merged_delays = [], []
+        for length, group in scored:
+            if length == best_length:
+                merged_rules.extend(group[1])
+                merged_delays.extend(group[2])
+
+        return merged_rules, (merged_delays[0] if merged_delays else None)
+
+    def _extract_sitemaps(self, robots_txt: str) -> List[str]:
+        """Extract Sitemap directives from robots.txt."""
+        sitemaps = []
+        for line in robots_txt.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line.lower().startswith("sitemap:"):
+                sitemap_url = line.split(":", 1)[1].strip()
+                if sitemap_url:
+                    sitemaps.append(sitemap_url)
+        return sitemaps
+
+    def clear(self):
+        """Clear cached robots.txt files."""
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get robots cache statistics."""
+        statuses: Dict[str, int] = {}
+        for entry in self.entries.values():
+            statuses[entry.status] = statuses.get(entry.status, 0) + 1
 
-        return None
+        return {
+            "origins_cached": len(self.entries),
+            "fetches": self.fetches,
+            "by_status": statuses,
+        }
@@ -0,0 +1,101 @@
+"""URL scoring functions for best-first crawling."""
+
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Callable, Union, Optional
+
+Scorer = Callable[[Dict[str, Any]], float]
+
+
+def depth_scorer(url_info: Dict[str, Any]) -> float:
+    """Prefer shallow pages (breadth-first bias)."""
+    return url_info.get("priority", 0) - url_info.get("depth", 0)
+
+
+def url_length_scorer(url_info: Dict[str, Any]) -> float:
+    """Prefer short URLs, which tend to be hub and index pages."""
+    return url_info.get("priority", 0) - len(url_info["url"]) / 100.0
+
+
+def keyword_scorer(keywords: List[str], weight: float = 1.0) -> Scorer:
+    """
+    Build a scorer that rewards keyword hits in the URL and anchor text.
+
+    Args:
+        keywords: Keywords to look for (case-insensitive)
+        weight: Priority added per keyword hit
+
+    Returns:
+        Scoring function for QueueManager
+    """
+    lowered = [keyword.lower() for keyword in keywords if keyword]
+
+    def score(url_info: Dict[str, Any]) -> float:
+        text = f"{url_info['url']} {url_info.get('anchor_text', '')}".lower()
+        hits = sum(1 for keyword in lowered if keyword in text)
+        return url_info.get("priority", 0) + hits * weight
+
+    return score
+
+
+def sitemap_score(
+    priority: Optional[float] = None,
+    lastmod: Optional[str] = None,
+    half_life_days: float = 30.0,
+) -> float:
+    """
+    Score a sitemap entry from its priority and last modification date.
+
+    Args:
+        priority: Sitemap <priority> (0.0-1.0, defaults to 0.5)
+        lastmod: Sitemap <lastmod> (W3C datetime)
+        half_life_days: Age at which the freshness bonus halves
+
+    Returns:
+        Priority between 0 and 2 (higher = crawl sooner)
+    """
+    score = 0.5 if priority is None else min(max(priority, 0.0), 1.0)
+
+    if lastmod:
+        try:
+            modified = datetime.fromisoformat(lastmod.replace("Z", "+00:00"))
+            if modified.tzinfo is None:
+                modified = modified.replace(tzinfo=timezone.utc)
+            age_days = max(0.0, (datetime.now(timezone.utc) - modified).total_seconds() / 86400)
+            score += 0.5 ** (age_days / half_life_days)
+        except ValueError:
+            pass
+
+    return score
+
+
+SCORERS: Dict[str, Scorer] = {
+    "depth": depth_scorer,
+    "url_length": url_length_scorer,
+}
+
+
+def get_scorer(scorer: Union[str, Scorer, None], keywords: List[str] = None):
+    """
+    Resolve a scorer from a callable, a registered name or a keyword list.
+
+    Args:
+        scorer: Scoring function or name from SCORERS
+        keywords: Keywords for a keyword scorer (used when scorer is
+            "keywords" or not set)
+
+    Returns:
+        Scoring function or None
+    """
+    if callable(scorer):
+        return scorer
+
+    if scorer == "keywords" or (scorer is None and keywords):
+        return keyword_scorer(keywords or [])
+
+    if scorer is None:
+        return None
+
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer: {scorer}")
+
+    return SCORERS[scorer]
@@ -0,0 +1,165 @@
+"""Streaming sitemap and sitemap index parser."""
+
+import zlib
+from collections import deque
+from typing import Dict, Any, Optional, AsyncIterator
+import httpx
+from lxml import etree
+from loguru import logger
+
+
+def _localname(tag) -> str:
+    """Strip the XML namespace from a tag."""
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapParser:
+    """
+    Parser for XML sitemaps and sitemap indexes.
+
+    Sitemaps are streamed: response chunks are gunzipped incrementally when
+    needed and fed to a pull parser, and every ``<url>`` element is cleared
+    as soon as it is read. Memory stays bounded regardless of sitemap size.
+
+    Features:
+    - Sitemap index recursion
+    - Gzipped sitemaps (.xml.gz)
+    - lastmod/priority/changefreq extraction
+    - URL and byte limits
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        max_sitemaps: int = 50,
+        max_urls: int = 50000,
+        max_bytes: int = 50 * 1024 * 1024,
+    ):
+        """
+        Initialize sitemap parser.
+
+        Args:
+            client: HTTP client to fetch sitemaps with (one is created if None)
+            max_sitemaps: Maximum number of sitemap files to fetch
+            max_urls: Maximum number of URLs to yield
+            max_bytes: Maximum uncompressed bytes read per sitemap
+        """
+        self.client = client
+        self.max_sitemaps = max_sitemaps
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+
+    async def iter_urls(self, *sitemap_urls: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over page entries of sitemaps, following sitemap indexes.
+
+        Args:
+            sitemap_urls: Sitemap or sitemap index URLs
+
+        Yields:
+            Dictionaries with url, lastmod, priority and changefreq
+        """
+        pending = deque(sitemap_urls)
+        fetched = set()
+        yielded = 0
+
+        own_client = self.client is None
+        client = self.client or httpx.AsyncClient(timeout=30, follow_redirects=True)
+
+        try:
+            while pending and len(fetched) < self.max_sitemaps:
+                sitemap_url = pending.popleft()
+                if sitemap_url in fetched:
+                    continue
+                fetched.add(sitemap_url)
+
+                try:
+                    async for kind, entry in self._parse_sitemap(client, sitemap_url):
+                        if kind == "sitemap":
+                            pending.append(entry["url"])
+                            continue
+
+                        yield entry
+                        yielded += 1
+                        if yielded >= self.max_urls:
+                            logger.info(f"Sitemap URL limit reached: {self.max_urls}")
+                            return
+
+                except Exception as e:
+                    logger.warning(f"Error reading sitemap {sitemap_url}: {e}")
+
+        finally:
+            if own_client:
+                await client.aclose()
+
+        logger.info(f"Read {yielded} URLs from {len(fetched)} sitemaps")
+
+    async def _parse_sitemap(self, client: httpx.AsyncClient, sitemap_url: str):
+        """Stream one sitemap file, yielding ("url"|"sitemap", entry) pairs."""
+        parser = etree.XMLPullParser(
+            events=("end",), resolve_entities=False, no_network=True
+        )
+        decompressor = None
+        first_chunk = True
+        total_bytes = 0
+
+        async with client.stream("GET", sitemap_url) as response:
+            if response.status_code != 200:
+                logger.debug(f"Sitemap {sitemap_url} returned {response.status_code}")
+                return
+
+            # httpx undoes Content-Encoding; .xml.gz files arrive still gzipped
+            async for chunk in response.aiter_bytes():
+                if first_chunk:
+                    first_chunk = False
+                    if chunk[:2] == b"\x1f\x8b":
+                        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+                if decompressor:
+                    chunk = decompressor.decompress(chunk, self.max_bytes - total_bytes)
+
+                total_bytes += len(chunk)
+                parser.feed(chunk)
+                for item in self._read_events(parser):
+                    yield item
+
+                if total_bytes >= self.max_bytes:
+                    logger.warning(f"Sitemap {sitemap_url} exceeds {self.max_bytes} bytes")
+                    return
+
+        parser.close()
+        for item in self._read_events(parser):
+            yield item
+
+    def _read_events(self, parser):
+        """Turn completed <url>/<sitemap> elements into entries and free them."""
+        for _, element in parser.read_events():
+            kind = _localname(element.tag)
+            if kind not in ("url", "sitemap"):
+                continue
+
+            entry = {"url": None, "lastmod": None, "priority": None, "changefreq": None}
+            for child in element:
+                name = _localname(child.tag)
+                text = (child.text or "").strip()
+                if name == "loc":
+                    entry["url"] = text
+                elif name in ("lastmod", "changefreq"):
+                    entry[name] = text or None
+                elif name == "priority":
+                    try:
+                        entry["priority"] = float(text)
+                    except ValueError:
+                        pass
+
+            # Drop parsed elements so the tree never grows
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+            if entry["url"]:
+                yield kind, entry
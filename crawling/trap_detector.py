@@ -0,0 +1,189 @@
+"""Crawler trap and infinite URL space detection."""
+
+import re
+from collections import Counter
+from typing import Dict, Any, Optional
+from urllib.parse import parse_qsl
+from loguru import logger
+
+from .url import parse_url
+
+_NUMBER_RE = re.compile(r"\d+")
+_HEX_ID_RE = re.compile(r"^[0-9a-f]{12,}$|^[0-9a-f-]{32,36}$", re.I)
+# Year followed by a month (and day), as one segment or several
+_CALENDAR_RE = re.compile(r"(?:^|/)(?:19|20)\d{2}(?:[/-]\d{1,2}){1,2}(?:/|$)")
+
+
+class _HostStats:
+    """Per-host URL pattern counters."""
+
+    __slots__ = ("templates", "path_variants")
+
+    def __init__(self):
+        self.templates: Counter = Counter()
+        self.path_variants: Counter = Counter()
+
+
+class TrapDetector:
+    """
+    Detect crawler traps and infinite URL spaces.
+
+    URLs are reduced to templates (numbers and IDs replaced by placeholders,
+    query values dropped) and counted per host as they are discovered. URL
+    families that keep growing, such as calendars, faceted search and
+    session-like query strings, are first deprioritized and then blocked.
+    Only templates with a query string or a calendar-like path are counted
+    against ``max_urls_per_template``: a listing such as ``/product/{n}``
+    is a finite URL space however large the site is.
+
+    Features:
+    - Repeated path segment detection
+    - Path depth and URL length limits
+    - Query parameter count limits
+    - Per-host URL template explosion tracking
+    - Query variant explosion tracking (faceted search)
+    """
+
+    def __init__(
+        self,
+        max_path_depth: int = 15,
+        max_segment_repeats: int = 3,
+        max_query_params: int = 8,
+        max_url_length: int = 1024,
+        max_urls_per_template: Optional[int] = 1000,
+        max_query_variants: int = 200,
+        max_templates_per_host: int = 10000,
+        soft_limit_ratio: float = 0.5,
+        penalty_weight: float = 10.0,
+    ):
+        """
+        Initialize trap detector.
+
+        Args:
+            max_path_depth: Maximum number of path segments
+            max_segment_repeats: Maximum occurrences of one segment in a path
+            max_query_params: Maximum number of query parameters
+            max_url_length: Maximum URL length
+            max_urls_per_template: URLs allowed per host query or calendar
+                URL template (None disables the limit)
+            max_query_variants: Query-string variants allowed per path
+            max_templates_per_host: Templates tracked per host (memory bound)
+            soft_limit_ratio: Fraction of a limit after which URLs are penalized
+            penalty_weight: Priority penalty for a URL family at its limit
+        """
+        self.max_path_depth = max_path_depth
+        self.max_segment_repeats = max_segment_repeats
+        self.max_query_params = max_query_params
+        self.max_url_length = max_url_length
+        self.max_urls_per_template = max_urls_per_template
+        self.max_query_variants = max_query_variants
+        self.max_templates_per_host = max_templates_per_host
+        self.soft_limit_ratio = soft_limit_ratio
+        self.penalty_weight = penalty_weight
+
+        self.hosts: Dict[str, _HostStats] = {}
+        self.blocked: Counter = Counter()
+
+        logger.info("Trap detector initialized")
+
+    def assess(self, url: str) -> Dict[str, Any]:
+        """
+        Assess a newly discovered URL and record it in the host statistics.
+
+        Args:
+            url: URL to assess (call once per distinct URL)
+
+        Returns:
+            Dictionary with ``blocked``, ``penalty`` (priority to subtract)
+            and ``reason``
+        """
+        parts = parse_url(url)
+        segments = [segment for segment in parts.path.split("/") if segment]
+        query = parse_qsl(parts.query, keep_blank_values=True)
+
+        reason = self._static_reason(url, segments, query)
+        if reason:
+            return self._block(reason, parts.host)
+
+        stats = self.hosts.get(parts.host)
+        if stats is None:
+            stats = self.hosts[parts.host] = _HostStats()
+
+        path_template = "/" + "/".join(self._template_segment(s) for s in segments)
+        template = path_template
+        if query:
+            template += "?" + "&".join(sorted({key for key, _ in query}))
+
+        template_count = (
+            self._increment(stats.templates, template)
+            if self.max_urls_per_template and (query or _CALENDAR_RE.search(parts.path))
+            else 0
+        )
+        variant_count = (
+            self._increment(stats.path_variants, path_template) if query else 0
+        )
+
+        if template_count > (self.max_urls_per_template or template_count):
+            return self._block("template_explosion", parts.host)
+        if variant_count > self.max_query_variants:
+            return self._block("query_explosion", parts.host)
+
+        penalty = self._penalty(variant_count, self.max_query_variants)
+        if template_count:
+            penalty = max(
+                penalty, self._penalty(template_count, self.max_urls_per_template)
+            )
+        return {"blocked": False, "penalty": penalty, "reason": None}
+
+    def _static_reason(self, url: str, segments, query) -> Optional[str]:
+        """Check limits that need no history."""
+        if len(url) > self.max_url_length:
+            return "url_length"
+        if len(segments) > self.max_path_depth:
+            return "path_depth"
+        if len(query) > self.max_query_params:
+            return "query_params"
+        if segments:
+            _, repeats = Counter(segments).most_common(1)[0]
+            if repeats > self.max_segment_repeats:
+                return "repeated_segments"
+        return None
+
+    def _template_segment(self, segment: str) -> str:
+        """Replace IDs and numbers in a path segment with placeholders."""
+        if _HEX_ID_RE.match(segment):
+            return "{id}"
+        return _NUMBER_RE.sub("{n}", segment)
+
+    def _increment(self, counter: Counter, key: str) -> int:
+        """Increment a bounded counter and return the new count."""
+        if key not in counter and len(counter) >= self.max_templates_per_host:
+            return 1
+        counter[key] += 1
+        return counter[key]
+
+    def _penalty(self, count: int, limit: int) -> float:
+        """Priority penalty that grows from the soft limit to the hard limit."""
+        soft = limit * self.soft_limit_ratio
+        if count <= soft or soft >= limit:
+            return 0.0
+        return self.penalty_weight * (count - soft) / (limit - soft)
+
+    def _block(self, reason: str, host: str) -> Dict[str, Any]:
+        """Record and build a blocking verdict."""
+        self.blocked[reason] += 1
+        logger.debug(f"Trap detector blocked URL on {host}: {reason}")
+        return {"blocked": True, "penalty": 0.0, "reason": reason}
+
+    def clear(self):
+        """Clear collected statistics."""
+        self.hosts.clear()
+        self.blocked.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get trap detector statistics."""
+        return {
+            "hosts_tracked": len(self.hosts),
+            "urls_blocked": sum(self.blocked.values()),
+            "blocked_by_reason": dict(self.blocked),
+        }
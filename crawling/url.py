@@ -0,0 +1,102 @@
+"""Parsed and interned URLs shared by the crawl components."""
+
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+from .url_filter import url_fingerprint
+
+# Distinct URLs kept parsed (navigation links repeat on most pages)
+URL_CACHE_SIZE = 50000
+
+
+class CrawlURL:
+    """
+    A URL split and normalized once for the whole crawl.
+
+    Instances are interned by ``parse_url``: the link extractor, duplicate
+    detector, frontiers, robots cache, politeness manager and trap detector
+    all look a URL string up instead of parsing it again.
+
+    Features:
+    - Lowercase host (host[:port]) and origin
+    - Normalized form used for deduplication
+    - Lazily computed 64-bit fingerprint
+    """
+
+    __slots__ = (
+        "url", "scheme", "host", "path", "query", "origin", "normalized", "_fingerprint",
+    )
+
+    def __init__(self, url: str):
+        """
+        Parse a URL.
+
+        Args:
+            url: Absolute URL
+        """
+        self.url = url
+        self._fingerprint: Optional[int] = None
+
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            # Unparseable (e.g. broken IPv6 literal): keep it as an opaque key
+            self.scheme = self.host = self.path = self.query = ""
+            self.origin = ""
+            self.normalized = url
+            return
+
+        self.scheme = parts.scheme.lower()
+        self.host = parts.netloc.lower()
+        self.path = parts.path
+        self.query = parts.query
+        self.origin = f"{self.scheme}://{self.host}"
+        self.normalized = self._normalize()
+
+    def _normalize(self) -> str:
+        """Build the normalized form used for duplicate detection."""
+        host = self.host
+
+        # Remove default ports
+        if self.scheme == "http" and host.endswith(":80"):
+            host = host[:-3]
+        elif self.scheme == "https" and host.endswith(":443"):
+            host = host[:-4]
+
+        # Remove trailing slash from path
+        path = self.path.rstrip("/") or "/"
+
+        normalized = f"{self.scheme}://{host}{path}"
+
+        # Sort query parameters
+        if self.query:
+            sorted_query = urlencode(sorted(parse_qs(self.query).items()), doseq=True)
+            if sorted_query:
+                normalized += f"?{sorted_query}"
+
+        return normalized
+
+    @property
+    def fingerprint(self) -> int:
+        """64-bit fingerprint of the normalized URL."""
+        if self._fingerprint is None:
+            self._fingerprint = url_fingerprint(self.normalized)
+        return self._fingerprint
+
+    def __repr__(self) -> str:
+        return f"CrawlURL({self.url!r})"
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def parse_url(url: str) -> CrawlURL:
+    """
+    Get the interned CrawlURL for a URL string.
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        Parsed URL (the same instance while it stays in the cache)
+    """
+    return CrawlURL(url)
@@ -0,0 +1,360 @@
+"""Compact set-membership filters for crawl deduplication."""
+
+import hashlib
+import math
+import struct
+from array import array
+from typing import List
+
+
+def url_fingerprint(key: str) -> int:
+    """Compute a 64-bit fingerprint of a (normalized) URL."""
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest(),
+        "little",
+    )
+
+
+class ExactSet:
+    """
+    Exact membership filter backed by a set of strings.
+
+    Features:
+    - No false positives
+    - Highest memory use
+    """
+
+    MAGIC = b"EXS1"
+
+    def __init__(self):
+        """Initialize exact set."""
+        self.items = set()
+
+    def add(self, key: str) -> bool:
+        """Add key, returning True if it was not present."""
+        if key in self.items:
+            return False
+        self.items.add(key)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def clear(self):
+        """Remove all keys."""
+        self.items.clear()
+
+    def save(self, path: str):
+        """Serialize filter to a file."""
+        with open(path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write("\n".join(self.items).encode("utf-8", "surrogatepass"))
+
+    @classmethod
+    def _read(cls, data: bytes) -> "ExactSet":
+        """Deserialize filter from bytes following the magic header."""
+        instance = cls()
+        if data:
+            instance.items.update(data.decode("utf-8", "surrogatepass").split("\n"))
+        return instance
+
+
+class FingerprintSet:
+    """
+    Membership filter storing 64-bit URL fingerprints.
+
+    Features:
+    - Much smaller than storing URL strings
+    - Accepts fingerprints computed once per URL (``CrawlURL.fingerprint``)
+    - Collision probability ~ n^2 / 2^65 (negligible below billions of URLs)
+    """
+
+    MAGIC = b"FPS1"
+
+    def __init__(self):
+        """Initialize fingerprint set."""
+        self.fingerprints = set()
+
+    def add(self, key: str) -> bool:
+        """Add key, returning True if it was not present."""
+        return self.add_fingerprint(url_fingerprint(key))
+
+    def add_fingerprint(self, fingerprint: int) -> bool:
+        """Add a precomputed ``url_fingerprint``, returning True if it was not present."""
+        if fingerprint in self.fingerprints:
+            return False
+        self.fingerprints.add(fingerprint)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return url_fingerprint(key) in self.fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def clear(self):
+        """Remove all keys."""
+        self.fingerprints.clear()
+
+    def save(self, path: str):
+        """Serialize filter to a file."""
+        with open(path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(array("Q", self.fingerprints).tobytes())
+
+    @classmethod
+    def _read(cls, data: bytes) -> "FingerprintSet":
+        """Deserialize filter from bytes following the magic header."""
+        instance = cls()
+        fingerprints = array("Q")
+        fingerprints.frombytes(data)
+        instance.fingerprints.update(fingerprints)
+        return instance
+
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter.
+
+    Bit positions come from double hashing of one 128-bit BLAKE2b digest,
+    so each operation hashes the key once regardless of the hash count.
+    """
+
+    HEADER = struct.Struct("<QdQIQ")
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initialize Bloom filter.
+
+        Args:
+            capacity: Number of keys the filter is sized for
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        )
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> List[int]:
+        """Get bit positions for a key."""
+        digest = hashlib.blake2b(
+            key.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> bool:
+        """Add key, returning True if it was (probably) not present."""
+        added = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            mask = 1 << bit
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_full(self) -> bool:
+        """Check whether the filter reached its designed capacity."""
+        return self.count >= self.capacity
+
+    def to_bytes(self) -> bytes:
+        """Serialize filter."""
+        header = self.HEADER.pack(
+            self.capacity, self.error_rate, self.num_bits, self.num_hashes, self.count
+        )
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0):
+        """
+        Deserialize filter.
+
+        Returns:
+            Tuple of (filter, offset after the filter)
+        """
+        capacity, error_rate, num_bits, num_hashes, count = cls.HEADER.unpack_from(
+            data, offset
+        )
+        offset += cls.HEADER.size
+
+        instance = cls.__new__(cls)
+        instance.capacity = capacity
+        instance.error_rate = error_rate
+        instance.num_bits = num_bits
+        instance.num_hashes = num_hashes
+        instance.count = count
+        size = (num_bits + 7) // 8
+        instance.bits = bytearray(data[offset:offset + size])
+        return instance, offset + size
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows as keys are added.
+
+    Slice ``i`` is ``growth ** i`` times larger than the first and built for
+    error rate ``error_rate * (1 - tightening) * tightening ** i``. A lookup
+    is a false positive if any slice matches, so the compound rate is at
+    most the sum of the slice rates, a geometric series bounded by
+    ``error_rate`` however many keys arrive.
+
+    Features:
+    - Configurable false-positive rate
+    - No capacity planning needed
+    - ~1.2 bytes per URL at 1% false positives
+    """
+
+    MAGIC = b"SBF1"
+    HEADER = struct.Struct("<QddII")
+
+    def __init__(
+        self,
+        initial_capacity: int = 100000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ):
+        """
+        Initialize scalable Bloom filter.
+
+        Args:
+            initial_capacity: Capacity of the first slice
+            error_rate: Target overall false-positive rate
+            growth: Capacity multiplier for each new slice
+            tightening: Error-rate multiplier for each new slice
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+
+    def add(self, key: str) -> bool:
+        """Add key, returning True if it was (probably) not present."""
+        if key in self:
+            return False
+
+        if not self.filters or self.filters[-1].is_full():
+            index = len(self.filters)
+            self.filters.append(
+                BloomFilter(
+                    self.initial_capacity * (self.growth ** index),
+                    self.error_rate * (1 - self.tightening) * (self.tightening ** index),
+                )
+            )
+
+        self.filters[-1].add(key)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        # Newest slices are largest, check them first
+        return any(key in bloom for bloom in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(len(bloom) for bloom in self.filters)
+
+    def clear(self):
+        """Remove all keys."""
+        self.filters.clear()
+
+    def memory_bytes(self) -> int:
+        """Get size of the bit arrays in bytes."""
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+    def save(self, path: str):
+        """Serialize filter to a file."""
+        with open(path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(
+                self.HEADER.pack(
+                    self.initial_capacity,
+                    self.error_rate,
+                    self.tightening,
+                    self.growth,
+                    len(self.filters),
+                )
+            )
+            for bloom in self.filters:
+                f.write(bloom.to_bytes())
+
+    @classmethod
+    def _read(cls, data: bytes) -> "ScalableBloomFilter":
+        """Deserialize filter from bytes following the magic header."""
+        initial_capacity, error_rate, tightening, growth, count = cls.HEADER.unpack_from(data)
+        instance = cls(initial_capacity, error_rate, growth, tightening)
+
+        offset = cls.HEADER.size
+        for _ in range(count):
+            bloom, offset = BloomFilter.from_bytes(data, offset)
+            instance.filters.append(bloom)
+        return instance
+
+
+FILTER_TYPES = {
+    "exact": ExactSet,
+    "fingerprint": FingerprintSet,
+    "bloom": ScalableBloomFilter,
+}
+
+
+def load_filter(path: str):
+    """
+    Load a filter saved with ``save``.
+
+    Args:
+        path: File written by a filter's ``save`` method
+
+    Returns:
+        Filter instance of the stored type
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, payload = data[:4], data[4:]
+    for filter_cls in FILTER_TYPES.values():
+        if filter_cls.MAGIC == magic:
+            return filter_cls._read(payload)
+
+    raise ValueError(f"Unknown filter format in {path}")
+
+
+def create_filter(backend: str = "exact", capacity: int = 100000, error_rate: float = 0.001):
+    """
+    Create a membership filter.
+
+    Args:
+        backend: Filter type (exact, fingerprint, bloom)
+        capacity: Initial capacity (bloom only)
+        error_rate: False-positive rate (bloom only)
+
+    Returns:
+        Filter instance
+    """
+    if backend == "bloom":
+        return ScalableBloomFilter(initial_capacity=capacity, error_rate=error_rate)
+    if backend in FILTER_TYPES:
+        return FILTER_TYPES[backend]()
+
+    raise ValueError(f"Unknown dedup backend: {backend}")
@@ -0,0 +1,162 @@
+"""Persistent HTTP validators for incremental re-crawls."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Any, Optional, List
+from loguru import logger
+
+
+def content_hash(content: str) -> str:
+    """Compute a compact hash of page content."""
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class ValidatorStore:
+    """
+    SQLite store of per-URL HTTP validators and outgoing links.
+
+    Re-crawls send the stored ``ETag``/``Last-Modified`` as conditional
+    request headers. When a page is unchanged (304 response or same content
+    hash), its stored links are queued again without parsing the page.
+
+    Features:
+    - ETag / Last-Modified validators
+    - Content hashes for servers without validators
+    - Stored outgoing links
+    - Batched commits
+    """
+
+    def __init__(self, path: str, commit_interval: int = 100):
+        """
+        Initialize validator store.
+
+        Args:
+            path: SQLite database file (created if missing)
+            commit_interval: Writes between commits
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                links TEXT,
+                fetched_at REAL
+            )
+            """
+        )
+        self.conn.commit()
+
+        logger.info(f"Validator store opened: {path}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get stored validators for a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Dictionary with etag, last_modified, content_hash and links, or None
+        """
+        row = self.conn.execute(
+            "SELECT etag, last_modified, content_hash, links FROM validators WHERE url = ?",
+            (url,),
+        ).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "content_hash": row[2],
+            "links": json.loads(row[3]) if row[3] else [],
+        }
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_hash: Optional[str],
+        links: List[str],
+    ):
+        """
+        Store validators and links for a URL.
+
+        Args:
+            url: Page URL
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            content_hash: Hash of the page content
+            links: Links extracted from the page
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO validators "
+            "(url, etag, last_modified, content_hash, links, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, content_hash, json.dumps(links), time.time()),
+        )
+
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_interval:
+            self.commit()
+
+    def touch(self, url: str):
+        """Record that an unchanged page was revalidated."""
+        self.conn.execute(
+            "UPDATE validators SET fetched_at = ? WHERE url = ?", (time.time(), url)
+        )
+
+    @staticmethod
+    def conditional_headers(validators: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Build conditional request headers from stored validators.
+
+        Args:
+            validators: Result of ``get``
+
+        Returns:
+            If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def commit(self):
+        """Commit pending writes."""
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def close(self):
+        """Commit and close the database."""
+        self.commit()
+        self.conn.close()
+        logger.info(f"Validator store closed: {self.path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get validator store statistics."""
+        return {
+            "stored_pages": self.conn.execute("SELECT COUNT(*) FROM validators").fetchone()[0],
+            "path": self.path,
+        }
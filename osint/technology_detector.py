@@ -2,10 +2,11 @@
 
 from typing import Dict, Any, List
 import re
-import httpx
 from bs4 import BeautifulSoup
 from loguru import logger
 
+from scraping.http_cache import get_shared_fetcher
+
 
 class TechnologyDetector:
     """
@@ -93,24 +94,23 @@ class TechnologyDetector:
         try:
             logger.debug(f"Detecting technologies for: {url}")
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, follow_redirects=True, timeout=15)
-                response.raise_for_status()
+            response = await get_shared_fetcher().get(url, timeout=15)
+            response.raise_for_status()
 
-                html = response.text
-                headers = dict(response.headers)
+            html = response.text
+            headers = dict(response.headers)
 
-                # Detect technologies
-                technologies = {
-                    "cms": self._detect_cms(html, headers),
-                    "frameworks": self._detect_frameworks(html),
-                    "analytics": self._detect_analytics(html),
-                    "server": self._detect_server(headers),
-                    "languages": self._detect_languages(headers),
-                }
+            # Detect technologies
+            technologies = {
+                "cms": self._detect_cms(html, headers),
+                "frameworks": self._detect_frameworks(html),
+                "analytics": self._detect_analytics(html),
+                "server": self._detect_server(headers),
+                "languages": self._detect_languages(headers),
+            }
 
-                logger.info(f"Technologies detected for: {url}")
-                return technologies
+            logger.info(f"Technologies detected for: {url}")
+            return technologies
 
         except Exception as e:
             logger.error(f"Error detecting technologies for {url}: {e}")
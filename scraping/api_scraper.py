@@ -16,13 +16,29 @@ class APIScraper:
     - Authentication handling
     - Rate limiting
     - Pagination support
+    - Pooled keep-alive connections
     """
 
-    def __init__(self, session_pool=None, proxy_manager=None, rate_limiter=None):
-        """Initialize API scraper."""
+    def __init__(
+        self,
+        session_pool=None,
+        proxy_manager=None,
+        rate_limiter=None,
+        connection_stats=None,
+    ):
+        """
+        Initialize API scraper.
+
+        Args:
+            session_pool: SessionPool to lease keep-alive clients from
+            proxy_manager: Proxy manager
+            rate_limiter: Rate limiter
+            connection_stats: ConnectionStats to trace requests into
+        """
         self.session_pool = session_pool
         self.proxy_manager = proxy_manager
         self.rate_limiter = rate_limiter
+        self.connection_stats = connection_stats
 
     @retry(
         stop=stop_after_attempt(3),
@@ -48,7 +64,7 @@ class APIScraper:
         try:
             # Apply rate limiting
             if self.rate_limiter:
-                await self.rate_limiter.acquire()
+                await self.rate_limiter.acquire(config.get("rate_limit_key"))
 
             # Prepare request
             method = config.get("method", "GET").upper()
@@ -74,36 +90,44 @@ class APIScraper:
                 proxy = self.proxy_manager.get_proxy()
 
             # Make request
-            timeout = config.get("timeout", 30)
-            async with httpx.AsyncClient(
-                proxies=proxy,
-                timeout=timeout,
-                follow_redirects=True,
-            ) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    data=data,
-                    json=json_data,
-                    auth=auth if isinstance(auth, tuple) else None,
-                )
-                response.raise_for_status()
-
-                # Parse response
-                content_type = response.headers.get("content-type", "")
-                if "application/json" in content_type:
-                    data = response.json()
-                else:
-                    data = response.text
-
-                return {
-                    "success": True,
-                    "data": data,
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                }
+            request_args = {
+                "method": method,
+                "url": url,
+                "headers": headers,
+                "params": params,
+                "data": data,
+                "json": json_data,
+                "auth": auth if isinstance(auth, tuple) else None,
+                "timeout": config.get("timeout", 30),
+            }
+            if self.connection_stats:
+                request_args["extensions"] = {"trace": self.connection_stats.trace}
+
+            if self.session_pool:
+                async with self.session_pool.session(url, proxy=proxy) as client:
+                    response = await client.request(**request_args)
+            else:
+                async with httpx.AsyncClient(
+                    proxies=proxy,
+                    follow_redirects=True,
+                ) as client:
+                    response = await client.request(**request_args)
+
+            response.raise_for_status()
+
+            # Parse response
+            content_type = response.headers.get("content-type", "")
+            if "application/json" in content_type:
+                data = response.json()
+            else:
+                data = response.text
+
+            return {
+                "success": True,
+                "data": data,
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+            }
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error scraping API {url}: {e}")
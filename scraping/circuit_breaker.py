@@ -0,0 +1,222 @@
+"""Per-host circuit breaker for failing scrape targets."""
+
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    """Rolling outcome window and state of one key."""
+
+    __slots__ = ("state", "outcomes", "failures", "opened_at", "probes")
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.outcomes: deque = deque(maxlen=window)
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker keyed by host (or any other string).
+
+    A closed circuit lets requests through and tracks the outcome of the
+    last ``window`` requests. Once at least ``min_requests`` were seen and
+    the failure rate reaches ``failure_threshold``, the circuit opens and
+    requests are refused for ``reset_timeout`` seconds. It then turns
+    half-open: up to ``half_open_max_calls`` probe requests are let through,
+    and one success closes the circuit again while a failure reopens it.
+
+    A key only gets a circuit once it fails, and a closed circuit whose
+    window no longer holds a failure is dropped again. Until then a key's
+    recent outcomes are all successes, so a single count per key (capped at
+    ``window``) stands in for its window and seeds the circuit on the first
+    failure: the rate always covers the last ``window`` requests.
+
+    Features:
+    - Closed / open / half-open states per key
+    - Error-rate threshold over a rolling window
+    - Limited probes while half-open
+    - Bounded number of tracked keys
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        min_requests: int = 5,
+        window: int = 20,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        max_keys: int = 10000,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Failure rate (0-1) that opens a circuit
+            min_requests: Outcomes needed before the rate is considered
+            window: Number of recent outcomes tracked per key
+            reset_timeout: Seconds an open circuit refuses requests
+            half_open_max_calls: Probe requests allowed while half-open
+            max_keys: Closed circuits (and success counts) are pruned beyond
+                this many keys
+        """
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.max_keys = max_keys
+
+        self.circuits: Dict[str, _Circuit] = {}
+        # Consecutive recent successes of keys without a circuit (LRU order)
+        self.successes: Dict[str, int] = {}
+        self.rejected = 0
+        self.trips = 0
+
+    def allow(self, key: str) -> bool:
+        """
+        Check whether a request for a key may be made.
+
+        Args:
+            key: Circuit key (e.g. host)
+
+        Returns:
+            True if the request may proceed
+        """
+        circuit = self.circuits.get(key)
+        if circuit is None or circuit.state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        if circuit.state == OPEN:
+            if now - circuit.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            circuit.state = HALF_OPEN
+            circuit.probes = 0
+            circuit.opened_at = now
+            logger.info(f"Circuit half-open for {key}")
+
+        # Probes whose outcome never arrived (cancelled) are retried later
+        if circuit.probes >= self.half_open_max_calls:
+            if now - circuit.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            circuit.probes = 0
+            circuit.opened_at = now
+
+        circuit.probes += 1
+        return True
+
+    def record_success(self, key: str):
+        """Record a successful request."""
+        circuit = self.circuits.get(key)
+        if circuit is None:
+            self._count_success(key, self.successes.pop(key, 0) + 1)
+            return
+
+        if circuit.state == OPEN:
+            # Started before the circuit opened, not a probe
+            return
+        if circuit.state == HALF_OPEN:
+            logger.info(f"Circuit closed for {key}")
+            del self.circuits[key]
+            return
+
+        self._add_outcome(circuit, False)
+        if not circuit.failures:
+            # A window of successes only needs its length
+            del self.circuits[key]
+            self._count_success(key, len(circuit.outcomes))
+
+    def record_failure(self, key: str):
+        """Record a failed request."""
+        circuit = self.circuits.get(key)
+        if circuit is None:
+            if len(self.circuits) >= self.max_keys:
+                self._prune()
+            circuit = self.circuits[key] = _Circuit(self.window)
+            circuit.outcomes.extend([False] * self.successes.pop(key, 0))
+
+        if circuit.state == HALF_OPEN:
+            self._open(key, circuit)
+            return
+        if circuit.state == OPEN:
+            return
+
+        self._add_outcome(circuit, True)
+        if (
+            len(circuit.outcomes) >= self.min_requests
+            and circuit.failures >= self.failure_threshold * len(circuit.outcomes)
+        ):
+            self._open(key, circuit)
+
+    def _count_success(self, key: str, count: int):
+        """Store a key's success count as its most recently used entry."""
+        if len(self.successes) >= self.max_keys:
+            del self.successes[next(iter(self.successes))]
+        self.successes[key] = min(count, self.window)
+
+    def _add_outcome(self, circuit: _Circuit, failed: bool):
+        """Push an outcome into the rolling window."""
+        if len(circuit.outcomes) == circuit.outcomes.maxlen and circuit.outcomes[0]:
+            circuit.failures -= 1
+        circuit.outcomes.append(failed)
+        if failed:
+            circuit.failures += 1
+
+    def _open(self, key: str, circuit: _Circuit):
+        """Open a circuit."""
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        self.trips += 1
+        logger.warning(f"Circuit opened for {key} for {self.reset_timeout:.0f}s")
+
+    def _prune(self):
+        """Drop closed circuits, keeping open and half-open ones."""
+        closed = [key for key, circuit in self.circuits.items() if circuit.state == CLOSED]
+        for key in closed:
+            del self.circuits[key]
+
+    def get_state(self, key: str) -> str:
+        """Get the state of a key's circuit (closed, open or half_open)."""
+        circuit = self.circuits.get(key)
+        return circuit.state if circuit else CLOSED
+
+    def retry_after(self, key: str) -> Optional[float]:
+        """Seconds until an open circuit turns half-open, None if not open."""
+        circuit = self.circuits.get(key)
+        if circuit is None or circuit.state != OPEN:
+            return None
+        return max(0.0, self.reset_timeout - (time.monotonic() - circuit.opened_at))
+
+    def reset(self, key: Optional[str] = None):
+        """Close one circuit, or all of them."""
+        if key is None:
+            self.circuits.clear()
+            self.successes.clear()
+        else:
+            self.circuits.pop(key, None)
+            self.successes.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics."""
+        states: Dict[str, int] = {}
+        for circuit in self.circuits.values():
+            states[circuit.state] = states.get(circuit.state, 0) + 1
+
+        return {
+            "keys_tracked": len(self.circuits),
+            "by_state": states,
+            "open": sorted(key for key, c in self.circuits.items() if c.state == OPEN),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
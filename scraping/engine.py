@@ -1,7 +1,11 @@
 """Core scraping engine."""
 
-from typing import Dict, Any, Optional, List
+from typing import (
+    Dict, Any, Optional, List, Tuple, Iterable, AsyncIterable, AsyncIterator, Union,
+)
 from datetime import datetime
+from collections import deque
+from urllib.parse import urlsplit
 import asyncio
 from loguru import logger
 
@@ -11,7 +15,10 @@ from .api_scraper import APIScraper
 from .proxy_manager import ProxyManager
 from .user_agent_rotator import UserAgentRotator
 from .rate_limiter import RateLimiter
+from .redis_rate_limiter import RedisRateLimiter
 from .session_pool import SessionPool
+from .circuit_breaker import CircuitBreaker
+from .http_cache import get_shared_fetcher
 
 
 class ScrapingEngine:
@@ -24,8 +31,10 @@ class ScrapingEngine:
     - API endpoint scraping
     - Proxy rotation
     - User-Agent rotation
-    - Rate limiting
+    - Rate limiting (per process or shared through Redis)
     - Session pooling
+    - Per-host circuit breakers and batch concurrency caps
+    - Response cache shared with the analyzers
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -40,19 +49,37 @@ class ScrapingEngine:
         # Initialize components
         self.proxy_manager = ProxyManager(self.config.get("proxy", {}))
         self.user_agent_rotator = UserAgentRotator()
-        self.rate_limiter = RateLimiter(
-            calls_per_minute=self.config.get("rate_limit_per_minute", 60)
-        )
+        self.rate_limiter = self._create_rate_limiter()
         self.session_pool = SessionPool(
-            max_sessions=self.config.get("max_sessions", 10)
+            max_sessions=self.config.get("max_sessions", 10),
+            max_connections=self.config.get("max_connections", 100),
+            max_keepalive_connections=self.config.get("max_keepalive_connections", 20),
+            max_connections_per_host=self.config.get("max_connections_per_host", 10),
+            keepalive_expiry=self.config.get("keepalive_expiry", 30.0),
+            idle_timeout=self.config.get("session_idle_timeout", 300.0),
+        )
+
+        self.circuit_breaker = (
+            CircuitBreaker(
+                failure_threshold=self.config.get("circuit_failure_threshold", 0.5),
+                min_requests=self.config.get("circuit_min_requests", 5),
+                reset_timeout=self.config.get("circuit_reset_timeout", 30.0),
+            )
+            if self.config.get("circuit_breaker", True) else None
         )
 
+        # Process-wide cache, so analyzers reuse pages fetched here
+        self.fetcher = get_shared_fetcher() if self.config.get("response_cache", True) else None
+
         # Initialize scrapers
         self.static_scraper = StaticScraper(
             session_pool=self.session_pool,
             proxy_manager=self.proxy_manager,
             user_agent_rotator=self.user_agent_rotator,
             rate_limiter=self.rate_limiter,
+            connection_stats=self.session_pool.connection_stats,
+            fetcher=self.fetcher,
+            extraction_backend=self.config.get("extraction_backend", "lxml"),
         )
 
         self.dynamic_scraper = DynamicScraper(
@@ -64,10 +91,42 @@ class ScrapingEngine:
             session_pool=self.session_pool,
             proxy_manager=self.proxy_manager,
             rate_limiter=self.rate_limiter,
+            connection_stats=self.session_pool.connection_stats,
         )
 
         logger.info("Scraping engine initialized")
 
+    def _create_rate_limiter(self):
+        """Create the rate limiter selected by the ``rate_limit_backend`` config key."""
+        backend = self.config.get("rate_limit_backend", "local")
+        limits = {
+            "calls_per_minute": self.config.get("rate_limit_per_minute", 60),
+            "calls_per_hour": self.config.get("rate_limit_per_hour"),
+            "burst": self.config.get("rate_limit_burst"),
+        }
+
+        if backend == "local":
+            rate_limiter = RateLimiter(**limits)
+        elif backend == "redis":
+            import redis.asyncio as aioredis
+
+            rate_limiter = RedisRateLimiter(
+                aioredis.Redis.from_url(
+                    self.config.get("redis_url", "redis://localhost:6379/0")
+                ),
+                namespace=self.config.get("rate_limit_namespace", "default"),
+                local_batch=self.config.get("rate_limit_local_batch", 5),
+                **limits,
+            )
+        else:
+            raise ValueError(f"Unknown rate limit backend: {backend}")
+
+        # Per-key quotas, e.g. {"shodan": {"calls_per_minute": 1}}
+        for key, key_limits in self.config.get("rate_limit_keys", {}).items():
+            rate_limiter.set_limit(key, **key_limits)
+
+        return rate_limiter
+
     async def scrape(
         self,
         url: str,
@@ -87,6 +146,22 @@ class ScrapingEngine:
         """
         start_time = datetime.utcnow()
         config = config or {}
+        host = self._get_host(url)
+
+        # Fail fast while the host's circuit is open
+        if self.circuit_breaker and not self.circuit_breaker.allow(host):
+            return {
+                "success": False,
+                "error": f"Circuit open for {host}",
+                "circuit_open": True,
+                "retry_after": self.circuit_breaker.retry_after(host),
+                "metadata": {
+                    "url": url,
+                    "scraper_type": scraper_type,
+                    "start_time": start_time.isoformat(),
+                    "end_time": datetime.utcnow().isoformat(),
+                },
+            }
 
         try:
             logger.info(f"Starting scrape: {url} (type: {scraper_type})")
@@ -110,11 +185,15 @@ class ScrapingEngine:
                 "duration_seconds": (datetime.utcnow() - start_time).total_seconds(),
             }
 
+            self._record_outcome(host, result)
+
             logger.info(f"Scrape completed: {url}")
             return result
 
         except Exception as e:
             logger.error(f"Scrape failed: {url} - {str(e)}")
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure(host)
             return {
                 "success": False,
                 "error": str(e),
@@ -126,9 +205,30 @@ class ScrapingEngine:
                 },
             }
 
+    @staticmethod
+    def _get_host(url: str) -> str:
+        """Extract the host (netloc) used for circuits and concurrency caps."""
+        return urlsplit(url).netloc.lower()
+
+    def _record_outcome(self, host: str, result: Dict[str, Any]):
+        """Feed a scrape result to the host's circuit."""
+        if not self.circuit_breaker:
+            return
+
+        # Client errors (404, 403, ...) mean the host is up and answering
+        status_code = result.get("status_code")
+        if (
+            result.get("success")
+            or result.get("skipped")
+            or (status_code is not None and status_code < 500 and status_code != 429)
+        ):
+            self.circuit_breaker.record_success(host)
+        else:
+            self.circuit_breaker.record_failure(host)
+
     async def scrape_batch(
         self,
-        urls: List[str],
+        urls: Iterable[str],
         scraper_type: str = "static",
         config: Optional[Dict[str, Any]] = None,
         max_concurrent: int = 5,
@@ -136,40 +236,211 @@ class ScrapingEngine:
         """
         Scrape multiple URLs concurrently.
 
+        Collects ``iter_scrape_batch`` into a list; use that directly for
+        large batches.
+
         Args:
-            urls: List of URLs to scrape
+            urls: URLs to scrape
             scraper_type: Type of scraper to use
             config: Additional configuration
             max_concurrent: Maximum concurrent requests
 
         Returns:
-            List of scraping results
+            List of scraping results, in the order of ``urls``
         """
-        logger.info(f"Starting batch scrape: {len(urls)} URLs")
-
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def scrape_with_semaphore(url: str):
-            async with semaphore:
-                return await self.scrape(url, scraper_type, config)
-
-        tasks = [scrape_with_semaphore(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Convert exceptions to error results
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    "success": False,
-                    "error": str(result),
-                    "metadata": {"url": urls[i]},
-                })
-            else:
-                processed_results.append(result)
+        results: Dict[int, Dict[str, Any]] = {}
+        async for index, result in self.iter_scrape_batch(
+            urls, scraper_type, config, max_concurrent
+        ):
+            results[index] = result
+
+        return [results[index] for index in range(len(results))]
+
+    async def iter_scrape_batch(
+        self,
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        scraper_type: str = "static",
+        config: Optional[Dict[str, Any]] = None,
+        max_concurrent: int = 5,
+        buffer_size: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Scrape URLs concurrently, yielding results as they complete.
+
+        URLs are pulled from ``urls`` only when a worker is free, and finished
+        results wait in a bounded buffer, so memory stays flat however many
+        URLs the source produces. A URL whose host already has
+        ``max_per_host`` requests running is parked and the worker moves on
+        to the next URL, so one slow host cannot take every slot. Closing the
+        generator early cancels the requests still in flight.
+
+        Args:
+            urls: URLs to scrape (iterable or async iterable)
+            scraper_type: Type of scraper to use
+            config: Additional configuration
+            max_concurrent: Maximum concurrent requests
+            buffer_size: Finished results held for a slow consumer
+                (defaults to twice max_concurrent)
+            max_per_host: Maximum concurrent requests to one host (defaults
+                to the ``max_concurrent_per_host`` config key, 4)
+
+        Yields:
+            (index of the URL in ``urls``, scraping result) in completion order
+        """
+        logger.info(f"Starting batch scrape (max {max_concurrent} concurrent)")
+
+        async_source = urls.__aiter__() if isinstance(urls, AsyncIterable) else None
+        sync_source = None if async_source else iter(urls)
+        host_cap = max_per_host or self.config.get("max_concurrent_per_host", 4)
+        max_parked = max_concurrent * 50
+        next_index = 0
+        completed = 0
+        exhausted = False
+        pulling = False
+
+        # Requests running per host and URLs waiting for a busy host
+        active: Dict[str, int] = {}
+        parked: Dict[str, deque] = {}
+        parked_count = 0
+        # Guards the shared state and wakes workers when a host slot frees
+        # up or a pull finishes. ``pulling`` keeps a second worker from
+        # advancing the source (an async generator cannot be advanced twice
+        # at once), while the lock itself is never held across a pull.
+        state = asyncio.Condition()
+
+        results: asyncio.Queue = asyncio.Queue(maxsize=buffer_size or max_concurrent * 2)
+
+        async def pull() -> Optional[Tuple[int, str]]:
+            nonlocal next_index
+            try:
+                if async_source:
+                    url = await async_source.__anext__()
+                else:
+                    url = next(sync_source)
+            except (StopIteration, StopAsyncIteration):
+                return None
+
+            index = next_index
+            next_index += 1
+            return index, url
+
+        def start(index: int, url: str, host: str) -> Tuple[int, str, str]:
+            active[host] = active.get(host, 0) + 1
+            return index, url, host
+
+        async def next_url() -> Optional[Tuple[int, str, str]]:
+            nonlocal parked_count, exhausted, pulling
+            while True:
+                async with state:
+                    # Parked URLs go first once their host has room
+                    for host, queue in parked.items():
+                        if active.get(host, 0) < host_cap:
+                            index, url = queue.popleft()
+                            if not queue:
+                                del parked[host]
+                            parked_count -= 1
+                            return start(index, url, host)
+
+                    if exhausted and not parked:
+                        return None
+                    if exhausted or pulling or parked_count >= max_parked:
+                        await state.wait()
+                        continue
+                    pulling = True
+
+                # A slow source must not hold up workers that only need the
+                # lock to release their host slot
+                try:
+                    item = await pull()
+                except BaseException:
+                    async with state:
+                        pulling = False
+                        state.notify_all()
+                    raise
+
+                async with state:
+                    pulling = False
+                    state.notify_all()
+                    if item is None:
+                        exhausted = True
+                        continue
+
+                    host = self._get_host(item[1])
+                    if active.get(host, 0) < host_cap:
+                        return start(*item, host)
+                    parked.setdefault(host, deque()).append(item)
+                    parked_count += 1
+
+        async def worker():
+            while True:
+                item = await next_url()
+                if item is None:
+                    return
+
+                index, url, host = item
+                try:
+                    result = await self.scrape(url, scraper_type, config)
+                except Exception as e:
+                    result = {
+                        "success": False,
+                        "error": str(e),
+                        "metadata": {"url": url},
+                    }
+                finally:
+                    async with state:
+                        active[host] -= 1
+                        if not active[host]:
+                            del active[host]
+                        state.notify_all()
+
+                await results.put((index, result))
+
+        async def supervise():
+            error = None
+            try:
+                await asyncio.gather(*workers)
+            except asyncio.CancelledError:
+                # The consumer is gone, nobody waits for the end marker
+                raise
+            except Exception as e:
+                error = e
+
+            await results.put(None)
+            if error:
+                raise error
+
+        workers = [asyncio.create_task(worker()) for _ in range(max_concurrent)]
+        supervisor = asyncio.create_task(supervise())
+
+        try:
+            while True:
+                item = await results.get()
+                if item is None:
+                    break
+                completed += 1
+                yield item
+
+            # Surface errors raised by the URL source
+            await supervisor
+
+        finally:
+            for task in [*workers, supervisor]:
+                task.cancel()
+            await asyncio.gather(*workers, supervisor, return_exceptions=True)
+
+            logger.info(f"Batch scrape finished: {completed} of {next_index} URLs delivered")
 
-        logger.info(f"Batch scrape completed: {len(urls)} URLs")
-        return processed_results
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool, rate limiter, circuit breaker and cache statistics."""
+        return {
+            "session_pool": self.session_pool.get_stats(),
+            "rate_limiter": self.rate_limiter.get_stats(),
+            "circuit_breaker": (
+                self.circuit_breaker.get_stats() if self.circuit_breaker else None
+            ),
+            "response_cache": self.fetcher.get_stats() if self.fetcher else None,
+        }
 
     async def close(self):
         """Clean up resources."""
@@ -0,0 +1,649 @@
+"""Shared HTTP fetch layer with request coalescing and a response cache."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Callable, Awaitable
+import httpx
+from loguru import logger
+
+from .session_pool import SessionPool
+
+# Statuses cacheable by default (RFC 9111 heuristic freshness)
+CACHEABLE_STATUSES = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+
+# Stored bodies are already decoded, so these no longer describe them
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# Request headers that do not change the response we cache
+_UNKEYED_HEADERS = {"user-agent"}
+
+
+async def read_body(
+    response: httpx.Response,
+    max_bytes: Optional[int],
+) -> Tuple[bytes, bool]:
+    """
+    Read a streamed body up to a byte cap.
+
+    Returns:
+        Body bytes and whether the body was cut off at the cap
+    """
+    if max_bytes is None:
+        return await response.aread(), False
+
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        remaining = max_bytes - size
+        if len(chunk) > remaining:
+            # Stop reading: the rest is dropped with the connection
+            chunks.append(chunk[:remaining])
+            return b"".join(chunks), True
+        chunks.append(chunk)
+        size += len(chunk)
+
+    return b"".join(chunks), False
+
+
+def is_allowed_content_type(content_type: str, allowed: Optional[Sequence[str]]) -> bool:
+    """Check a Content-Type header against allowed media type prefixes."""
+    if not allowed or not content_type:
+        return True
+
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return any(media_type.startswith(prefix) for prefix in allowed)
+
+
+def header_skip_reason(
+    headers: httpx.Headers,
+    max_bytes: Optional[int],
+    allowed_content_types: Optional[Sequence[str]] = None,
+    skip_oversized: bool = False,
+) -> Optional[str]:
+    """
+    Decide from response headers alone whether to skip reading the body.
+
+    Returns:
+        Why the response should be skipped, or None to read it
+    """
+    content_type = headers.get("content-type", "")
+    if not is_allowed_content_type(content_type, allowed_content_types):
+        return f"Content type not allowed: {content_type}"
+
+    content_length = headers.get("content-length", "")
+    if (
+        skip_oversized
+        and max_bytes is not None
+        and content_length.isdigit()
+        and int(content_length) > max_bytes
+    ):
+        return f"Content length {content_length} exceeds {max_bytes} bytes"
+
+    return None
+
+
+class CacheEntry:
+    """A stored response."""
+
+    __slots__ = (
+        "url", "status_code", "headers", "content", "elapsed",
+        "stored_at", "expires_at", "truncated", "skipped",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        content: bytes,
+        elapsed: float,
+        stored_at: float,
+        expires_at: float,
+        truncated: bool = False,
+        skipped: Optional[str] = None,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.truncated = truncated
+        self.skipped = skipped
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes."""
+        return len(self.content) + sum(len(k) + len(v) for k, v in self.headers) + 200
+
+    def header(self, name: str) -> Optional[str]:
+        """Get a response header (case-insensitive)."""
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers to revalidate this entry with."""
+        headers = {}
+        etag = self.header("etag")
+        if etag:
+            headers["If-None-Match"] = etag
+        last_modified = self.header("last-modified")
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def to_response(self, from_cache: bool) -> httpx.Response:
+        """Build a fresh httpx.Response (callers may not share one)."""
+        response = httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=httpx.Request("GET", self.url),
+            extensions={
+                "from_cache": from_cache,
+                "truncated": self.truncated,
+                "skipped": self.skipped,
+            },
+        )
+        response.elapsed = timedelta(seconds=self.elapsed)
+        return response
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU of responses, optionally backed by SQLite.
+
+    The memory tier holds up to ``max_bytes`` of responses. With a ``path``,
+    entries are also written to disk and survive restarts; disk hits are
+    promoted back to memory. Disk writes run in the default executor, and
+    the disk tier is pruned every ``prune_interval`` writes.
+
+    Features:
+    - LRU eviction by total size and entry count
+    - Optional SQLite disk tier
+    - Expired entries kept for revalidation until evicted
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 10000,
+        path: Optional[str] = None,
+        max_disk_entries: int = 100000,
+        prune_interval: int = 100,
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            max_bytes: Memory budget for cached responses
+            max_entries: Maximum number of responses kept in memory
+            path: SQLite file for the disk tier (memory only if None)
+            max_disk_entries: Maximum number of responses kept on disk
+            prune_interval: Disk writes between prunes (the disk tier may
+                exceed ``max_disk_entries`` by this much)
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.prune_interval = max(1, prune_interval)
+        self.path = path
+
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.size = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self._disk_writes = 0
+
+        # Guards the connection, which executor threads write through
+        self._lock = threading.Lock()
+        self.conn: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    elapsed REAL NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+            )
+            self.conn.commit()
+            logger.info(f"Response cache persisted to {path}")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry (fresh or stale), marking it recently used."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+
+        if self.conn is None:
+            return None
+
+        with self._lock:
+            if self.conn is None:
+                return None
+            row = self.conn.execute(
+                "SELECT url, status_code, headers, content, elapsed, stored_at, expires_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        url, status_code, headers, content, elapsed, stored_at, expires_at = row
+        entry = CacheEntry(
+            url, status_code, [tuple(h) for h in json.loads(headers)],
+            content, elapsed, stored_at, expires_at,
+        )
+        self.disk_hits += 1
+        self._store_memory(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CacheEntry):
+        """Store an entry in memory and on disk (off the event loop)."""
+        self._store_memory(key, entry)
+
+        if self.conn is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write_disk, key, entry)
+
+    def _write_disk(self, key: str, entry: CacheEntry):
+        """Insert an entry into the disk tier, pruning it periodically."""
+        with self._lock:
+            if self.conn is None:
+                return
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status_code, headers, content, elapsed, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, entry.url, entry.status_code, json.dumps(entry.headers),
+                    entry.content, entry.elapsed, entry.stored_at, entry.expires_at,
+                ),
+            )
+            self._disk_writes += 1
+            if self._disk_writes % self.prune_interval == 0:
+                self._prune_disk()
+            self.conn.commit()
+
+    def _store_memory(self, key: str, entry: CacheEntry):
+        """Insert into the memory LRU and evict down to the budget."""
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old.size
+
+        self.entries[key] = entry
+        self.size += entry.size
+
+        while self.entries and (
+            self.size > self.max_bytes or len(self.entries) > self.max_entries
+        ):
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def _prune_disk(self):
+        """Delete the oldest disk entries beyond ``max_disk_entries``."""
+        count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            )
+
+    def delete(self, key: str):
+        """Remove an entry."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+        with self._lock:
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+
+    def clear(self):
+        """Remove all entries."""
+        self.entries.clear()
+        self.size = 0
+        with self._lock:
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM responses")
+                self.conn.commit()
+
+    def close(self):
+        """Close the disk tier."""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "evictions": self.evictions,
+            "disk_hits": self.disk_hits,
+        }
+
+
+class CachedFetcher:
+    """
+    Shared GET layer for scrapers and analyzers.
+
+    Concurrent requests for the same URL share one HTTP request, and
+    responses are cached following HTTP caching rules: ``no-store`` and
+    ``Vary: *`` responses are never stored, ``max-age`` / ``Expires`` set
+    the lifetime (capped at ``max_ttl``), other cacheable responses live for
+    ``default_ttl``. Stale entries with an ETag or Last-Modified are
+    revalidated with a conditional request.
+
+    Callers may pass their own ``session_pool`` and request ``extensions``
+    (e.g. a connection trace) per request, so fetches count against the
+    caller's connection limits and stats.
+
+    Features:
+    - Single-flight request coalescing
+    - HTTP-aware response cache (memory LRU, optional disk)
+    - Conditional revalidation
+    - Hit / miss metrics
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        session_pool: Optional[SessionPool] = None,
+        default_ttl: float = 300.0,
+        max_ttl: float = 3600.0,
+        max_entry_bytes: int = 5 * 1024 * 1024,
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize fetcher.
+
+        Args:
+            cache: Response cache (a memory-only one is created if None)
+            session_pool: SessionPool providing keep-alive clients
+            default_ttl: Lifetime of cacheable responses without freshness
+                headers
+            max_ttl: Upper bound on any response lifetime
+            max_entry_bytes: Larger responses are not cached
+            timeout: Default request timeout in seconds
+        """
+        self.cache = cache or ResponseCache()
+        self.session_pool = session_pool or SessionPool()
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.timeout = timeout
+
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.revalidated = 0
+        self.stored = 0
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        use_cache: bool = True,
+        session_pool: Optional[SessionPool] = None,
+        extensions: Optional[Dict[str, Any]] = None,
+        allowed_content_types: Optional[Sequence[str]] = None,
+        skip_oversized: bool = False,
+        before_fetch: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> httpx.Response:
+        """
+        GET a URL through the cache.
+
+        Args:
+            url: URL to fetch
+            headers: Request headers (User-Agent does not affect caching)
+            timeout: Request timeout in seconds
+            max_bytes: Cap on body bytes read; truncated bodies are not cached
+            use_cache: Skip the cache lookup (the fresh response is still
+                stored)
+            session_pool: Pool to lease the client from (the fetcher's own
+                pool if None)
+            extensions: httpx request extensions, e.g. ``{"trace": ...}``
+            allowed_content_types: Media type prefixes worth downloading;
+                other successful responses are skipped after the headers
+            skip_oversized: Skip successful responses whose Content-Length
+                exceeds ``max_bytes`` without reading them
+            before_fetch: Awaited just before a request goes to the network
+                (e.g. rate limiting); not called for cache hits or requests
+                joining one already in flight
+
+        Returns:
+            httpx.Response with ``extensions["from_cache"]``,
+            ``extensions["truncated"]`` and ``extensions["skipped"]`` (the
+            skip reason or None) set
+        """
+        key = self._cache_key(url, headers)
+
+        entry = self.cache.get(key) if use_cache else None
+        if entry is not None and entry.expires_at > time.time():
+            self.hits += 1
+            return entry.to_response(True)
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._inflight.clear()
+            self._loop = loop
+
+        content_types = tuple(allowed_content_types) if allowed_content_types else None
+        flight_key = (key, max_bytes, content_types, skip_oversized)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch(
+                    key, url, headers, timeout, max_bytes, entry,
+                    session_pool or self.session_pool, extensions or {},
+                    content_types, skip_oversized, before_fetch,
+                )
+            )
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+        else:
+            self.coalesced += 1
+
+        # Callers that give up do not cancel the request others wait for
+        result, from_cache = await asyncio.shield(task)
+        return result.to_response(from_cache)
+
+    async def _fetch(
+        self,
+        key: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timeout: Optional[float],
+        max_bytes: Optional[int],
+        stale: Optional[CacheEntry],
+        session_pool: SessionPool,
+        extensions: Dict[str, Any],
+        allowed_content_types: Optional[Sequence[str]],
+        skip_oversized: bool,
+        before_fetch: Optional[Callable[[], Awaitable[Any]]],
+    ) -> Tuple[CacheEntry, bool]:
+        """Fetch (or revalidate) a URL and store the response if cacheable."""
+        request_headers = dict(headers or {})
+        caller_conditional = any(
+            name.lower() in ("if-none-match", "if-modified-since") for name in request_headers
+        )
+        if stale is not None and not caller_conditional:
+            request_headers.update(stale.conditional_headers())
+
+        self.misses += 1
+        if before_fetch:
+            await before_fetch()
+        async with session_pool.session(url) as client:
+            async with client.stream(
+                "GET", url, headers=request_headers,
+                timeout=timeout or self.timeout, extensions=extensions,
+            ) as response:
+                # Unwanted bodies are never downloaded
+                skipped = None
+                if response.is_success:
+                    skipped = header_skip_reason(
+                        response.headers, max_bytes, allowed_content_types, skip_oversized
+                    )
+
+                if skipped:
+                    content, truncated = b"", False
+                else:
+                    content, truncated = await read_body(response, max_bytes)
+
+        now = time.time()
+        ttl = self._freshness(response, now)
+
+        # Our cached copy is still valid
+        if response.status_code == 304 and stale is not None and not caller_conditional:
+            logger.debug(f"Revalidated cached {url}")
+            self.revalidated += 1
+            stale.expires_at = now + (ttl or 0.0)
+            await self.cache.put(key, stale)
+            return stale, True
+
+        entry = CacheEntry(
+            str(response.url),
+            response.status_code,
+            [
+                (name, value) for name, value in response.headers.multi_items()
+                if name.lower() not in _DROPPED_HEADERS
+            ],
+            content,
+            response.elapsed.total_seconds(),
+            now,
+            now + (ttl or 0.0),
+            truncated,
+            skipped,
+        )
+
+        # A 304 for the caller's own validators has no body worth storing
+        if (
+            ttl is not None
+            and response.status_code != 304
+            and not truncated
+            and not skipped
+            and len(content) <= self.max_entry_bytes
+            and (ttl > 0 or entry.conditional_headers())
+        ):
+            await self.cache.put(key, entry)
+            self.stored += 1
+
+        return entry, False
+
+    def _freshness(self, response: httpx.Response, now: float) -> Optional[float]:
+        """Seconds a response stays fresh, None if it must not be stored."""
+        if response.status_code not in CACHEABLE_STATUSES and response.status_code != 304:
+            return None
+        if response.headers.get("vary", "").strip() == "*":
+            return None
+
+        directives = {}
+        for part in response.headers.get("cache-control", "").split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"')
+
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0.0
+
+        if "max-age" in directives:
+            try:
+                return min(max(float(directives["max-age"]), 0.0), self.max_ttl)
+            except ValueError:
+                return 0.0
+
+        expires = response.headers.get("expires")
+        if expires:
+            try:
+                date = response.headers.get("date")
+                origin_now = parsedate_to_datetime(date).timestamp() if date else now
+                return min(max(parsedate_to_datetime(expires).timestamp() - origin_now, 0.0), self.max_ttl)
+            except (TypeError, ValueError):
+                # Invalid Expires means already expired
+                return 0.0
+
+        return min(self.default_ttl, self.max_ttl)
+
+    @staticmethod
+    def _cache_key(url: str, headers: Optional[Dict[str, str]]) -> str:
+        """Key a request by URL and the headers that can change the response."""
+        if not headers:
+            return url
+
+        keyed = sorted(
+            (name.lower(), value) for name, value in headers.items()
+            if name.lower() not in _UNKEYED_HEADERS
+        )
+        return url if not keyed else f"{url}\n{json.dumps(keyed)}"
+
+    async def close(self):
+        """Close the HTTP clients and the disk cache."""
+        await self.session_pool.close()
+        self.cache.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fetch and cache statistics."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidated": self.revalidated,
+            "stored": self.stored,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "cache": self.cache.get_stats(),
+        }
+
+
+_shared_fetcher: Optional[CachedFetcher] = None
+
+
+def get_shared_fetcher() -> CachedFetcher:
+    """
+    Get the process-wide fetcher shared by scrapers and analyzers.
+
+    The disk tier is enabled by the ``HTTP_CACHE_PATH`` environment variable.
+    """
+    global _shared_fetcher
+    if _shared_fetcher is None:
+        _shared_fetcher = CachedFetcher(
+            cache=ResponseCache(path=os.environ.get("HTTP_CACHE_PATH") or None)
+        )
+    return _shared_fetcher
@@ -1,20 +1,49 @@
 """Rate limiting for web scraping."""
 
 import asyncio
-from typing import Optional
-from datetime import datetime, timedelta
-from collections import deque
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from loguru import logger
 
+# Limiter-wide bucket used when acquire() is called without a key
+DEFAULT_KEY = ""
+
+
+class _Bucket:
+    """GCRA state of one limit: the theoretical arrival time of the next call."""
+
+    __slots__ = ("interval", "tolerance", "tat")
+
+    def __init__(self, interval: float, burst: int):
+        self.interval = interval
+        self.tolerance = interval * max(burst - 1, 0)
+        self.tat = 0.0
+
+    def allowed_at(self, now: float, tokens: int) -> float:
+        """Earliest time ``tokens`` calls conform to the limit."""
+        tat = max(self.tat, now)
+        return tat + self.interval * (tokens - 1) - self.tolerance
+
+    def available(self, now: float) -> int:
+        """Calls that could be made right now."""
+        used = max(self.tat - now, 0.0)
+        return int((self.tolerance + self.interval - used) // self.interval)
+
 
 class RateLimiter:
     """
     Rate limiter for controlling request frequency.
 
+    Implements a token bucket as GCRA (generic cell rate algorithm): each
+    bucket stores a single timestamp on the monotonic clock. ``acquire``
+    reserves the caller's slot synchronously and sleeps outside any lock,
+    so waiters sleep concurrently and are released in arrival order.
+
     Features:
     - Per-minute rate limiting
     - Per-hour rate limiting
-    - Token bucket algorithm
+    - Token bucket algorithm with burst capacity
+    - Per-key buckets (host, API provider, proxy, ...)
     - Async support
     """
 
@@ -22,6 +51,8 @@ class RateLimiter:
         self,
         calls_per_minute: int = 60,
         calls_per_hour: Optional[int] = None,
+        burst: Optional[int] = None,
+        max_keys: int = 10000,
     ):
         """
         Initialize rate limiter.
@@ -29,83 +60,177 @@ class RateLimiter:
         Args:
             calls_per_minute: Maximum calls per minute
             calls_per_hour: Maximum calls per hour (optional)
+            burst: Calls allowed back to back before the per-minute rate
+                applies (defaults to calls_per_minute)
+            max_keys: Idle key buckets are pruned beyond this many keys
         """
         self.calls_per_minute = calls_per_minute
         self.calls_per_hour = calls_per_hour
+        self.burst = burst or calls_per_minute
+        self.max_keys = max_keys
 
-        # Track recent requests
-        self.minute_requests: deque = deque()
-        self.hour_requests: deque = deque()
+        # Limits of keys configured with set_limit()
+        self.key_limits: Dict[str, Tuple[int, Optional[int], int]] = {}
+        self.buckets: Dict[str, List[_Bucket]] = {}
 
-        self.lock = asyncio.Lock()
+        self.waiting = 0
+        self.total_acquired = 0
+        self.total_wait_seconds = 0.0
 
         logger.info(
             f"Rate limiter initialized: {calls_per_minute} calls/min, "
-            f"{calls_per_hour or 'unlimited'} calls/hour"
+            f"{calls_per_hour or 'unlimited'} calls/hour (burst {self.burst})"
         )
 
-    async def acquire(self):
+    def set_limit(
+        self,
+        key: str,
+        calls_per_minute: int,
+        calls_per_hour: Optional[int] = None,
+        burst: Optional[int] = None,
+    ):
+        """
+        Give a key its own limits instead of the limiter defaults.
+
+        Args:
+            key: Bucket key (e.g. host or API provider)
+            calls_per_minute: Maximum calls per minute for the key
+            calls_per_hour: Maximum calls per hour for the key (optional)
+            burst: Burst capacity for the key (defaults to calls_per_minute)
+        """
+        self.key_limits[key] = (calls_per_minute, calls_per_hour, burst or calls_per_minute)
+        self.buckets.pop(key, None)
+
+    async def acquire(self, key: Optional[str] = None, tokens: int = 1):
         """
         Acquire permission to make a request.
 
         Will wait if rate limit is exceeded.
+
+        Args:
+            key: Bucket to draw from (limiter-wide bucket if None)
+            tokens: Number of calls to reserve
+        """
+        now = time.monotonic()
+        buckets = self._get_buckets(key or DEFAULT_KEY)
+
+        # The call happens when every limit allows it
+        start = now
+        for bucket in buckets:
+            start = max(start, bucket.allowed_at(now, tokens))
+        reserved = self._commit(buckets, start, tokens)
+
+        wait_time = start - now
+        if wait_time <= 0:
+            return
+
+        self.waiting += 1
+        self.total_wait_seconds += wait_time
+        try:
+            logger.debug(f"Rate limit reached for {key or 'default'}, waiting {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+        except asyncio.CancelledError:
+            self._refund(buckets, reserved, tokens)
+            raise
+        finally:
+            self.waiting -= 1
+
+    def try_acquire(self, key: Optional[str] = None, tokens: int = 1) -> bool:
+        """
+        Take tokens only if no waiting is needed.
+
+        Args:
+            key: Bucket to draw from (limiter-wide bucket if None)
+            tokens: Number of calls to reserve
+
+        Returns:
+            True if the calls may be made now
         """
-        async with self.lock:
-            now = datetime.now()
-
-            # Clean up old requests
-            self._cleanup_old_requests(now)
-
-            # Check per-minute limit
-            if len(self.minute_requests) >= self.calls_per_minute:
-                oldest_minute_request = self.minute_requests[0]
-                wait_time = (oldest_minute_request + timedelta(minutes=1) - now).total_seconds()
-                if wait_time > 0:
-                    logger.debug(f"Rate limit reached, waiting {wait_time:.2f}s")
-                    await asyncio.sleep(wait_time)
-                    now = datetime.now()
-                    self._cleanup_old_requests(now)
-
-            # Check per-hour limit
-            if self.calls_per_hour and len(self.hour_requests) >= self.calls_per_hour:
-                oldest_hour_request = self.hour_requests[0]
-                wait_time = (oldest_hour_request + timedelta(hours=1) - now).total_seconds()
-                if wait_time > 0:
-                    logger.debug(f"Hourly rate limit reached, waiting {wait_time:.2f}s")
-                    await asyncio.sleep(wait_time)
-                    now = datetime.now()
-                    self._cleanup_old_requests(now)
-
-            # Record this request
-            self.minute_requests.append(now)
-            if self.calls_per_hour:
-                self.hour_requests.append(now)
-
-    def _cleanup_old_requests(self, now: datetime):
-        """Remove requests older than the time windows."""
-        # Remove requests older than 1 minute
-        minute_threshold = now - timedelta(minutes=1)
-        while self.minute_requests and self.minute_requests[0] < minute_threshold:
-            self.minute_requests.popleft()
-
-        # Remove requests older than 1 hour
-        if self.calls_per_hour:
-            hour_threshold = now - timedelta(hours=1)
-            while self.hour_requests and self.hour_requests[0] < hour_threshold:
-                self.hour_requests.popleft()
+        now = time.monotonic()
+        buckets = self._get_buckets(key or DEFAULT_KEY)
+        if any(bucket.allowed_at(now, tokens) > now for bucket in buckets):
+            return False
+
+        self._commit(buckets, now, tokens)
+        return True
+
+    def _commit(self, buckets: List[_Bucket], start: float, tokens: int) -> List[float]:
+        """Record calls made at ``start`` and return the new bucket states."""
+        for bucket in buckets:
+            bucket.tat = max(bucket.tat, start) + bucket.interval * tokens
+        self.total_acquired += tokens
+        return [bucket.tat for bucket in buckets]
+
+    def _refund(self, buckets: List[_Bucket], reserved: List[float], tokens: int):
+        """Give back a cancelled reservation unless later callers queued behind it."""
+        if any(bucket.tat != tat for bucket, tat in zip(buckets, reserved)):
+            return
+        for bucket in buckets:
+            bucket.tat -= bucket.interval * tokens
+        self.total_acquired -= tokens
+
+    def _get_buckets(self, key: str) -> List[_Bucket]:
+        """Get or create the buckets of a key."""
+        buckets = self.buckets.get(key)
+        if buckets is None:
+            if len(self.buckets) >= self.max_keys:
+                self._prune()
+
+            per_minute, per_hour, burst = self.key_limits.get(
+                key, (self.calls_per_minute, self.calls_per_hour, self.burst)
+            )
+            buckets = [_Bucket(60.0 / per_minute, burst)]
+            if per_hour:
+                buckets.append(_Bucket(3600.0 / per_hour, per_hour))
+            self.buckets[key] = buckets
+
+        return buckets
+
+    def _prune(self):
+        """Drop buckets that are full again (identical to new ones)."""
+        now = time.monotonic()
+        idle = [
+            key for key, buckets in self.buckets.items()
+            if all(bucket.tat <= now for bucket in buckets)
+        ]
+        for key in idle:
+            del self.buckets[key]
 
     async def reset(self):
         """Reset rate limiter."""
-        async with self.lock:
-            self.minute_requests.clear()
-            self.hour_requests.clear()
-            logger.info("Rate limiter reset")
+        self.buckets.clear()
+        logger.info("Rate limiter reset")
 
-    def get_current_rate(self) -> dict:
+    def get_current_rate(self, key: Optional[str] = None) -> dict:
         """Get current rate statistics."""
+        key = key or DEFAULT_KEY
+        per_minute, per_hour, burst = self.key_limits.get(
+            key, (self.calls_per_minute, self.calls_per_hour, self.burst)
+        )
+
+        now = time.monotonic()
+        buckets = self.buckets.get(key)
+        available = (
+            min(bucket.available(now) for bucket in buckets) if buckets else burst
+        )
+
+        return {
+            "key": key or None,
+            "available_now": max(available, 0),
+            "limit_per_minute": per_minute,
+            "limit_per_hour": per_hour,
+            "burst": burst,
+            "waiting": self.waiting,
+            "keys_tracked": len(self.buckets),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
         return {
-            "requests_last_minute": len(self.minute_requests),
-            "requests_last_hour": len(self.hour_requests) if self.calls_per_hour else None,
-            "limit_per_minute": self.calls_per_minute,
-            "limit_per_hour": self.calls_per_hour,
+            "acquired": self.total_acquired,
+            "waiting": self.waiting,
+            "keys_tracked": len(self.buckets),
+            "average_wait_seconds": (
+                self.total_wait_seconds / self.total_acquired if self.total_acquired else 0.0
+            ),
         }
@@ -0,0 +1,330 @@
+"""Redis-backed rate limiting shared by all scraping workers."""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any, List, Tuple
+from loguru import logger
+
+from .rate_limiter import DEFAULT_KEY
+
+# Take calls from every limit of a key (KEYS: one GCRA timestamp per limit;
+# ARGV: calls wanted now, calls needed, "1" to reserve future slots when
+# fewer than needed are free now, then interval/tolerance pairs in seconds).
+# Grants up to the wanted calls if at least the needed ones are free now.
+# Otherwise it books exactly the needed calls from the next free slot
+# (reserve) or grants nothing. Returns {granted, seconds until the granted
+# calls may be made}, or {0, seconds until the needed calls conform}.
+_ACQUIRE_SCRIPT = """
+if redis.replicate_commands then
+    redis.replicate_commands()
+end
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local want = tonumber(ARGV[1])
+local need = tonumber(ARGV[2])
+local reserve = ARGV[3] == '1'
+local available = want
+local start = now
+local tats = {}
+
+for i, key in ipairs(KEYS) do
+    local interval = tonumber(ARGV[i * 2 + 2])
+    local tolerance = tonumber(ARGV[i * 2 + 3])
+    local tat = math.max(tonumber(redis.call('GET', key) or '0'), now)
+    tats[i] = tat
+    available = math.min(available, math.floor((now + tolerance - tat) / interval) + 1)
+    start = math.max(start, tat + interval * (need - 1) - tolerance)
+end
+
+local grant = need
+if available >= need then
+    grant = available
+    start = now
+elseif not reserve then
+    return {0, string.format('%.6f', start - now)}
+end
+
+for i, key in ipairs(KEYS) do
+    local tat = math.max(tats[i], start) + tonumber(ARGV[i * 2 + 2]) * grant
+    local ttl = math.ceil((tat - now) * 1000) + 1000
+    redis.call('SET', key, string.format('%.6f', tat), 'PX', ttl)
+end
+return {grant, string.format('%.6f', start - now)}
+"""
+
+
+class RedisRateLimiter:
+    """
+    Rate limiter whose buckets live in Redis.
+
+    Drop-in replacement for ``RateLimiter`` when several processes (e.g.
+    Celery workers) must share one quota. Each limit is a GCRA bucket stored
+    as one timestamp and updated by an atomic Lua script using the Redis
+    server clock, through an asyncio client so waiting on Redis never blocks
+    the event loop. While calls are free, ``acquire`` takes them in batches
+    kept in a short-lived local cache, so most calls never reach Redis. Once
+    the quota is used up, each caller books only its own future slot.
+
+    Features:
+    - Cluster-wide per-minute and per-hour limits
+    - Burst capacity
+    - Per-key quotas (host, API provider, proxy, ...)
+    - Local token cache with expiry
+    - Async support
+    """
+
+    def __init__(
+        self,
+        client,
+        calls_per_minute: int = 60,
+        calls_per_hour: Optional[int] = None,
+        burst: Optional[int] = None,
+        namespace: str = "default",
+        local_batch: int = 5,
+        local_ttl: float = 1.0,
+    ):
+        """
+        Initialize Redis rate limiter.
+
+        Args:
+            client: ``redis.asyncio`` client (or a compatible stand-in)
+            calls_per_minute: Maximum calls per minute across all workers
+            calls_per_hour: Maximum calls per hour across all workers (optional)
+            burst: Calls allowed back to back before the per-minute rate
+                applies (defaults to calls_per_minute)
+            namespace: Prefix separating limiters that share a Redis database
+            local_batch: Free calls taken from Redis per round trip
+            local_ttl: Seconds locally cached calls stay usable; unused ones
+                are dropped so a worker cannot save up a burst
+        """
+        self.client = client
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_hour = calls_per_hour
+        self.burst = burst or calls_per_minute
+        self.namespace = namespace
+        self.prefix = f"ratelimit:{namespace}:"
+        self.local_batch = local_batch
+        self.local_ttl = local_ttl
+
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+
+        # Limits of keys configured with set_limit()
+        self.key_limits: Dict[str, Tuple[int, Optional[int], int]] = {}
+        # Calls granted by Redis but not used yet, per key:
+        # [calls, expires at]
+        self._local: Dict[str, List[float]] = {}
+        self._refill_locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.waiting = 0
+        self.total_acquired = 0
+        self.total_wait_seconds = 0.0
+        self.round_trips = 0
+
+        logger.info(
+            f"Redis rate limiter initialized ({namespace}): {calls_per_minute} calls/min, "
+            f"{calls_per_hour or 'unlimited'} calls/hour (burst {self.burst})"
+        )
+
+    def set_limit(
+        self,
+        key: str,
+        calls_per_minute: int,
+        calls_per_hour: Optional[int] = None,
+        burst: Optional[int] = None,
+    ):
+        """
+        Give a key its own limits instead of the limiter defaults.
+
+        Every worker sharing the key must configure the same limits.
+
+        Args:
+            key: Bucket key (e.g. host or API provider)
+            calls_per_minute: Maximum calls per minute for the key
+            calls_per_hour: Maximum calls per hour for the key (optional)
+            burst: Burst capacity for the key (defaults to calls_per_minute)
+        """
+        self.key_limits[key] = (calls_per_minute, calls_per_hour, burst or calls_per_minute)
+
+    async def acquire(self, key: Optional[str] = None, tokens: int = 1):
+        """
+        Acquire permission to make a request.
+
+        Will wait if rate limit is exceeded.
+
+        Args:
+            key: Bucket to draw from (limiter-wide bucket if None)
+            tokens: Number of calls to reserve
+        """
+        key = key or DEFAULT_KEY
+        if tokens > self._get_limits(key)[2]:
+            raise ValueError(f"Cannot acquire {tokens} calls, burst for {key!r} is lower")
+
+        wait_time = await self._take(key, tokens, reserve=True)
+        self.total_acquired += tokens
+        if wait_time <= 0:
+            return
+
+        self.waiting += 1
+        self.total_wait_seconds += wait_time
+        try:
+            logger.debug(f"Rate limit reached for {key or 'default'}, waiting {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+        finally:
+            self.waiting -= 1
+
+    async def try_acquire(self, key: Optional[str] = None, tokens: int = 1) -> bool:
+        """
+        Take calls only if no waiting is needed.
+
+        Unlike ``RateLimiter.try_acquire`` this is a coroutine, since it may
+        need a Redis round trip.
+
+        Args:
+            key: Bucket to draw from (limiter-wide bucket if None)
+            tokens: Number of calls to reserve
+
+        Returns:
+            True if the calls may be made now
+        """
+        if await self._take(key or DEFAULT_KEY, tokens, reserve=False) is None:
+            return False
+
+        self.total_acquired += tokens
+        return True
+
+    async def _take(self, key: str, tokens: int, reserve: bool) -> Optional[float]:
+        """
+        Take calls from the local cache, refilling it from Redis if needed.
+
+        Args:
+            key: Bucket key
+            tokens: Number of calls
+            reserve: Book the next free slots in Redis if none are free now
+
+        Returns:
+            Seconds until the calls may be made, or None if they are not
+            available now and ``reserve`` is False
+        """
+        if self._take_cached(key, tokens):
+            return 0.0
+
+        # One refill per key at a time, so concurrent callers share the
+        # batch instead of each booking its own slots
+        self._check_loop()
+        lock = self._refill_locks.get(key)
+        if lock is None:
+            lock = self._refill_locks[key] = asyncio.Lock()
+
+        async with lock:
+            if self._take_cached(key, tokens):
+                return 0.0
+
+            granted, wait_time = await self._request(
+                key, max(self.local_batch, tokens), tokens, reserve
+            )
+
+        if not granted:
+            return None
+        if wait_time > 0:
+            # A future slot booked for this caller alone
+            return wait_time
+
+        # Free calls beyond this caller's are kept for a short while
+        spare = granted - tokens
+        if spare:
+            cached = self._local.setdefault(key, [0, 0.0])
+            cached[0] += spare
+            cached[1] = time.monotonic() + self.local_ttl
+        return 0.0
+
+    def _take_cached(self, key: str, tokens: int) -> bool:
+        """Take calls from the local cache if it holds enough unexpired ones."""
+        cached = self._local.get(key)
+        if cached is None:
+            return False
+        if cached[1] <= time.monotonic():
+            del self._local[key]
+            return False
+        if cached[0] < tokens:
+            return False
+
+        cached[0] -= tokens
+        return True
+
+    async def _request(
+        self,
+        key: str,
+        want: int,
+        need: int,
+        reserve: bool,
+    ) -> Tuple[int, float]:
+        """Ask Redis for up to ``want`` free calls (at least ``need``) on every limit of a key."""
+        per_minute, per_hour, burst = self._get_limits(key)
+
+        keys = [f"{self.prefix}{key}:minute"]
+        args: List[Any] = [
+            min(want, burst),
+            need,
+            "1" if reserve else "0",
+            60.0 / per_minute,
+            60.0 / per_minute * (burst - 1),
+        ]
+        if per_hour:
+            keys.append(f"{self.prefix}{key}:hour")
+            args.extend([3600.0 / per_hour, 3600.0 / per_hour * (per_hour - 1)])
+
+        self.round_trips += 1
+        granted, wait_time = await self._acquire(keys=keys, args=args)
+        return int(granted), float(wait_time)
+
+    def _check_loop(self):
+        """Drop Redis connections and locks of an earlier event loop (e.g. asyncio.run per task)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                self.client.connection_pool.reset()
+                self._refill_locks.clear()
+            self._loop = loop
+
+    def _get_limits(self, key: str) -> Tuple[int, Optional[int], int]:
+        """Get (calls per minute, calls per hour, burst) of a key."""
+        return self.key_limits.get(
+            key, (self.calls_per_minute, self.calls_per_hour, self.burst)
+        )
+
+    async def reset(self):
+        """Reset rate limiter for all workers."""
+        self._local.clear()
+        self._check_loop()
+        keys = [key async for key in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+        logger.info(f"Redis rate limiter reset ({self.namespace})")
+
+    def get_current_rate(self, key: Optional[str] = None) -> dict:
+        """Get current rate statistics."""
+        key = key or DEFAULT_KEY
+        per_minute, per_hour, burst = self._get_limits(key)
+        cached = self._local.get(key)
+
+        return {
+            "key": key or None,
+            "cached_locally": int(cached[0]) if cached and cached[1] > time.monotonic() else 0,
+            "limit_per_minute": per_minute,
+            "limit_per_hour": per_hour,
+            "burst": burst,
+            "waiting": self.waiting,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            "acquired": self.total_acquired,
+            "waiting": self.waiting,
+            "redis_round_trips": self.round_trips,
+            "average_wait_seconds": (
+                self.total_wait_seconds / self.total_acquired if self.total_acquired else 0.0
+            ),
+        }
@@ -0,0 +1,201 @@
+"""Compiled CSS selector plans for field extraction."""
+
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from lxml import etree
+import lxml.html
+from loguru import logger
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    # cssselect is optional, plans then run on BeautifulSoup
+    CSSSelector = None
+
+# Attributes BeautifulSoup returns as lists of space-separated values
+_LIST_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+# Tags (script, style, ...) whose strings BeautifulSoup leaves out of the
+# text of other elements
+_STRING_CONTAINERS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+
+# (field name, CSS selector, attribute or None for text, multiple values)
+_Field = Tuple[str, str, Optional[str], bool]
+
+
+class SelectorPlan:
+    """
+    A ``selectors`` config compiled once for many pages.
+
+    Fields are normalized up front and, when cssselect is installed, every
+    selector is translated to a compiled XPath and run on an lxml tree.
+    Selectors cssselect cannot translate (e.g. soupsieve's ``:-soup-contains``)
+    make the whole plan use BeautifulSoup, as does a page lxml fails to
+    parse. Both paths return the same values, including list values for
+    multi-valued attributes such as ``class`` and ``rel``.
+
+    Features:
+    - Selector parsing and compilation once per config
+    - lxml extraction fast path
+    - BeautifulSoup fallback
+    """
+
+    def __init__(self, fields: Tuple[_Field, ...], backend: str = "lxml"):
+        """
+        Initialize selector plan.
+
+        Args:
+            fields: (field, selector, attr, multiple) tuples
+            backend: "lxml" to use compiled selectors when possible, "bs4"
+                to always use BeautifulSoup
+        """
+        if backend not in ("lxml", "bs4"):
+            raise ValueError(f"Unknown extraction backend: {backend}")
+
+        self.fields = fields
+        self.compiled: Optional[List[Any]] = None
+
+        if backend == "lxml" and CSSSelector is not None:
+            try:
+                self.compiled = [
+                    CSSSelector(selector, translator="html") for _, selector, _, _ in fields
+                ]
+            except Exception as e:
+                logger.debug(f"Selectors not supported by cssselect, using bs4: {e}")
+
+        self.backend = "lxml" if self.compiled is not None else "bs4"
+
+    def extract(self, html: str) -> Dict[str, Any]:
+        """
+        Extract all fields from a page.
+
+        Args:
+            html: HTML content
+
+        Returns:
+            Dictionary of field name to extracted value(s)
+        """
+        if not self.fields:
+            return {}
+
+        if self.compiled is not None:
+            try:
+                return self._extract_lxml(html)
+            except Exception as e:
+                logger.debug(f"lxml extraction failed, using bs4: {e}")
+
+        return self._extract_soup(html)
+
+    def _extract_lxml(self, html: str) -> Dict[str, Any]:
+        """Run the compiled selectors on an lxml tree."""
+        root = lxml.html.document_fromstring(html)
+        extracted_data = {}
+
+        for (field, _, attr, multiple), selector in zip(self.fields, self.compiled):
+            elements = selector(root)
+            if attr:
+                values = []
+                for elem in elements:
+                    value = elem.get(attr)
+                    if value and _is_list_attribute(elem.tag, attr):
+                        value = value.split()
+                    if value:
+                        values.append(value)
+            else:
+                values = [_element_text(elem) for elem in elements]
+
+            extracted_data[field] = values if multiple else (values[0] if values else None)
+
+        return extracted_data
+
+    def _extract_soup(self, html: str) -> Dict[str, Any]:
+        """Run the selectors on a BeautifulSoup tree."""
+        soup = BeautifulSoup(html, "lxml")
+        extracted_data = {}
+
+        for field, selector, attr, multiple in self.fields:
+            elements = soup.select(selector)
+            if attr:
+                values = [elem.get(attr) for elem in elements if elem.get(attr)]
+            else:
+                values = [elem.get_text(strip=True) for elem in elements]
+
+            extracted_data[field] = values if multiple else (values[0] if values else None)
+
+        return extracted_data
+
+
+def _is_list_attribute(tag: str, attr: str) -> bool:
+    """Check whether BeautifulSoup would split an attribute into a list."""
+    return attr in _LIST_ATTRIBUTES["*"] or attr in _LIST_ATTRIBUTES.get(tag, ())
+
+
+def _element_text(elem) -> str:
+    """Text of an lxml element like BeautifulSoup's ``get_text(strip=True)``."""
+    wanted = elem.tag if elem.tag in _STRING_CONTAINERS else None
+    # Strings belong to the innermost string container around them
+    containers = [
+        next((a.tag for a in elem.iterancestors() if a.tag in _STRING_CONTAINERS), None)
+    ]
+    parts = []
+
+    for event, node in etree.iterwalk(elem, events=("start", "end")):
+        # Comments and processing instructions hold no page text
+        is_element = isinstance(node.tag, str)
+        if event == "start":
+            containers.append(
+                node.tag if is_element and node.tag in _STRING_CONTAINERS else containers[-1]
+            )
+            if is_element and node.text and containers[-1] == wanted:
+                text = node.text.strip()
+                if text:
+                    parts.append(text)
+        else:
+            containers.pop()
+            if node is not elem and node.tail and containers[-1] == wanted:
+                tail = node.tail.strip()
+                if tail:
+                    parts.append(tail)
+
+    return "".join(parts)
+
+
+@lru_cache(maxsize=256)
+def _compile(fields: Tuple[_Field, ...], backend: str) -> SelectorPlan:
+    """Build (and remember) the plan of a normalized selector config."""
+    return SelectorPlan(fields, backend)
+
+
+def compile_selectors(
+    selectors: Dict[str, Any],
+    backend: str = "lxml",
+) -> SelectorPlan:
+    """
+    Get the compiled plan of a ``selectors`` config.
+
+    Plans are cached, so calling this for every page of a batch compiles
+    the selectors once.
+
+    Args:
+        selectors: Field name to CSS selector string, or to a dict with
+            ``selector``, ``attr`` and ``multiple`` keys
+        backend: Extraction backend ("lxml" or "bs4")
+
+    Returns:
+        SelectorPlan for the config
+    """
+    fields = []
+    for field, selector in selectors.items():
+        if isinstance(selector, str):
+            fields.append((field, selector, None, True))
+        elif isinstance(selector, dict):
+            fields.append((
+                field,
+                selector.get("selector"),
+                selector.get("attr"),
+                bool(selector.get("multiple", True)),
+            ))
+
+    return _compile(tuple(fields), backend)
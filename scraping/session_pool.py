@@ -1,35 +1,184 @@
 """HTTP session pooling for efficient connections."""
 
 import asyncio
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
+from urllib.parse import urlsplit
 import httpx
 from loguru import logger
 
 
+class ConnectionStats:
+    """
+    Connection reuse counters fed by httpx request tracing.
+
+    Pass ``extensions={"trace": stats.trace}`` with a request to count
+    the TCP connections and TLS handshakes it needed.
+    """
+
+    def __init__(self):
+        """Initialize connection counters."""
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    async def trace(self, event_name: str, info: Dict[str, Any]):
+        """httpcore trace callback."""
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event_name.endswith("send_request_headers.started"):
+            self.requests += 1
+
+    def reset(self):
+        """Reset all counters."""
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection reuse statistics."""
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": reused,
+            "tls_handshakes": self.tls_handshakes,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+class _PooledClient:
+    """A shared client and its lease bookkeeping."""
+
+    __slots__ = ("client", "key", "active", "last_used")
+
+    def __init__(self, client: httpx.AsyncClient, key: Tuple):
+        self.client = client
+        self.key = key
+        self.active = 0
+        self.last_used = time.monotonic()
+
+
 class SessionPool:
     """
     HTTP session pool for managing persistent connections.
 
+    Each distinct proxy / client option set gets one long-lived httpx client,
+    and its connection pool keeps connections alive between requests.
+    Callers lease a client for one request with ``session()``. A per-host
+    semaphore limits concurrent requests, and so open connections, to each
+    host. Clients that stay idle past ``idle_timeout`` are closed.
+
     Features:
-    - Connection pooling
-    - Automatic cleanup
-    - Connection limits
-    - Timeout management
+    - Connection pooling with keep-alive
+    - One shared client per proxy and option set
+    - Per-host connection limits
+    - Idle client eviction
+    - Connection reuse statistics
     """
 
-    def __init__(self, max_sessions: int = 10):
+    def __init__(
+        self,
+        max_sessions: int = 10,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        idle_timeout: float = 300.0,
+    ):
         """
         Initialize session pool.
 
         Args:
-            max_sessions: Maximum number of concurrent sessions
+            max_sessions: Clients kept open; the least recently used idle
+                client is closed to make room
+            max_connections: Connection limit of each client
+            max_keepalive_connections: Idle connections kept by each client
+            max_connections_per_host: Concurrent requests to one host
+            keepalive_expiry: Seconds an idle connection is kept alive
+            idle_timeout: Seconds before an unused client is closed
         """
         self.max_sessions = max_sessions
-        self.sessions = []
-        self.semaphore = asyncio.Semaphore(max_sessions)
-        self.lock = asyncio.Lock()
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+        self.clients: Dict[Tuple, _PooledClient] = {}
+        self._by_id: Dict[int, _PooledClient] = {}
+        # host -> [semaphore, requests holding or waiting for it]
+        self._hosts: Dict[str, List[Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_guard = None
+        self._last_sweep = time.monotonic()
+
+        self.connection_stats = ConnectionStats()
+        self.clients_created = 0
+        self.clients_evicted = 0
+
+        logger.info(
+            f"Session pool initialized with {max_sessions} max sessions, "
+            f"{max_connections_per_host} connections per host"
+        )
+
+    @asynccontextmanager
+    async def session(
+        self,
+        url: Optional[str] = None,
+        proxy: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Lease the shared client for a request.
 
-        logger.info(f"Session pool initialized with {max_sessions} max sessions")
+        Args:
+            url: Request URL, used for the per-host limit (no limit if None)
+            proxy: Proxy URL the client should use
+            **kwargs: Additional httpx.AsyncClient arguments
+
+        Yields:
+            httpx.AsyncClient shared with other requests using the same
+            proxy and arguments
+        """
+        await self._check_loop()
+
+        host = urlsplit(url).netloc.lower() if url else None
+        slot = None
+        if host:
+            slot = self._hosts.get(host)
+            if slot is None:
+                slot = self._hosts[host] = [asyncio.Semaphore(self.max_connections_per_host), 0]
+            slot[1] += 1
+            try:
+                await slot[0].acquire()
+            except BaseException:
+                self._leave_host(host, slot, acquired=False)
+                raise
+
+        try:
+            pooled = await self._lease(proxy, kwargs)
+            try:
+                yield pooled.client
+            finally:
+                pooled.active -= 1
+                pooled.last_used = time.monotonic()
+        finally:
+            if slot is not None:
+                self._leave_host(host, slot, acquired=True)
+
+    def _leave_host(self, host: str, slot: List[Any], acquired: bool):
+        """Release a host slot and forget hosts nobody is waiting for."""
+        if acquired:
+            slot[0].release()
+        slot[1] -= 1
+        if slot[1] == 0 and self._hosts.get(host) is slot:
+            del self._hosts[host]
 
     async def get_session(
         self,
@@ -40,6 +189,9 @@ class SessionPool:
         """
         Get an HTTP session from the pool.
 
+        The client is shared; hand it back with ``release_session`` instead
+        of closing it.
+
         Args:
             timeout: Request timeout in seconds
             follow_redirects: Whether to follow redirects
@@ -48,34 +200,12 @@ class SessionPool:
         Returns:
             httpx.AsyncClient instance
         """
-        await self.semaphore.acquire()
+        await self._check_loop()
 
-        try:
-            async with self.lock:
-                # Reuse existing session if available
-                if self.sessions:
-                    session = self.sessions.pop()
-                    return session
-
-            # Create new session
-            limits = httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=100,
-            )
-
-            session = httpx.AsyncClient(
-                timeout=timeout,
-                follow_redirects=follow_redirects,
-                limits=limits,
-                **kwargs
-            )
-
-            return session
-
-        except Exception as e:
-            self.semaphore.release()
-            logger.error(f"Error getting session: {e}")
-            raise
+        kwargs.update(timeout=timeout, follow_redirects=follow_redirects)
+        proxy = kwargs.pop("proxies", None)
+        pooled = await self._lease(proxy, kwargs)
+        return pooled.client
 
     async def release_session(self, session: httpx.AsyncClient):
         """
@@ -84,27 +214,131 @@ class SessionPool:
         Args:
             session: Session to release
         """
+        pooled = self._by_id.get(id(session))
+        if pooled is None or pooled.client is not session:
+            await session.aclose()
+            return
+
+        pooled.active -= 1
+        pooled.last_used = time.monotonic()
+
+    async def _lease(self, proxy: Optional[str], options: Dict[str, Any]) -> _PooledClient:
+        """Get (or create) the client for a proxy and option set and lease it."""
+        now = time.monotonic()
+        if now - self._last_sweep > min(self.idle_timeout, 60.0):
+            self._last_sweep = now
+            await self._evict(lambda pooled: now - pooled.last_used > self.idle_timeout)
+
+        # Look up, create and lease without awaiting in between, so
+        # concurrent leases of a new key share one client
+        key = (proxy, tuple(sorted((name, repr(value)) for name, value in options.items())))
+        pooled = self.clients.get(key)
+
+        if pooled is None:
+            client_args = {"follow_redirects": True, **options}
+            client = httpx.AsyncClient(proxies=proxy, limits=self.limits, **client_args)
+            pooled = _PooledClient(client, key)
+            self.clients[key] = pooled
+            self._by_id[id(client)] = pooled
+            self.clients_created += 1
+
+        pooled.active += 1
+        pooled.last_used = time.monotonic()
+
+        if len(self.clients) > self.max_sessions:
+            await self._evict_lru()
+        return pooled
+
+    async def _evict(self, should_evict):
+        """Close idle clients matching a predicate."""
+        # Detach every victim before the first await: a client still in
+        # ``clients`` could be leased while another one is being closed
+        victims = [p for p in self.clients.values() if not p.active and should_evict(p)]
+        for pooled in victims:
+            self._detach(pooled)
+
+        for pooled in victims:
+            await self._close_client(pooled)
+            self.clients_evicted += 1
+
+    async def _evict_lru(self):
+        """Close the least recently used idle client."""
+        idle = [pooled for pooled in self.clients.values() if not pooled.active]
+        if not idle:
+            logger.debug("Session pool full with all clients in use, growing past max_sessions")
+            return
+
+        await self._close_client(min(idle, key=lambda pooled: pooled.last_used))
+        self.clients_evicted += 1
+
+    def _detach(self, pooled: _PooledClient):
+        """Remove a client from the pool so it can no longer be leased."""
+        if self.clients.get(pooled.key) is pooled:
+            del self.clients[pooled.key]
+        self._by_id.pop(id(pooled.client), None)
+
+    async def _close_client(self, pooled: _PooledClient):
+        """Remove a client from the pool (before awaiting) and close it."""
+        self._detach(pooled)
         try:
-            async with self.lock:
-                if len(self.sessions) < self.max_sessions:
-                    self.sessions.append(session)
-                else:
-                    await session.aclose()
+            await pooled.client.aclose()
+        except Exception as e:
+            logger.error(f"Error closing session: {e}")
+
+    async def _check_loop(self):
+        """Move the pool to the running event loop, closing clients of the previous one."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        stale = list(self.clients.values())
+        self.clients.clear()
+        self._by_id.clear()
+        self._hosts.clear()
+        self._loop = loop
+
+        # Only left over when the previous loop was closed without shutting
+        # down its async generators; its transports may refuse to close
+        if stale:
+            logger.debug(f"Event loop changed, closing {len(stale)} pooled clients")
+        for pooled in stale:
+            try:
+                await pooled.client.aclose()
+            except Exception:
+                pass
+
+        # asyncio.run() finalizes async generators before closing the loop,
+        # which closes this loop's clients while their connections still work
+        self._loop_guard = self._close_with_loop(loop)
+        await self._loop_guard.__anext__()
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop):
+        """Async generator that closes the pool's clients when ``loop`` shuts down."""
+        try:
+            yield
         finally:
-            self.semaphore.release()
+            if self._loop is loop:
+                for pooled in list(self.clients.values()):
+                    await self._close_client(pooled)
 
     async def close(self):
         """Close all sessions in the pool."""
-        async with self.lock:
-            for session in self.sessions:
-                try:
-                    await session.aclose()
-                except Exception as e:
-                    logger.error(f"Error closing session: {e}")
-            self.sessions.clear()
+        for pooled in list(self.clients.values()):
+            await self._close_client(pooled)
 
         logger.info("Session pool closed")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "clients_open": len(self.clients),
+            "clients_in_use": sum(1 for pooled in self.clients.values() if pooled.active),
+            "clients_created": self.clients_created,
+            "clients_evicted": self.clients_evicted,
+            "hosts_active": len(self._hosts),
+            "connections": self.connection_stats.get_stats(),
+        }
+
     async def __aenter__(self):
         """Async context manager entry."""
         return self
@@ -1,11 +1,14 @@
 """Static HTML scraper using requests/httpx."""
 
+from functools import partial
 from typing import Dict, Any, Optional
-from bs4 import BeautifulSoup
 import httpx
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .http_cache import header_skip_reason, read_body
+from .selector_plan import compile_selectors
+
 
 class StaticScraper:
     """
@@ -17,6 +20,11 @@ class StaticScraper:
     - Proxy support
     - User-Agent rotation
     - Rate limiting
+    - Shared keep-alive client
+    - Conditional requests (304 Not Modified)
+    - Streaming body size cap and content-type filter
+    - Shared response cache with request coalescing
+    - Compiled selectors with an lxml fast path
     """
 
     def __init__(
@@ -25,12 +33,37 @@ class StaticScraper:
         proxy_manager=None,
         user_agent_rotator=None,
         rate_limiter=None,
+        client: Optional[httpx.AsyncClient] = None,
+        connection_stats=None,
+        max_bytes: Optional[int] = 10 * 1024 * 1024,
+        fetcher=None,
+        extraction_backend: str = "lxml",
     ):
-        """Initialize static scraper."""
+        """
+        Initialize static scraper.
+
+        Args:
+            session_pool: SessionPool to lease keep-alive clients from
+            proxy_manager: Proxy manager
+            user_agent_rotator: User-Agent rotator
+            rate_limiter: Rate limiter
+            client: Long-lived client reused for requests without a proxy
+            connection_stats: ConnectionStats to trace requests into
+            max_bytes: Default cap on bytes read per response (None for no cap)
+            fetcher: CachedFetcher serving unproxied requests from the shared
+                response cache
+            extraction_backend: Backend running the ``selectors`` config:
+                "lxml" (compiled selectors, BeautifulSoup fallback) or "bs4"
+        """
         self.session_pool = session_pool
         self.proxy_manager = proxy_manager
         self.user_agent_rotator = user_agent_rotator
         self.rate_limiter = rate_limiter
+        self.client = client
+        self.connection_stats = connection_stats
+        self.max_bytes = max_bytes
+        self.fetcher = fetcher
+        self.extraction_backend = extraction_backend
 
     @retry(
         stop=stop_after_attempt(3),
@@ -44,6 +77,16 @@ class StaticScraper:
         """
         Scrape a static HTML page.
 
+        The body is streamed: responses whose Content-Type is not in
+        ``allowed_content_types`` are skipped after the headers, and at most
+        ``max_bytes`` are read (the result is then marked ``truncated``).
+        With ``skip_oversized``, a Content-Length above the cap skips the
+        response without reading it. With a ``fetcher``, unproxied requests
+        go through the shared response cache unless ``cache`` is False; they
+        still lease clients from ``session_pool`` and apply the same checks
+        before downloading the body, and only requests that reach the
+        network wait for the rate limiter.
+
         Args:
             url: URL to scrape
             config: Additional configuration
@@ -54,12 +97,8 @@ class StaticScraper:
         config = config or {}
 
         try:
-            # Apply rate limiting
-            if self.rate_limiter:
-                await self.rate_limiter.acquire()
-
             # Prepare headers
-            headers = config.get("headers", {})
+            headers = dict(config.get("headers", {}))
             if self.user_agent_rotator:
                 headers["User-Agent"] = self.user_agent_rotator.get_user_agent()
 
@@ -70,51 +109,43 @@ class StaticScraper:
 
             # Make request
             timeout = config.get("timeout", 30)
-            async with httpx.AsyncClient(
-                proxies=proxy,
-                timeout=timeout,
-                follow_redirects=True,
-            ) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-
-                # Parse HTML
-                soup = BeautifulSoup(response.text, "lxml")
+            extensions = {}
+            if self.connection_stats:
+                extensions["trace"] = self.connection_stats.trace
 
-                # Extract data based on selectors
-                extracted_data = {}
-                selectors = config.get("selectors", {})
+            if self.fetcher and not proxy:
+                return await self._fetch_cached(url, headers, timeout, extensions, config)
 
-                for field, selector in selectors.items():
-                    if isinstance(selector, str):
-                        elements = soup.select(selector)
-                        extracted_data[field] = [elem.get_text(strip=True) for elem in elements]
-                    elif isinstance(selector, dict):
-                        selector_str = selector.get("selector")
-                        attr = selector.get("attr")
-                        multiple = selector.get("multiple", True)
+            # Apply rate limiting
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(config.get("rate_limit_key"))
 
-                        elements = soup.select(selector_str)
-                        if attr:
-                            values = [elem.get(attr) for elem in elements if elem.get(attr)]
-                        else:
-                            values = [elem.get_text(strip=True) for elem in elements]
+            # Reuse the shared client (its connection pool) unless proxied
+            if self.client and not proxy:
+                return await self._fetch(
+                    self.client, url, headers, timeout, extensions, config
+                )
 
-                        extracted_data[field] = values if multiple else (values[0] if values else None)
+            if self.session_pool:
+                async with self.session_pool.session(url, proxy=proxy) as client:
+                    return await self._fetch(
+                        client, url, headers, timeout, extensions, config
+                    )
 
-                return {
-                    "success": True,
-                    "data": extracted_data,
-                    "html": response.text if config.get("include_html") else None,
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                }
+            async with httpx.AsyncClient(
+                proxies=proxy,
+                timeout=timeout,
+                follow_redirects=True,
+            ) as client:
+                return await self._fetch(client, url, headers, timeout, extensions, config)
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error scraping {url}: {e}")
             return {
                 "success": False,
                 "error": f"HTTP {e.response.status_code}: {str(e)}",
+                "status_code": e.response.status_code,
+                "headers": dict(e.response.headers),
             }
         except Exception as e:
             logger.error(f"Error scraping {url}: {e}")
@@ -122,3 +153,147 @@ class StaticScraper:
                 "success": False,
                 "error": str(e),
             }
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        extensions: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Stream a response, checking its headers before reading the body."""
+        async with client.stream(
+            "GET", url, headers=headers, timeout=timeout, extensions=extensions
+        ) as response:
+            # Conditional request hit: the caller's cached copy is still valid
+            if response.status_code == 304:
+                return {
+                    "success": True,
+                    "not_modified": True,
+                    "data": {},
+                    "html": None,
+                    "status_code": response.status_code,
+                    "headers": dict(response.headers),
+                }
+
+            response.raise_for_status()
+
+            max_bytes = config.get("max_bytes", self.max_bytes)
+            skip_reason = header_skip_reason(
+                response.headers,
+                max_bytes,
+                config.get("allowed_content_types"),
+                config.get("skip_oversized", False),
+            )
+            if skip_reason:
+                return self._skipped(url, response, skip_reason)
+
+            body, truncated = await read_body(response, max_bytes)
+            if truncated:
+                logger.warning(f"Truncated {url} at {len(body)} bytes")
+
+            text = body.decode(response.encoding or "utf-8", errors="replace")
+
+        result = self._parse_response(response, text, config)
+        result["truncated"] = truncated
+        result["bytes_read"] = len(body)
+        return result
+
+    async def _fetch_cached(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        extensions: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Fetch a page through the shared fetcher (cache and coalescing)."""
+        max_bytes = config.get("max_bytes", self.max_bytes)
+        allowed_content_types = config.get("allowed_content_types")
+
+        # Cache hits and coalesced requests do not spend rate-limit tokens
+        before_fetch = (
+            partial(self.rate_limiter.acquire, config.get("rate_limit_key"))
+            if self.rate_limiter else None
+        )
+
+        response = await self.fetcher.get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            max_bytes=max_bytes,
+            use_cache=config.get("cache", True),
+            session_pool=self.session_pool,
+            extensions=extensions,
+            allowed_content_types=allowed_content_types,
+            skip_oversized=config.get("skip_oversized", False),
+            before_fetch=before_fetch,
+        )
+
+        if response.status_code == 304:
+            return {
+                "success": True,
+                "not_modified": True,
+                "data": {},
+                "html": None,
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+            }
+
+        response.raise_for_status()
+
+        # Cache hits were stored without a filter, so check them here too
+        skip_reason = response.extensions.get("skipped") or header_skip_reason(
+            response.headers, max_bytes, allowed_content_types
+        )
+        if skip_reason:
+            return self._skipped(url, response, skip_reason)
+
+        truncated = response.extensions.get("truncated", False)
+        if truncated:
+            logger.warning(f"Truncated {url} at {len(response.content)} bytes")
+
+        result = self._parse_response(response, response.text, config)
+        result["truncated"] = truncated
+        result["bytes_read"] = len(response.content)
+        result["from_cache"] = response.extensions.get("from_cache", False)
+        return result
+
+    @staticmethod
+    def _skipped(url: str, response: httpx.Response, reason: str) -> Dict[str, Any]:
+        """Result for a response skipped without reading its body."""
+        logger.debug(f"Skipping {url}: {reason}")
+        return {
+            "success": False,
+            "skipped": True,
+            "error": reason,
+            "content_type": response.headers.get("content-type", ""),
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+        }
+
+    def _parse_response(
+        self,
+        response: httpx.Response,
+        text: str,
+        config: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Extract configured fields from a fetched page."""
+        # Pages scraped without selectors are not parsed at all
+        selectors = config.get("selectors", {})
+        extracted_data = {}
+        if selectors:
+            plan = compile_selectors(
+                selectors, config.get("extraction_backend", self.extraction_backend)
+            )
+            extracted_data = plan.extract(text)
+
+        return {
+            "success": True,
+            "data": extracted_data,
+            "html": text if config.get("include_html") else None,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+        }
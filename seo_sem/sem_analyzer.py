@@ -9,6 +9,8 @@ import httpx
 from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 
+from scraping.http_cache import get_shared_fetcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -381,7 +383,7 @@ class SEMAnalyzer:
         logger.info(f"Analyzing landing page: {url}")
 
         try:
-            response = await self.client.get(url)
+            response = await get_shared_fetcher().get(url, timeout=30.0)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from database.models import SEOAnalysis, KeywordRanking
 from config.settings import settings
+from scraping.http_cache import get_shared_fetcher
 
 logger = logging.getLogger(__name__)
 
@@ -141,7 +142,7 @@ class SEOAnalyzer:
         logger.info(f"Performing on-page SEO audit for: {url}")
 
         try:
-            response = await self.client.get(url)
+            response = await get_shared_fetcher().get(url, timeout=30.0)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
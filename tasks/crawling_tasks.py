@@ -3,21 +3,31 @@
 from loguru import logger
 from typing import Dict, Any
 
+import os
+import uuid
+
 from .celery_app import celery_app
 from crawling.engine import CrawlingEngine
+from config.settings import settings
 
 
 @celery_app.task(name="tasks.crawling_tasks.crawl_website")
 def crawl_website(
     start_url: str,
     config: Dict[str, Any] = None,
+    session_id: int = None,
 ) -> Dict[str, Any]:
     """
     Crawl a website starting from a seed URL.
 
+    When a CrawlingSession id is given, the frontier and visited set are
+    stored on disk under that id, and running the task again with the same
+    id resumes the crawl from its last checkpoint.
+
     Args:
         start_url: Starting URL for crawl
         config: Crawler configuration
+        session_id: CrawlingSession id used to persist and resume the crawl
 
     Returns:
         Crawling results
@@ -25,8 +35,16 @@ def crawl_website(
     try:
         logger.info(f"Starting crawling task: {start_url}")
 
+        config = dict(config or {})
+        if session_id is not None:
+            config.setdefault("frontier", "persistent")
+            config.setdefault("session_id", session_id)
+            config.setdefault(
+                "state_dir", os.path.join(settings.storage_path, "crawl_state")
+            )
+
         # Initialize crawler
-        crawler = CrawlingEngine(config or {})
+        crawler = CrawlingEngine(config)
 
         # Run crawl
         import asyncio
@@ -42,3 +60,79 @@ def crawl_website(
             "error": str(e),
             "start_url": start_url,
         }
+
+
+@celery_app.task(name="tasks.crawling_tasks.crawl_distributed")
+def crawl_distributed(
+    start_url: str,
+    config: Dict[str, Any] = None,
+    workers: int = 4,
+    crawl_id: str = None,
+) -> Dict[str, Any]:
+    """
+    Start a crawl shared by several workers on the crawling queue.
+
+    The frontier and visited set live in Redis under the crawl id. Every
+    worker task pulls URLs from it, and per-host leases keep politeness
+    across workers. Starting more ``crawl_worker`` tasks with the same id
+    adds capacity to a running crawl.
+
+    Args:
+        start_url: Starting URL for crawl
+        config: Crawler configuration (max_pages is a budget for the whole crawl)
+        workers: Number of worker tasks to start
+        crawl_id: Id of the shared frontier (generated if not given)
+
+    Returns:
+        Crawl id and worker task ids
+    """
+    crawl_id = crawl_id or uuid.uuid4().hex
+
+    config = dict(config or {})
+    config["frontier"] = "redis"
+    config["crawl_id"] = crawl_id
+    config.setdefault("redis_url", settings.redis_url)
+
+    tasks = [crawl_worker.delay(start_url, config) for _ in range(workers)]
+
+    logger.info(f"Started distributed crawl {crawl_id} with {workers} workers: {start_url}")
+    return {
+        "success": True,
+        "crawl_id": crawl_id,
+        "start_url": start_url,
+        "worker_task_ids": [task.id for task in tasks],
+    }
+
+
+@celery_app.task(name="tasks.crawling_tasks.crawl_worker")
+def crawl_worker(start_url: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Crawl URLs from a shared Redis frontier until it is exhausted.
+
+    Args:
+        start_url: Starting URL for crawl (queued once across all workers)
+        config: Crawler configuration with frontier="redis" and a crawl_id
+
+    Returns:
+        Results of the pages crawled by this worker
+    """
+    try:
+        logger.info(f"Starting crawl worker for crawl {config.get('crawl_id')}")
+
+        crawler = CrawlingEngine(config)
+
+        import asyncio
+        result = asyncio.run(crawler.crawl(start_url))
+        result["crawl_id"] = config.get("crawl_id")
+        result["frontier"] = crawler.queue_manager.get_stats()
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Crawl worker failed: {start_url} - {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "start_url": start_url,
+            "crawl_id": config.get("crawl_id"),
+        }
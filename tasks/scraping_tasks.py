@@ -5,6 +5,7 @@ from loguru import logger
 from typing import Dict, Any
 
 from .celery_app import celery_app
+from config.settings import settings
 from scraping.engine import ScrapingEngine
 
 
@@ -17,7 +18,13 @@ class ScrapingTask(Task):
     @property
     def engine(self):
         if self._engine is None:
-            self._engine = ScrapingEngine()
+            # Workers share one quota through Redis
+            self._engine = ScrapingEngine({
+                "rate_limit_backend": "redis",
+                "redis_url": settings.redis_url,
+                "rate_limit_per_minute": settings.rate_limit_per_minute,
+                "rate_limit_per_hour": settings.rate_limit_per_hour,
+            })
         return self._engine
 
 